@@ -0,0 +1,81 @@
+"""add_task_queue_columns
+
+Revision ID: 3f9a1c7d52e4
+Revises: 6cd25db4b8ff
+Create Date: 2026-10-19 09:12:41.118305
+
+"""
+from datetime import datetime, time
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f9a1c7d52e4'
+down_revision: Union[str, Sequence[str], None] = '6cd25db4b8ff'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _scheduled_at(scheduled_date, scheduled_time):
+    # Same rule as models.task_scheduled_at (copied so the migration does not
+    # change if the model does)
+    if scheduled_time:
+        try:
+            hours, minutes = scheduled_time.split(":")
+            return datetime.combine(scheduled_date, time(int(hours), int(minutes)))
+        except ValueError:
+            pass  # Unparseable legacy value: end of day
+    return datetime.combine(scheduled_date, time(23, 59, 59))
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Stored sort keys for the task queue
+    op.add_column('housekeeping_tasks', sa.Column('priority_rank', sa.SmallInteger(), server_default='3', nullable=False))
+    op.add_column('housekeeping_tasks', sa.Column('scheduled_at', sa.DateTime(), nullable=True))
+
+    # Backfill
+    op.execute("""
+        UPDATE housekeeping_tasks SET priority_rank = CASE priority
+            WHEN 'urgent' THEN 1
+            WHEN 'high' THEN 2
+            WHEN 'normal' THEN 3
+            WHEN 'low' THEN 4
+            ELSE 5
+        END
+    """)
+    conn = op.get_bind()
+    tasks = sa.table(
+        'housekeeping_tasks',
+        sa.column('id', sa.Integer),
+        sa.column('scheduled_date', sa.Date),
+        sa.column('scheduled_time', sa.String),
+        sa.column('scheduled_at', sa.DateTime),
+    )
+    result = conn.execute(sa.select(tasks.c.id, tasks.c.scheduled_date, tasks.c.scheduled_time))
+    while True:
+        rows = result.fetchmany(1000)
+        if not rows:
+            break
+        conn.execute(
+            tasks.update().where(tasks.c.id == sa.bindparam('task_id')).values(scheduled_at=sa.bindparam('value')),
+            [{'task_id': row.id, 'value': _scheduled_at(row.scheduled_date, row.scheduled_time)} for row in rows],
+        )
+    op.alter_column('housekeeping_tasks', 'scheduled_at', nullable=False)
+
+    op.create_index('ix_housekeeping_tasks_queue', 'housekeeping_tasks', ['status', 'priority_rank', 'scheduled_at'])
+    op.create_index(
+        'ix_housekeeping_tasks_assignee_queue', 'housekeeping_tasks',
+        ['assigned_to', 'status', 'priority_rank', 'scheduled_at'],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_housekeeping_tasks_assignee_queue', table_name='housekeeping_tasks')
+    op.drop_index('ix_housekeeping_tasks_queue', table_name='housekeeping_tasks')
+    op.drop_column('housekeeping_tasks', 'scheduled_at')
+    op.drop_column('housekeeping_tasks', 'priority_rank')
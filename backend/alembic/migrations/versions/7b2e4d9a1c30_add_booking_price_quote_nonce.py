@@ -0,0 +1,30 @@
+"""add_booking_price_quote_nonce
+
+Revision ID: 7b2e4d9a1c30
+Revises: 3f9a1c7d52e4
+Create Date: 2026-10-19 12:20:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7b2e4d9a1c30'
+down_revision: Union[str, Sequence[str], None] = '3f9a1c7d52e4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Record which price quote a booking redeemed, so each quote is used once."""
+    op.add_column('bookings', sa.Column('price_quote_nonce', sa.String(length=16), nullable=True))
+    op.create_unique_constraint('uq_bookings_price_quote_nonce', 'bookings', ['price_quote_nonce'])
+
+
+def downgrade() -> None:
+    """Remove the redeemed price quote column."""
+    op.drop_constraint('uq_bookings_price_quote_nonce', 'bookings', type_='unique')
+    op.drop_column('bookings', 'price_quote_nonce')
@@ -0,0 +1,30 @@
+"""add_payment_invoice_updated_at
+
+Revision ID: c41d8e2f6a97
+Revises: 7b2e4d9a1c30
+Create Date: 2026-10-19 12:50:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c41d8e2f6a97'
+down_revision: Union[str, Sequence[str], None] = '7b2e4d9a1c30'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Track in-place updates of payments and invoices (HTTP cache validators)."""
+    op.add_column('payments', sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True))
+    op.add_column('invoices', sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    """Remove payment and invoice update timestamps."""
+    op.drop_column('invoices', 'updated_at')
+    op.drop_column('payments', 'updated_at')
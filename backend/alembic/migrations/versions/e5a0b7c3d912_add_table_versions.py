@@ -0,0 +1,34 @@
+"""add_table_versions
+
+Revision ID: e5a0b7c3d912
+Revises: c41d8e2f6a97
+Create Date: 2026-10-19 14:05:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5a0b7c3d912'
+down_revision: Union[str, Sequence[str], None] = 'c41d8e2f6a97'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Per-table commit counters for HTTP cache validators (rows are created on first write)."""
+    op.create_table(
+        'table_versions',
+        sa.Column('table_name', sa.String(length=64), nullable=False),
+        sa.Column('version', sa.BigInteger(), nullable=False),
+        sa.Column('changed_at', sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint('table_name'),
+    )
+
+
+def downgrade() -> None:
+    """Drop the per-table commit counters."""
+    op.drop_table('table_versions')
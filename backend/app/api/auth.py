@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 from datetime import timedelta
@@ -15,26 +16,38 @@ router = APIRouter()
 
 
 @router.post("/register", response_model=UserResponse)
-def register(user_in: UserCreate, db: Session = Depends(get_db)):
-    # UserService.create_user will hash the password via security helpers
-    return UserService.create_user(db, user_in)
+async def register(user_in: UserCreate, db: Session = Depends(get_db)):
+    # Hash on the bounded hashing pool (503 when saturated), then store it off the event loop
+    password_hash = await security.get_password_hash_async(user_in.password)
+    return await run_in_threadpool(UserService.create_user, db, user_in, password_hash)
 
 
 @router.post("/token")
-def login_for_access_token(
+async def login_for_access_token(
     request: Request,
     form_data: OAuth2PasswordRequestForm = Depends(),
     db: Session = Depends(get_db)
 ):
-    user = UserService.get_user_by_username(db, form_data.username)
-    if not user or not security.verify_password(form_data.password, user.password_hash):
+    # Async so that bcrypt runs on the dedicated hashing pool rather than
+    # holding one of the shared threadpool slots for the whole request.
+    user = await run_in_threadpool(UserService.get_user_by_username, db, form_data.username)
+    if not user or not await security.verify_password_async(form_data.password, user.password_hash):
         # Log failed login attempt if user exists
         if user:
-            log_login(db, user, request, success=False)
+            await run_in_threadpool(log_login, db, user, request, False)
         raise HTTPException(status_code=400, detail="Incorrect username or password")
 
+    # Upgrade the stored hash if the configured work factor changed
+    if security.password_needs_rehash(user.password_hash):
+        try:
+            new_hash = await security.get_password_hash_async(form_data.password)
+        except HTTPException:
+            new_hash = None  # Pool is busy; try again on the next login
+        if new_hash:
+            await run_in_threadpool(UserService.set_password_hash, db, user, new_hash)
+
     # Log successful login
-    log_login(db, user, request, success=True)
+    await run_in_threadpool(log_login, db, user, request, True)
     
     access_token_expires = timedelta(minutes=int(security.ACCESS_TOKEN_EXPIRE_MINUTES))
     access_token = security.create_access_token(subject=user.username, expires_delta=access_token_expires)
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from datetime import date
@@ -8,6 +8,8 @@ from backend.app.db import models
 from backend.app.schemas.booking import BookingCreate, BookingUpdate, BookingResponse
 from backend.app.services.booking_service import BookingService
 from backend.app.dependencies.security import require_role
+from backend.app.dependencies.http_cache import conditional_get
+from backend.app.core.responses import prebuilt_json
 from backend.app.core.security import get_current_user
 from backend.app.utils.pagination import PaginatedResponse
 from backend.app.utils.audit import log_booking_action
@@ -46,8 +48,9 @@ def create_booking(
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
-@router.get("/", response_model=PaginatedResponse[BookingResponse])
+@router.get("/", response_model=PaginatedResponse[BookingResponse], dependencies=[Depends(conditional_get("bookings", "guests"))])
 def list_bookings(
+    response: Response,
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(50, ge=1, le=100, description="Items per page"),
     status: Optional[str] = Query(None, description="Filter by status"),
@@ -59,9 +62,9 @@ def list_bookings(
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user)
 ):
-    return BookingService.list_bookings(db, current_user, page, page_size, status, check_in_from, check_in_to, search, sort_by, sort_order)
+    return prebuilt_json(BookingService.list_bookings(db, current_user, page, page_size, status, check_in_from, check_in_to, search, sort_by, sort_order), response)
 
-@router.get("/{booking_id}", response_model=BookingResponse)
+@router.get("/{booking_id}", response_model=BookingResponse, dependencies=[Depends(conditional_get("bookings", "guests"))])
 def get_booking(
     booking_id: int,
     db: Session = Depends(get_db),
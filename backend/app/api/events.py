@@ -0,0 +1,53 @@
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+from typing import Optional
+
+from ..core.security import get_current_user
+from ..db.session import get_db
+from ..db import models
+from ..services import event_stream
+
+router = APIRouter(prefix="/events")
+
+
+def _parse_list(value: Optional[str], name: str, convert=str) -> Optional[list]:
+    if not value:
+        return None
+    try:
+        return [convert(item.strip()) for item in value.split(",") if item.strip()]
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Invalid {name}")
+
+
+@router.get("/stream", response_class=StreamingResponse)
+def stream_events(
+    types: Optional[str] = Query(None, description="Comma-separated event types: room, task, booking"),
+    rooms: Optional[str] = Query(None, description="Comma-separated room ids"),
+    last_event_id: Optional[int] = Header(None, alias="Last-Event-ID"),
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_user)
+):
+    """
+    Server-Sent Events stream of room, task and booking changes as they commit
+
+    - Each event carries the changed fields; `refresh` events mean many rows changed (refetch)
+    - Reconnect with `Last-Event-ID` to receive missed events; a `reset` event means too many
+      were missed and the client should refetch
+    """
+    event_types = _parse_list(types, "types")
+    if event_types and not set(event_types) <= set(event_stream.EVENT_TYPES):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"types must be among: {', '.join(event_stream.EVENT_TYPES)}"
+        )
+    event_filter = event_stream.EventFilter(event_types, _parse_list(rooms, "rooms", int))
+
+    # The stream never queries; give the connection back for its lifetime
+    db.close()
+
+    return StreamingResponse(
+        event_stream.stream(event_filter, last_event_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
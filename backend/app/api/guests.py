@@ -1,12 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.orm import Session
 from typing import List, Optional
 
 from ..db.session import get_db
+from ..dependencies.http_cache import conditional_get
 from ..db import models
 from ..schemas.guest import GuestCreate, GuestResponse, GuestUpdate
 from ..services.guest_service import GuestService
 from ..dependencies.security import require_role
+from ..core.responses import prebuilt_json
 from ..core.security import get_current_user
 from ..utils.pagination import PaginatedResponse
 from ..utils.audit import log_audit
@@ -41,8 +43,9 @@ def create_guest(
     
     return guest
 
-@router.get("/", response_model=PaginatedResponse[GuestResponse])
+@router.get("/", response_model=PaginatedResponse[GuestResponse], dependencies=[Depends(conditional_get("guests"))])
 def list_guests(
+    response: Response,
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(50, ge=1, le=100, description="Items per page"),
     search: Optional[str] = Query(None, description="Search by name, email, or phone"),
@@ -51,9 +54,9 @@ def list_guests(
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user)
 ):
-    return GuestService.list_guests(db, page, page_size, search, sort_by, sort_order)
+    return prebuilt_json(GuestService.list_guests(db, page, page_size, search, sort_by, sort_order), response)
 
-@router.get("/{guest_id}", response_model=GuestResponse)
+@router.get("/{guest_id}", response_model=GuestResponse, dependencies=[Depends(conditional_get("guests"))])
 def get_guest(
     guest_id: int,
     db: Session = Depends(get_db),
@@ -2,9 +2,11 @@
 Housekeeping API endpoints
 CRUD operations and workflow actions for housekeeping tasks
 """
+import time
 from datetime import date
 from typing import List, Optional
-from fastapi import APIRouter, Depends, Query, status
+from fastapi import APIRouter, Depends, Query, Response, status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 
 from backend.app.db.session import get_db
@@ -18,8 +20,14 @@ from backend.app.schemas.housekeeping import (
     TaskAssignRequest,
     TaskCompletionRequest,
     TaskVerificationRequest,
+    DailyTaskGenerationResult,
+    AutoAssignRequest,
+    AutoAssignResult,
+    TaskSyncRequest,
+    TaskSyncResponse,
 )
 from backend.app.services.housekeeping_service import HousekeepingService
+from backend.app.services import task_notifier
 
 
 router = APIRouter(prefix="/housekeeping", tags=["Housekeeping"])
@@ -43,6 +51,64 @@ def create_housekeeping_task(
     return service.create_task(task_data, created_by_id=current_user.id)
 
 
+@router.post(
+    "/tasks/generate",
+    response_model=DailyTaskGenerationResult,
+    dependencies=[Depends(require_role(PermissionLevel.MANAGER, PermissionLevel.ADMIN))],
+)
+def generate_daily_housekeeping_tasks(
+    target_date: Optional[date] = Query(None, description="Day to schedule (defaults to today)"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Generate the day's checkout, stayover and turndown tasks in bulk (Manager+ only)
+
+    Safe to re-run: bookings that already have a task of that type are skipped
+    """
+    service = HousekeepingService(db)
+    return service.generate_daily_tasks(target_date or date.today(), created_by_id=current_user.id)
+
+
+@router.post(
+    "/tasks/auto-assign",
+    response_model=AutoAssignResult,
+    dependencies=[Depends(require_role(PermissionLevel.MANAGER, PermissionLevel.ADMIN))],
+)
+def auto_assign_housekeeping_tasks(
+    request: AutoAssignRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Assign the day's unassigned pending tasks to staff (Manager+ only)
+
+    Balances estimated minutes per person and keeps each person on as few floors as possible
+    """
+    service = HousekeepingService(db)
+    return service.auto_assign_tasks(
+        request.scheduled_date or date.today(),
+        assigned_by_id=current_user.id,
+        staff_ids=request.staff_ids,
+    )
+
+
+@router.post("/tasks/sync", response_model=TaskSyncResponse)
+def sync_housekeeping_tasks(
+    sync_data: TaskSyncRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Apply a mobile device's queued start/complete transitions in one round trip
+
+    Runs in one transaction with a result per operation; replaying a batch is
+    safe (already-applied transitions come back as duplicates)
+    """
+    service = HousekeepingService(db)
+    return service.sync_task_transitions(sync_data.operations, user_id=current_user.id)
+
+
 @router.get("/tasks/", response_model=List[HousekeepingTaskResponse])
 def list_housekeeping_tasks(
     skip: int = Query(0, ge=0),
@@ -82,6 +148,38 @@ def list_housekeeping_tasks(
     )
 
 
+@router.get(
+    "/tasks/next",
+    response_model=HousekeepingTaskResponse,
+    responses={204: {"description": "No task became available before the wait expired"}},
+)
+async def next_housekeeping_task(
+    wait: int = Query(25, ge=0, le=60, description="Seconds to wait for a task"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Long-poll for the caller's next task
+
+    Returns the caller's next pending task, or atomically claims an unassigned
+    one. If there is none, waits up to `wait` seconds for housekeeping writes
+    to make one available; 204 if none did.
+    """
+    service = HousekeepingService(db)
+    deadline = time.monotonic() + wait
+    while True:
+        # Read the counter before querying so a write in between still wakes us
+        seen = task_notifier.version()
+        task = await run_in_threadpool(service.next_task, current_user.id)
+        if task is not None:
+            return task
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return Response(status_code=status.HTTP_204_NO_CONTENT)
+        # Woken or timed out, check once more (writes in other workers do not notify)
+        await task_notifier.wait(seen, remaining)
+
+
 @router.get("/tasks/{task_id}", response_model=HousekeepingTaskResponse)
 def get_housekeeping_task(
     task_id: int,
@@ -1,10 +1,12 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
-from fastapi.responses import Response
+from fastapi.responses import Response, StreamingResponse
 from sqlalchemy.orm import Session
+from datetime import date
 from typing import List, Optional
 
 from ..db.session import get_db
 from ..dependencies.security import require_role
+from ..dependencies.http_cache import conditional_get
 from ..db import models
 from ..schemas.invoice import InvoiceResponse
 from ..services.invoice_service import InvoiceService
@@ -12,7 +14,7 @@ from ..utils.pagination import PaginatedResponse
 
 router = APIRouter(prefix="/invoices")
 
-@router.get("/", response_model=PaginatedResponse[InvoiceResponse])
+@router.get("/", response_model=PaginatedResponse[InvoiceResponse], dependencies=[Depends(conditional_get("invoices", roles=(models.PermissionLevel.REGULAR, models.PermissionLevel.MANAGER, models.PermissionLevel.ADMIN)))])
 def list_invoices(
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(50, ge=1, le=100, description="Items per page"),
@@ -25,6 +27,25 @@ def list_invoices(
     """List all invoices (accessible to all authenticated users)"""
     return InvoiceService.list_invoices(db, page, page_size, search, sort_by, sort_order)
 
+@router.get("/export")
+def export_invoices(
+    start_date: date = Query(..., description="First issue date (inclusive)"),
+    end_date: date = Query(..., description="Last issue date (inclusive)"),
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(require_role(models.PermissionLevel.MANAGER, models.PermissionLevel.ADMIN))
+):
+    """Download the PDFs of all invoices issued in a date range as a streamed ZIP"""
+    if start_date > end_date:
+        raise HTTPException(status_code=400, detail="start_date must be <= end_date")
+    chunks = InvoiceService.export_invoice_pdfs(db, start_date, end_date)
+    return StreamingResponse(
+        chunks,
+        media_type="application/zip",
+        headers={
+            "Content-Disposition": f"attachment; filename=invoices_{start_date}_{end_date}.zip"
+        }
+    )
+
 @router.post("/{booking_id}", response_model=InvoiceResponse)
 def generate_invoice(booking_id: int, db: Session = Depends(get_db), current_user: models.User = Depends(require_role(models.PermissionLevel.ADMIN, models.PermissionLevel.MANAGER))):
     try:
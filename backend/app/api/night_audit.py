@@ -0,0 +1,22 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from datetime import date
+from typing import Optional
+
+from ..db.session import get_db
+from ..dependencies.security import require_role
+from ..db import models
+from ..schemas.night_audit import NightAuditSummary
+from ..services.night_audit_service import NightAuditService
+
+router = APIRouter(prefix="/night-audit")
+
+
+@router.post("/", response_model=NightAuditSummary)
+def run_night_audit(
+    business_date: Optional[date] = Query(None, description="Day being closed (defaults to today)"),
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(require_role(models.PermissionLevel.MANAGER, models.PermissionLevel.ADMIN))
+):
+    """Mark overdue arrivals as no-shows and invoice checked-out bookings in bulk"""
+    return NightAuditService.run(db, business_date, current_user)
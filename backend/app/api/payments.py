@@ -1,10 +1,12 @@
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.orm import Session
 
 from ..db.session import get_db
+from ..core.responses import prebuilt_json
 from ..core.security import get_current_user
 from ..dependencies.security import require_role
+from ..dependencies.http_cache import conditional_get
 from ..db import models
 from ..schemas.payment import PaymentCreate, PaymentResponse
 from ..services.payment_service import PaymentService
@@ -13,8 +15,9 @@ from ..utils.audit import log_payment_action
 
 router = APIRouter(prefix="/payments")
 
-@router.get("/", response_model=PaginatedResponse[PaymentResponse])
+@router.get("/", response_model=PaginatedResponse[PaymentResponse], dependencies=[Depends(conditional_get("payments", "bookings"))])
 def list_payments(
+    response: Response,
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(50, ge=1, le=100, description="Items per page"),
     status: Optional[str] = Query(None, description="Filter by payment status"),
@@ -25,7 +28,7 @@ def list_payments(
 ):
     try:
         payments = PaymentService.list_payments(db, current_user, page, page_size, status, sort_by, sort_order)
-        return payments
+        return prebuilt_json(payments, response)
     except HTTPException as e:
         raise e
 
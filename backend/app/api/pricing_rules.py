@@ -1,6 +1,7 @@
 """
 API endpoints for Pricing Rules
 """
+from datetime import date
 from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
@@ -12,8 +13,16 @@ from ..schemas.pricing_rule import (
     PricingRuleResponse,
     PriceCalculationRequest,
     PriceCalculationResponse,
+    BatchPriceQuoteRequest,
+    BatchPriceQuoteResponse,
+    RateCalendarResponse,
+    LOSMatrixResponse,
+    PricingSimulationRequest,
+    PricingSimulationResponse,
+    RuleAnalysisResponse,
 )
 from ..services.pricing_rule_service import PricingRuleService
+from ..core.config import settings
 from ..dependencies.security import get_current_user, require_role
 from ..db.models import User, PermissionLevel
 from ..utils.audit import log_audit
@@ -77,6 +86,97 @@ def list_pricing_rules(
     return rules
 
 
+@router.get("/rate-calendar", response_model=RateCalendarResponse)
+def get_rate_calendar(
+    start_date: Optional[date] = None,
+    days: Optional[int] = Query(None, ge=1),
+    guest_loyalty_tier: int = Query(0, ge=0),
+    room_type_id: Optional[int] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Nightly rate calendar per room type
+    
+    Returns one rate per night from `start_date` (default: today) for `days`
+    nights (default and maximum: the advance booking window). Each rate is the
+    price of a one-night stay arriving that day after all matching pricing rules.
+    """
+    start_date = start_date or date.today()
+    days = days or settings.ADVANCE_BOOKING_DAYS
+    if days > settings.ADVANCE_BOOKING_DAYS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"days cannot exceed {settings.ADVANCE_BOOKING_DAYS}",
+        )
+    try:
+        return PricingRuleService.rate_calendar(
+            db,
+            start_date=start_date,
+            days=days,
+            guest_loyalty_tier=guest_loyalty_tier,
+            room_type_id=room_type_id,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+
+@router.get("/los-matrix", response_model=LOSMatrixResponse)
+def get_los_matrix(
+    start_date: Optional[date] = None,
+    days: int = Query(90, ge=1),
+    max_nights: int = Query(14, ge=1, le=28),
+    guest_loyalty_tier: int = Query(0, ge=0),
+    room_type_id: Optional[int] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Length-of-stay price matrix per room type
+    
+    For each arrival date from `start_date` (default: today) over `days` days
+    and each length of stay 1..`max_nights`, returns the total stay price as
+    `calculate_price` would. `totals[i][n - 1]` is the price of arriving on
+    `start_date + i` and staying `n` nights.
+    """
+    start_date = start_date or date.today()
+    if days > settings.ADVANCE_BOOKING_DAYS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"days cannot exceed {settings.ADVANCE_BOOKING_DAYS}",
+        )
+    try:
+        return PricingRuleService.los_matrix(
+            db,
+            start_date=start_date,
+            days=days,
+            max_nights=max_nights,
+            guest_loyalty_tier=guest_loyalty_tier,
+            room_type_id=room_type_id,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+
+@router.get("/analysis", response_model=RuleAnalysisResponse)
+def analyze_pricing_rules(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_role(PermissionLevel.MANAGER, PermissionLevel.ADMIN)),
+):
+    """
+    Overlap and conflict analysis of active pricing rules
+    
+    For each room type (its own rules plus global rules) returns:
+    - overlaps: rule pairs whose date ranges intersect, i.e. that can stack
+    - shadowed: rules that always stack on a higher-priority rule of the same type
+    - segments: date ranges with a constant set of rules and their cumulative
+      effect on the base price (stay-level conditions such as min_nights ignored)
+    
+    Requires MANAGER or ADMIN permission
+    """
+    return PricingRuleService.analyze_rules(db)
+
+
 @router.get("/{rule_id}", response_model=PricingRuleResponse)
 def get_pricing_rule(
     rule_id: int,
@@ -175,3 +275,42 @@ def calculate_price(
         return result
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.post("/calculate-price/batch", response_model=BatchPriceQuoteResponse)
+def calculate_prices_batch(
+    batch_request: BatchPriceQuoteRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Calculate prices for many stays in one request
+    
+    Each item is a (room_type_id, check_in, check_out, guest_loyalty_tier) tuple.
+    Room types and pricing rules are loaded once for the whole batch and results
+    are returned in request order. Items that cannot be priced (unknown room
+    type, invalid dates) carry an `error` instead of a `quote`.
+    """
+    return PricingRuleService.calculate_prices_batch(db, batch_request)
+
+
+@router.post("/simulate", response_model=PricingSimulationResponse)
+def simulate_pricing_rules(
+    sim_request: PricingSimulationRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_role(PermissionLevel.MANAGER, PermissionLevel.ADMIN)),
+):
+    """
+    What-if simulation of draft pricing rules over historical bookings
+    
+    The draft rules are not saved. Every booking with check-in between
+    `start_date` and `end_date` is re-priced with only the draft rules, as of
+    the date it was made, and compared with what it was actually charged.
+    Returns revenue totals and each rule's uplift.
+    
+    Requires MANAGER or ADMIN permission
+    """
+    try:
+        return PricingRuleService.simulate_rules(db, sim_request)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
@@ -4,6 +4,7 @@ from datetime import date
 
 from ..db.session import get_db
 from ..dependencies.security import require_role
+from ..dependencies.http_cache import conditional_get
 from ..db import models
 from ..services.report_service import ReportService
 from ..services.housekeeping_report_service import HousekeepingReportService
@@ -17,7 +18,7 @@ from ..schemas.housekeeping_report import (
 router = APIRouter()
 
 
-@router.get("/occupancy", response_model=OccupancyReport)
+@router.get("/occupancy", response_model=OccupancyReport, dependencies=[Depends(conditional_get("bookings", "payments", "rooms", "room_types", roles=(models.PermissionLevel.MANAGER, models.PermissionLevel.ADMIN)))])
 def occupancy_report(start_date: date, end_date: date, db: Session = Depends(get_db), current_user: models.User = Depends(require_role(models.PermissionLevel.MANAGER, models.PermissionLevel.ADMIN))):
     if start_date > end_date:
         raise HTTPException(status_code=400, detail="start_date must be <= end_date")
@@ -25,7 +26,7 @@ def occupancy_report(start_date: date, end_date: date, db: Session = Depends(get
     return data
 
 
-@router.get("/revenue", response_model=RevenueReport)
+@router.get("/revenue", response_model=RevenueReport, dependencies=[Depends(conditional_get("bookings", "payments", "rooms", "room_types", roles=(models.PermissionLevel.MANAGER, models.PermissionLevel.ADMIN)))])
 def revenue_report(start_date: date, end_date: date, db: Session = Depends(get_db), current_user: models.User = Depends(require_role(models.PermissionLevel.MANAGER, models.PermissionLevel.ADMIN))):
     if start_date > end_date:
         raise HTTPException(status_code=400, detail="start_date must be <= end_date")
@@ -33,7 +34,7 @@ def revenue_report(start_date: date, end_date: date, db: Session = Depends(get_d
     return data
 
 
-@router.get("/trends", response_model=TrendsReport)
+@router.get("/trends", response_model=TrendsReport, dependencies=[Depends(conditional_get("bookings", "payments", "rooms", "room_types", roles=(models.PermissionLevel.MANAGER, models.PermissionLevel.ADMIN)))])
 def booking_trends(start_date: date, end_date: date, db: Session = Depends(get_db), current_user: models.User = Depends(require_role(models.PermissionLevel.MANAGER, models.PermissionLevel.ADMIN))):
     if start_date > end_date:
         raise HTTPException(status_code=400, detail="start_date must be <= end_date")
@@ -42,7 +43,11 @@ def booking_trends(start_date: date, end_date: date, db: Session = Depends(get_d
 
 
 # Housekeeping Reports
-@router.get("/housekeeping/dashboard", response_model=HousekeepingDashboard)
+@router.get(
+    "/housekeeping/dashboard",
+    response_model=HousekeepingDashboard,
+    dependencies=[Depends(conditional_get("housekeeping_tasks", "rooms", roles=(models.PermissionLevel.REGULAR, models.PermissionLevel.MANAGER, models.PermissionLevel.ADMIN)))],
+)
 def housekeeping_dashboard(
     db: Session = Depends(get_db),
     current_user: models.User = Depends(require_role(models.PermissionLevel.REGULAR, models.PermissionLevel.MANAGER, models.PermissionLevel.ADMIN))
@@ -52,7 +57,11 @@ def housekeeping_dashboard(
     return data
 
 
-@router.get("/housekeeping/staff-performance", response_model=StaffPerformanceReport)
+@router.get(
+    "/housekeeping/staff-performance",
+    response_model=StaffPerformanceReport,
+    dependencies=[Depends(conditional_get("housekeeping_tasks", "users", roles=(models.PermissionLevel.MANAGER, models.PermissionLevel.ADMIN)))],
+)
 def staff_performance(
     start_date: date,
     end_date: date,
@@ -66,7 +75,11 @@ def staff_performance(
     return data
 
 
-@router.get("/housekeeping/room-status-grid", response_model=RoomStatusGrid)
+@router.get(
+    "/housekeeping/room-status-grid",
+    response_model=RoomStatusGrid,
+    dependencies=[Depends(conditional_get("rooms", "room_types", "housekeeping_tasks", "bookings", "guests", roles=(models.PermissionLevel.REGULAR, models.PermissionLevel.MANAGER, models.PermissionLevel.ADMIN)))],
+)
 def room_status_grid(
     db: Session = Depends(get_db),
     current_user: models.User = Depends(require_role(models.PermissionLevel.REGULAR, models.PermissionLevel.MANAGER, models.PermissionLevel.ADMIN))
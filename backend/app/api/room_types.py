@@ -3,6 +3,7 @@ from sqlalchemy.orm import Session
 from typing import List
 
 from ..db.session import get_db
+from ..dependencies.http_cache import conditional_get
 from ..db import models
 from ..schemas.room_type import RoomTypeCreate, RoomTypeUpdate, RoomTypeResponse
 from ..dependencies.security import require_role
@@ -27,14 +28,14 @@ def create_room_type(
     db.refresh(room_type)
     return room_type
 
-@router.get("/", response_model=List[RoomTypeResponse])
+@router.get("/", response_model=List[RoomTypeResponse], dependencies=[Depends(conditional_get("room_types", max_age=300))])
 def list_room_types(
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user)
 ):
     return db.query(models.RoomType).all()
 
-@router.get("/{room_type_id}", response_model=RoomTypeResponse)
+@router.get("/{room_type_id}", response_model=RoomTypeResponse, dependencies=[Depends(conditional_get("room_types", max_age=300))])
 def get_room_type(
     room_type_id: int,
     db: Session = Depends(get_db),
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.orm import Session
 from typing import List, Optional
 
@@ -7,6 +7,8 @@ from ..db import models
 from ..schemas.room import RoomCreate, RoomUpdate, RoomResponse
 from ..services.room_service import RoomService
 from ..dependencies.security import require_role
+from ..dependencies.http_cache import conditional_get
+from ..core.responses import prebuilt_json
 from ..core.security import get_current_user
 from ..utils.pagination import paginate, apply_sorting, PaginatedResponse
 from ..utils.audit import log_audit
@@ -41,8 +43,9 @@ def create_room(
     
     return room
 
-@router.get("/", response_model=PaginatedResponse[RoomResponse])
+@router.get("/", response_model=PaginatedResponse[RoomResponse], dependencies=[Depends(conditional_get("rooms"))])
 def list_rooms(
+    response: Response,
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(50, ge=1, le=100, description="Items per page"),
     status: Optional[str] = Query(None, description="Filter by status"),
@@ -53,9 +56,9 @@ def list_rooms(
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user)
 ):
-    return RoomService.list_rooms(db, page, page_size, status, room_type_id, search, sort_by, sort_order)
+    return prebuilt_json(RoomService.list_rooms(db, page, page_size, status, room_type_id, search, sort_by, sort_order), response)
 
-@router.get("/{room_id}", response_model=RoomResponse)
+@router.get("/{room_id}", response_model=RoomResponse, dependencies=[Depends(conditional_get("rooms"))])
 def get_room(
     room_id: int,
     db: Session = Depends(get_db),
@@ -1,11 +1,12 @@
 from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from typing import List
 
 from ..db.session import get_db
 from ..schemas.user import UserResponse, UserCreate, UserUpdate
 from ..services.user_service import UserService
-from ..core.security import get_current_user
+from ..core.security import get_current_user, get_password_hash_async
 from ..dependencies.security import require_role
 from ..db import models
 from ..utils.audit import log_audit
@@ -29,20 +30,25 @@ def list_users(
 
 
 @router.post("/", response_model=UserResponse)
-def create_user(
+async def create_user(
     user_in: UserCreate,
     request: Request,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(require_role(models.PermissionLevel.ADMIN))
 ):
     """Create a new user (admin only)."""
-    # Check if username already exists
-    existing = UserService.get_user_by_username(db, user_in.username)
+    # Async so bcrypt runs on the hashing pool; database work stays on the threadpool
+    existing = await run_in_threadpool(UserService.get_user_by_username, db, user_in.username)
     if existing:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail="Username already exists"
         )
-    new_user = UserService.create_user(db, user_in)
+    password_hash = await get_password_hash_async(user_in.password)
+    return await run_in_threadpool(_create_user, db, user_in, password_hash, current_user, request)
+
+
+def _create_user(db: Session, user_in: UserCreate, password_hash: str, current_user: models.User, request: Request):
+    new_user = UserService.create_user(db, user_in, password_hash)
     
     # Log user creation
     log_audit(
@@ -64,7 +70,7 @@ def create_user(
 
 
 @router.patch("/{user_id}", response_model=UserResponse)
-def update_user(
+async def update_user(
     user_id: int,
     user_in: UserUpdate,
     request: Request,
@@ -72,6 +78,13 @@ def update_user(
     current_user: models.User = Depends(require_role(models.PermissionLevel.ADMIN))
 ):
     """Update a user (admin only)."""
+    password_hash = await get_password_hash_async(user_in.password) if user_in.password else None
+    return await run_in_threadpool(_update_user, db, user_id, user_in, password_hash, current_user, request)
+
+
+def _update_user(
+    db: Session, user_id: int, user_in: UserUpdate, password_hash, current_user: models.User, request: Request
+):
     # Get old values before update
     old_user = db.query(models.User).filter(models.User.id == user_id).first()
     if not old_user:
@@ -90,7 +103,7 @@ def update_user(
         old_values["is_active"] = old_user.is_active
         new_values["is_active"] = user_in.is_active
     
-    user = UserService.update_user(db, user_id, user_in)
+    user = UserService.update_user(db, user_id, user_in, password_hash)
     
     # Log user update
     if old_values or new_values:
@@ -0,0 +1,99 @@
+"""
+Response compression (brotli or gzip) above a size threshold.
+
+Picks brotli when the client accepts it and the optional ``brotli`` package
+is installed, otherwise gzip. Small bodies, already encoded responses and
+content that is streamed or already compressed (Server-Sent Events, PDFs,
+ZIP exports) pass through untouched.
+"""
+import gzip
+import io
+
+from starlette.datastructures import Headers
+from starlette.middleware.gzip import IdentityResponder
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+    BROTLI_AVAILABLE = False
+
+EXCLUDED_CONTENT_TYPES = ("text/event-stream", "application/pdf", "application/zip")
+
+
+def accepted_encodings(header: str) -> set:
+    """Encodings named in Accept-Encoding, minus any refused with q=0."""
+    accepted = set()
+    for item in header.split(","):
+        name, _, params = item.strip().partition(";")
+        params = params.replace(" ", "")
+        if name and params not in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            accepted.add(name.lower())
+    return accepted
+
+
+class _Responder(IdentityResponder):
+    async def send_with_compression(self, message: Message) -> None:
+        await super().send_with_compression(message)
+        if message["type"] == "http.response.start":
+            content_type = Headers(raw=message["headers"]).get("content-type", "")
+            self.content_type_is_excluded = content_type.startswith(EXCLUDED_CONTENT_TYPES)
+
+
+class _GZipResponder(_Responder):
+    content_encoding = "gzip"
+
+    def __init__(self, app: ASGIApp, minimum_size: int, level: int) -> None:
+        super().__init__(app, minimum_size)
+        self.buffer = io.BytesIO()
+        self.gzip_file = gzip.GzipFile(mode="wb", fileobj=self.buffer, compresslevel=level)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        with self.buffer, self.gzip_file:
+            await super().__call__(scope, receive, send)
+
+    def apply_compression(self, body: bytes, *, more_body: bool) -> bytes:
+        self.gzip_file.write(body)
+        if not more_body:
+            self.gzip_file.close()
+        body = self.buffer.getvalue()
+        self.buffer.seek(0)
+        self.buffer.truncate()
+        return body
+
+
+class _BrotliResponder(_Responder):
+    content_encoding = "br"
+
+    def __init__(self, app: ASGIApp, minimum_size: int, quality: int) -> None:
+        super().__init__(app, minimum_size)
+        self.compressor = brotli.Compressor(quality=quality)
+
+    def apply_compression(self, body: bytes, *, more_body: bool) -> bytes:
+        compressed = self.compressor.process(body)
+        return compressed + (self.compressor.flush() if more_body else self.compressor.finish())
+
+
+class CompressionMiddleware:
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024, gzip_level: int = 6, brotli_quality: int = 4) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        accepted = accepted_encodings(Headers(scope=scope).get("Accept-Encoding", ""))
+        responder: ASGIApp
+        if BROTLI_AVAILABLE and "br" in accepted:
+            responder = _BrotliResponder(self.app, self.minimum_size, self.brotli_quality)
+        elif "gzip" in accepted:
+            responder = _GZipResponder(self.app, self.minimum_size, self.gzip_level)
+        else:
+            responder = _Responder(self.app, self.minimum_size)
+        await responder(scope, receive, send)
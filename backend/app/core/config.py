@@ -25,12 +25,19 @@ class Settings(BaseSettings):
     DATABASE_POOL_SIZE: int = 5
     DATABASE_MAX_OVERFLOW: int = 10
     DATABASE_ECHO: bool = False
+    DATABASE_QUERY_STATS: bool = True  # Per-request query count and DB time (Server-Timing header)
+    DATABASE_REPEATED_QUERY_WARNING: int = 10  # Warn when one statement shape runs more often in a request (N+1); 0 disables
     
     # Security
     JWT_SECRET: str = "dev-secret-change-me-in-production"
     JWT_ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24  # 24 hours
-    
+
+    # Password hashing
+    BCRYPT_ROUNDS: int = 12  # Work factor; existing hashes are upgraded on next login
+    PASSWORD_HASH_WORKERS: int = 4  # Dedicated threads for bcrypt (releases the GIL)
+    PASSWORD_HASH_QUEUE_LIMIT: int = 32  # Waiting hash jobs before login returns 503
+
     # CORS
     CORS_ORIGINS: list[str] = [
         "http://localhost:3000",
@@ -85,7 +92,41 @@ class Settings(BaseSettings):
     
     # Reports
     REPORT_CACHE_TTL: int = 300  # 5 minutes
+
+    # HTTP caching
+    HTTP_CACHE_VALIDATOR_TTL: int = 5  # Max age of a cached ETag validator (other workers' writes)
+    COMPRESSION_MINIMUM_SIZE: int = 1024  # Smaller responses are sent uncompressed
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 4  # Used when the optional brotli package is installed
+
+    # Invoices
+    INVOICE_PDF_CACHE_DIR: str = "uploads/invoice_pdfs"
+    INVOICE_PDF_CACHE_MAX_BYTES: int = 256 * 1024 * 1024  # 256MB; 0 disables the cache
+    INVOICE_RENDER_WORKERS: int = 2  # PDF render processes; 0 renders in the request thread
+    INVOICE_RENDER_QUEUE_LIMIT: int = 8  # Waiting render jobs before PDF downloads return 503
+
+    # Pricing
+    PRICING_RULE_CACHE_TTL: int = 60  # Max age of the compiled rule set (other workers' edits)
+    PRICE_QUOTE_TTL_SECONDS: int = 900  # How long a quoted price can be booked
     
+    # Housekeeping
+    ROOM_STATUS_BOARD_PRELOAD: bool = True  # Load the in-memory room status board at startup
+    ROOM_STATUS_BOARD_RECONCILE_SECONDS: int = 60  # Full reload interval (catches other workers' writes)
+
+    # Live updates (Server-Sent Events)
+    EVENT_BUS: str = "memory"  # memory (single worker), socket (workers on one host), or "module:Class"
+    EVENT_BUS_SOCKET_DIR: str = "/tmp/hms-events"  # Shared by all workers when EVENT_BUS=socket
+    EVENT_STREAM_BUFFER_SIZE: int = 1000  # Recent events kept for Last-Event-ID resume
+    EVENT_STREAM_CLIENT_QUEUE: int = 500  # Undelivered events per client before it is told to reset
+    EVENT_STREAM_HEARTBEAT_SECONDS: int = 15
+    EVENT_STREAM_RETRY_MS: int = 3000  # Client reconnect delay
+
+    # Metrics (/metrics, Prometheus text format)
+    METRICS_ENABLED: bool = True
+    METRICS_DIR: Optional[str] = None  # Shared by all workers so /metrics covers every worker; unset = this worker only
+    METRICS_FLUSH_SECONDS: int = 5  # How often each worker publishes its metrics to METRICS_DIR
+    METRICS_TOKEN: Optional[str] = None  # If set, /metrics requires "Authorization: Bearer <token>"
+
     # Audit
     AUDIT_LOG_RETENTION_DAYS: int = 365
     
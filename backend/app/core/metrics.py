@@ -0,0 +1,394 @@
+"""
+Prometheus metrics, served in the text exposition format at ``/metrics``.
+
+A small in-process registry (counters, gauges, histograms keyed by label
+tuples under one lock each) keeps the per-request cost to a couple of dict
+updates, with no client library dependency. ``MetricsMiddleware`` records
+per-route latency, status codes and in-flight requests; the database pool,
+the threadpool running sync routes and the caches (HTTP validators, invoice
+PDFs, pricing) report into the same registry.
+
+Across uvicorn workers: with ``METRICS_DIR`` set, every worker writes a
+snapshot of its registry to ``<METRICS_DIR>/metrics-<pid>.json`` every
+``METRICS_FLUSH_SECONDS`` (and at shutdown), and whichever worker answers the
+scrape merges its live registry with the other workers' files. Counters and
+histograms are summed over all files, so totals survive worker restarts;
+gauges only count workers that are still running. Empty the directory when
+deploying, as ``prometheus_client``'s multiprocess mode also requires.
+"""
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, List, Optional, Tuple
+
+import anyio.to_thread
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_registry: List["_Metric"] = []
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            values = [[list(labels), value] for labels, value in self._values.items()]
+        return {"type": self.kind, "help": self.documentation, "labelnames": list(self.labelnames), "values": values}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+
+class Gauge(_Metric):
+    """A gauge; with ``collect`` its samples are read from a callback at snapshot time."""
+    kind = "gauge"
+
+    def __init__(self, name, documentation, labelnames=(), collect: Optional[Callable[[], Dict[tuple, float]]] = None):
+        super().__init__(name, documentation, labelnames)
+        self._collect = collect
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def dec(self, *labels: str, amount: float = 1.0) -> None:
+        self.inc(*labels, amount=-amount)
+
+    def set(self, *labels: str, value: float) -> None:
+        with self._lock:
+            self._values[labels] = value
+
+    def snapshot(self) -> dict:
+        if self._collect is not None:
+            try:
+                collected = self._collect()
+            except Exception:
+                logger.exception("Collecting %s failed", self.name)
+                collected = {}
+            with self._lock:
+                self._values = dict(collected)
+        return super().snapshot()
+
+
+class Histogram(_Metric):
+    """Per-bucket counts (not cumulative), sum and count for each label set."""
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+
+    def observe(self, *labels: str, value: float) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(labels)
+            if state is None:
+                state = self._values[labels] = [0] * (len(self.buckets) + 1) + [0.0, 0]
+            state[index] += 1
+            state[-2] += value
+            state[-1] += 1
+
+    def snapshot(self) -> dict:
+        data = super().snapshot()
+        data["buckets"] = list(self.buckets)
+        return data
+
+
+# HTTP
+REQUESTS = Counter("hms_http_requests_total", "HTTP requests by route and status code", ("method", "route", "status"))
+REQUEST_DURATION = Histogram("hms_http_request_duration_seconds", "HTTP request latency by route", ("method", "route"))
+IN_PROGRESS = Gauge("hms_http_requests_in_progress", "HTTP requests being served", ("method",))
+
+# Database pool
+POOL_CHECKOUT_DURATION = Histogram(
+    "hms_db_pool_checkout_seconds",
+    "Time to get a connection from the pool (waiting for a free one or opening a new one)",
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0),
+)
+
+# Caches
+CACHE_REQUESTS = Counter("hms_cache_requests_total", "Cache lookups by cache and result (hit or miss)", ("cache", "result"))
+
+_thread_limiter = None  # anyio's default limiter, captured by the middleware (needs the event loop)
+
+
+def record_cache(cache: str, hit: bool) -> None:
+    """Count one lookup in ``cache``; hit rate is hits / (hits + misses)."""
+    CACHE_REQUESTS.inc(cache, "hit" if hit else "miss")
+
+
+def _threadpool_samples() -> Dict[tuple, float]:
+    limiter = _thread_limiter
+    if limiter is None:
+        return {}
+    return {("busy",): float(limiter.borrowed_tokens), ("max",): float(limiter.total_tokens)}
+
+
+THREADPOOL_THREADS = Gauge(
+    "hms_threadpool_threads",
+    "Threadpool running sync routes and dependencies: busy threads and the maximum",
+    ("state",),
+    collect=_threadpool_samples,
+)
+
+
+def instrument_engine(engine) -> None:
+    """Report ``engine``'s pool size, checked-out and overflow connections and checkout wait time."""
+    pool = engine.pool
+    connect = pool.connect
+
+    def timed_connect():
+        started = time.perf_counter()
+        try:
+            return connect()
+        finally:
+            POOL_CHECKOUT_DURATION.observe(value=time.perf_counter() - started)
+
+    pool.connect = timed_connect
+
+    def samples():
+        values = {}
+        for state, method in (("size", "size"), ("checked_out", "checkedout"), ("overflow", "overflow")):
+            if hasattr(pool, method):
+                values[(state,)] = float(getattr(pool, method)())
+        if ("overflow",) in values:
+            # QueuePool counts overflow from -size until the pool is full
+            values[("overflow",)] = max(values[("overflow",)], 0.0)
+        return values
+
+    Gauge("hms_db_pool_connections", "Database pool connections: configured size, checked out and overflow",
+          ("state",), collect=samples)
+
+
+class MetricsMiddleware:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        global _thread_limiter
+        _thread_limiter = anyio.to_thread.current_default_thread_limiter()  # Per event loop; cheap lookup
+
+        method = scope["method"]
+        status_code = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        IN_PROGRESS.inc(method)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            duration = time.perf_counter() - started
+            IN_PROGRESS.dec(method)
+            # Route templates, not raw paths, keep label cardinality bounded
+            route = getattr(scope.get("route"), "path", None) or "unmatched"
+            REQUEST_DURATION.observe(method, route, value=duration)
+            REQUESTS.inc(method, route, str(status_code))
+
+
+# ---------------------------------------------------------------------------
+# Snapshots, worker files and rendering
+# ---------------------------------------------------------------------------
+
+def snapshot() -> Dict[str, dict]:
+    return {metric.name: metric.snapshot() for metric in _registry}
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _worker_path(directory: str, pid: int) -> str:
+    return os.path.join(directory, f"metrics-{pid}.json")
+
+
+def write_worker_file(directory: str) -> None:
+    """Atomically publish this worker's snapshot for the others to merge."""
+    os.makedirs(directory, exist_ok=True)
+    payload = json.dumps({"pid": os.getpid(), "written_at": time.time(), "metrics": snapshot()})
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as f:
+            f.write(payload)
+        os.replace(tmp_path, _worker_path(directory, os.getpid()))
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def _read_other_workers(directory: str) -> List[Tuple[bool, Dict[str, dict]]]:
+    """``(alive, metrics)`` for every other worker's file in ``directory``."""
+    workers = []
+    try:
+        names = os.listdir(directory)
+    except FileNotFoundError:
+        return workers
+    for name in names:
+        if not (name.startswith("metrics-") and name.endswith(".json")):
+            continue
+        try:
+            pid = int(name[len("metrics-"):-len(".json")])
+        except ValueError:
+            continue
+        if pid == os.getpid():
+            continue
+        try:
+            with open(os.path.join(directory, name)) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            continue  # Being replaced or unreadable: skip this scrape
+        workers.append((_pid_alive(pid), data.get("metrics", {})))
+    return workers
+
+
+def merge(base: Dict[str, dict], other: Dict[str, dict], include_gauges: bool = True) -> Dict[str, dict]:
+    """Add ``other``'s samples into ``base`` (counters and histograms summed, gauges summed if included)."""
+    for name, data in other.items():
+        if data["type"] == "gauge" and not include_gauges:
+            continue
+        target = base.setdefault(name, {**data, "values": []})
+        index = {tuple(labels): position for position, (labels, _) in enumerate(target["values"])}
+        for labels, value in data["values"]:
+            position = index.get(tuple(labels))
+            if position is None:
+                index[tuple(labels)] = len(target["values"])
+                target["values"].append([labels, list(value) if isinstance(value, list) else value])
+            elif isinstance(value, list):
+                current = target["values"][position][1]
+                target["values"][position][1] = [a + b for a, b in zip(current, value)]
+            else:
+                target["values"][position][1] += value
+    return base
+
+
+def collect(directory: Optional[str] = None) -> Dict[str, dict]:
+    """This worker's metrics, merged with the other workers' files when ``directory`` is set."""
+    metrics = snapshot()
+    if directory:
+        for alive, other in _read_other_workers(directory):
+            merge(metrics, other, include_gauges=alive)
+    return metrics
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names, values, extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def render(metrics: Dict[str, dict]) -> bytes:
+    """Prometheus text exposition format (version 0.0.4)."""
+    lines = []
+    for name, data in sorted(metrics.items()):
+        lines.append(f"# HELP {name} {data['help']}")
+        lines.append(f"# TYPE {name} {data['type']}")
+        names = data["labelnames"]
+        for labels, value in sorted(data["values"], key=lambda item: item[0]):
+            if data["type"] != "histogram":
+                lines.append(f"{name}{_labels(names, labels)} {_format_value(value)}")
+                continue
+            cumulative = 0
+            for bound, count in zip(list(data["buckets"]) + [float("inf")], value[:-2]):
+                cumulative += count
+                le = 'le="' + _format_value(bound) + '"'
+                lines.append(f"{name}_bucket{_labels(names, labels, le)} {cumulative}")
+            lines.append(f"{name}_sum{_labels(names, labels)} {_format_value(value[-2])}")
+            lines.append(f"{name}_count{_labels(names, labels)} {_format_value(value[-1])}")
+    return ("\n".join(lines) + "\n").encode()
+
+
+class _Flusher(threading.Thread):
+    def __init__(self, directory: str, interval: float):
+        super().__init__(name="metrics-flush", daemon=True)
+        self.directory = directory
+        self.interval = interval
+        self.stopped = threading.Event()
+
+    def run(self) -> None:
+        while not self.stopped.wait(self.interval):
+            self.flush()
+
+    def flush(self) -> None:
+        try:
+            write_worker_file(self.directory)
+        except OSError:
+            logger.exception("Could not write worker metrics to %s", self.directory)
+
+
+_flusher: Optional[_Flusher] = None
+
+
+def start(directory: Optional[str], interval: float) -> None:
+    """Begin publishing this worker's metrics to ``directory`` (no-op without one)."""
+    global _flusher
+    if not directory or _flusher is not None:
+        return
+    _flusher = _Flusher(directory, interval)
+    _flusher.flush()
+    _flusher.start()
+
+
+def shutdown() -> None:
+    """Stop publishing, writing a final snapshot so this worker's counters are kept."""
+    global _flusher
+    flusher, _flusher = _flusher, None
+    if flusher is not None:
+        flusher.stopped.set()
+        flusher.join(timeout=5)
+        flusher.flush()
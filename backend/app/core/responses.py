@@ -0,0 +1,44 @@
+"""
+Default JSON response class backed by orjson.
+
+orjson serializes dicts, lists, dates and datetimes natively and several
+times faster than the stdlib ``json`` module FastAPI's ``JSONResponse`` uses.
+Decimals (which only reach the renderer when a route returns this response
+with raw content) are written as strings, the same way Pydantic serializes
+the ``Decimal`` fields of our response models, so money stays exact.
+
+``prebuilt_json`` is for routes whose service already returns serialized
+content (the column-projected list endpoints): returning a response directly
+skips FastAPI's second validation pass against ``response_model``.
+"""
+from decimal import Decimal
+from typing import Any
+
+import orjson
+from fastapi import Response
+from fastapi.responses import JSONResponse
+
+_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_UTC_Z
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        return str(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class FastJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=_default, option=_OPTIONS)
+
+
+def prebuilt_json(content: Any, response: Response) -> FastJSONResponse:
+    """
+    Render already-serialized ``content``, keeping the status and headers
+    dependencies set on the route's injected ``response`` (ETag, Cache-Control...).
+    """
+    rendered = FastJSONResponse(content, status_code=response.status_code or 200)
+    rendered.raw_headers.extend(
+        (name, value) for name, value in response.raw_headers if name != b"content-length"
+    )
+    return rendered
@@ -1,3 +1,6 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Optional
 
@@ -19,11 +22,25 @@ ACCESS_TOKEN_EXPIRE_MINUTES = settings.ACCESS_TOKEN_EXPIRE_MINUTES
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/token")
 
 
-def get_password_hash(password: str) -> str:
+# bcrypt runs on a small dedicated pool instead of the shared anyio threadpool, so
+# a burst of logins cannot starve every other sync route. bcrypt releases the GIL
+# while hashing, so threads give real parallelism here.
+_hash_executor = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    thread_name_prefix="password-hash",
+)
+# Admission control: running + queued hash jobs. When exhausted we fail fast
+# with 503 rather than letting requests pile up behind the pool.
+_hash_slots = threading.BoundedSemaphore(
+    settings.PASSWORD_HASH_WORKERS + settings.PASSWORD_HASH_QUEUE_LIMIT
+)
+
+
+def get_password_hash(password: str, rounds: Optional[int] = None) -> str:
     """Hash a password using bcrypt."""
     # Convert password to bytes, truncate if needed for bcrypt's 72-byte limit
     password_bytes = password.encode("utf-8")[:72]
-    salt = bcrypt.gensalt(rounds=12)
+    salt = bcrypt.gensalt(rounds=rounds or settings.BCRYPT_ROUNDS)
     hashed = bcrypt.hashpw(password_bytes, salt)
     return hashed.decode("utf-8")
 
@@ -39,6 +56,43 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
         return False
 
 
+def password_needs_rehash(hashed_password: str) -> bool:
+    """Return True if the hash was created with a different work factor than configured."""
+    try:
+        # bcrypt hashes look like $2b$12$<salt+digest>
+        rounds = int(hashed_password.split("$")[2])
+    except (IndexError, ValueError, AttributeError):
+        return False
+    return rounds != settings.BCRYPT_ROUNDS
+
+
+async def _run_hash_job(func, *args):
+    """Run a bcrypt call on the dedicated pool, or raise 503 if it is saturated."""
+    if not _hash_slots.acquire(blocking=False):
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Authentication service is busy. Please retry shortly.",
+            headers={"Retry-After": "1"},
+        )
+    try:
+        future = _hash_executor.submit(func, *args)
+    except BaseException:
+        _hash_slots.release()
+        raise
+    future.add_done_callback(lambda _: _hash_slots.release())
+    return await asyncio.wrap_future(future)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """Hash a password on the bounded hashing pool (raises 503 when saturated)."""
+    return await _run_hash_job(get_password_hash, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password on the bounded hashing pool (raises 503 when saturated)."""
+    return await _run_hash_job(verify_password, plain_password, hashed_password)
+
+
 def create_access_token(subject: str, expires_delta: Optional[timedelta] = None) -> str:
     to_encode = {"sub": subject}
     if expires_delta:
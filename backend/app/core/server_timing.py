@@ -0,0 +1,57 @@
+"""
+Per-request database metrics as a ``Server-Timing`` header.
+
+Each HTTP request gets its own ``QueryStats`` (see ``db.query_stats``); when
+the response starts, its query count and DB time are added as
+
+    Server-Timing: db;dur=12.4;desc="7 queries", app;dur=20.1
+
+which browser dev tools show in the request's timing panel. After the
+response, a warning is logged for every statement shape that ran more than
+``repeated_query_warning`` times in the request (the N+1 pattern).
+"""
+import logging
+import time
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from ..db import query_stats
+
+logger = logging.getLogger(__name__)
+
+
+class ServerTimingMiddleware:
+    def __init__(self, app: ASGIApp, repeated_query_warning: int = 10) -> None:
+        self.app = app
+        self.repeated_query_warning = repeated_query_warning
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        token = query_stats.start()
+        stats = query_stats.current()
+
+        async def send_with_timing(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers.append(
+                    "Server-Timing",
+                    f'db;dur={stats.duration * 1000:.1f};desc="{stats.count} queries", '
+                    f"app;dur={(time.perf_counter() - started) * 1000:.1f}",
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            query_stats.stop(token)
+            if self.repeated_query_warning > 0:
+                for shape, count in stats.repeated(self.repeated_query_warning):
+                    logger.warning(
+                        "Repeated query (possible N+1): %s %s ran the same statement %d times: %s",
+                        scope["method"], scope["path"], count, shape[:500],
+                    )
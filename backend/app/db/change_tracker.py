@@ -0,0 +1,130 @@
+"""
+Per-table change counters for in-process caches.
+
+Every committed ORM write bumps a counter for the tables it touched, so caches
+can compare a version tuple instead of querying the database to find out
+whether their source data changed. Counters are per process; caches that must
+converge across workers should also apply a short TTL.
+
+Tables registered with ``track_in_database`` additionally get a counter row in
+``table_versions`` that is bumped inside the writing transaction itself, so
+every worker sees the new version exactly when it can see the write.
+"""
+import threading
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Dict, Iterable, Set, Tuple
+
+from sqlalchemy import event, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from .models import Base, TableVersion
+
+_versions: Dict[str, int] = defaultdict(int)
+_lock = threading.Lock()
+
+_PENDING_KEY = "change_tracker_pending_tables"
+
+_database_tables: Set[str] = set()
+
+
+def table_version(*tables: str) -> Tuple[int, ...]:
+    """Return the current change counters for the given table names."""
+    return tuple(_versions[t] for t in tables)
+
+
+def bump(*tables: str) -> None:
+    """Mark tables as changed (for writes that bypass the ORM session)."""
+    with _lock:
+        for table in tables:
+            _versions[table] += 1
+
+
+def track_in_database(*tables: str) -> None:
+    """Also count commits to ``tables`` in ``table_versions`` (see module docstring)."""
+    _database_tables.update(tables)
+
+
+def _bump_database_version(connection, table_name: str, now: datetime) -> None:
+    table = TableVersion.__table__
+    dialect_insert = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}.get(connection.dialect.name)
+    if dialect_insert is not None:
+        connection.execute(
+            dialect_insert(table)
+            .values(table_name=table_name, version=1, changed_at=now)
+            .on_conflict_do_update(
+                index_elements=[table.c.table_name],
+                set_={"version": table.c.version + 1, "changed_at": now},
+            )
+        )
+        return
+    bumped = connection.execute(
+        update(table).where(table.c.table_name == table_name).values(version=table.c.version + 1, changed_at=now)
+    )
+    if bumped.rowcount == 0:
+        connection.execute(table.insert().values(table_name=table_name, version=1, changed_at=now))
+
+
+def _pending(session: Session) -> set:
+    return session.info.setdefault(_PENDING_KEY, set())
+
+
+def _table_names(objects: Iterable) -> set:
+    names = set()
+    for obj in objects:
+        table = getattr(obj, "__table__", None)
+        if table is not None:
+            names.add(table.name)
+    return names
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_flushed_tables(session, flush_context):
+    pending = _pending(session)
+    pending |= _table_names(session.new)
+    pending |= _table_names(session.dirty)
+    pending |= _table_names(session.deleted)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _collect_bulk_statement_tables(orm_execute_state):
+    # Bulk insert/update/delete statements executed through the session
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        table = getattr(orm_execute_state.statement, "table", None)
+        if table is not None:
+            _pending(orm_execute_state.session).add(table.name)
+
+
+@event.listens_for(Session, "before_commit")
+def _bump_database_versions(session):
+    if not _database_tables:
+        return
+    session.flush()  # Complete the pending set; the commit's own flush then has nothing left
+    tables = sorted(_pending(session) & _database_tables)
+    if not tables:
+        return
+    connection = session.connection()
+    now = datetime.now(timezone.utc)
+    # Sorted, so concurrent writers lock counter rows in the same order
+    for name in tables:
+        _bump_database_version(connection, name, now)
+
+
+@event.listens_for(Session, "after_commit")
+def _bump_committed_tables(session):
+    pending = session.info.pop(_PENDING_KEY, None)
+    if pending:
+        bump(*pending)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_rolled_back_tables(session):
+    session.info.pop(_PENDING_KEY, None)
+
+
+@event.listens_for(Base.metadata, "after_create")
+@event.listens_for(Base.metadata, "after_drop")
+def _bump_all_tables(target, connection, **kw):
+    # Schema (re)creation invalidates everything, e.g. between test runs
+    bump(*target.tables.keys())
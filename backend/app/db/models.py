@@ -1,9 +1,9 @@
-from sqlalchemy import Column, Integer, String, Date, DateTime, ForeignKey, Boolean, Numeric, Enum as SQLEnum
+from sqlalchemy import BigInteger, Column, Integer, SmallInteger, String, Date, DateTime, ForeignKey, Boolean, Numeric, Index, Enum as SQLEnum, event
 from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.orm import relationship, declarative_base
 from sqlalchemy.sql import func
 from enum import Enum
-from datetime import date
+from datetime import date, datetime, time
 
 Base = declarative_base()
 
@@ -258,6 +258,7 @@ class Booking(Base):
     # Pricing
     price_per_night = Column(Numeric(10, 2), nullable=False)  # Lock in price at booking time
     total_price = Column(Numeric(10, 2), nullable=False)
+    price_quote_nonce = Column(String(16), unique=True, nullable=True)  # Redeemed price quote (single use)
     
     status = Column(SQLEnum(BookingStatus, name="booking_status", values_callable=lambda x: [e.value for e in x]), default=BookingStatus.PENDING.value, nullable=False, index=True)
     
@@ -303,6 +304,7 @@ class Payment(Base):
     status = Column(SQLEnum(PaymentStatus, name="payment_status", values_callable=lambda x: [e.value for e in x]), default=PaymentStatus.PENDING.value, nullable=False)
 
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     processed_at = Column(DateTime(timezone=True), nullable=True)
     refunded_at = Column(DateTime(timezone=True), nullable=True)
 
@@ -323,6 +325,7 @@ class Invoice(Base):
     total = Column(Numeric(10, 2), nullable=False)
 
     issued_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
     booking = relationship("Booking")
 
@@ -354,9 +357,40 @@ class CancellationPolicy(Base):
 # -----------------------------
 # Housekeeping Task
 # -----------------------------
+TASK_PRIORITY_RANK = {"urgent": 1, "high": 2, "normal": 3, "low": 4}
+
+# Tasks without a time are due by the end of their day
+END_OF_DAY = time(23, 59, 59)
+
+
+def task_priority_rank(priority: str) -> int:
+    return TASK_PRIORITY_RANK.get(priority, 5)
+
+
+def task_scheduled_at(scheduled_date: date, scheduled_time: str = None) -> datetime:
+    """
+    Combine a task's date and optional "HH:MM" time into one sortable timestamp.
+
+    A missing or unparseable time (e.g. a legacy free-text value) sorts at the
+    end of the day.
+    """
+    if scheduled_time:
+        try:
+            hours, minutes = scheduled_time.split(":")
+            return datetime.combine(scheduled_date, time(int(hours), int(minutes)))
+        except ValueError:
+            pass
+    return datetime.combine(scheduled_date, END_OF_DAY)
+
+
 class HousekeepingTask(Base):
     """Track cleaning, maintenance, and inspection tasks for rooms"""
     __tablename__ = "housekeeping_tasks"
+    __table_args__ = (
+        # Task queues: filter by status, order by priority then time
+        Index("ix_housekeeping_tasks_queue", "status", "priority_rank", "scheduled_at"),
+        Index("ix_housekeeping_tasks_assignee_queue", "assigned_to", "status", "priority_rank", "scheduled_at"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     
@@ -375,6 +409,11 @@ class HousekeepingTask(Base):
     # Scheduling
     scheduled_date = Column(Date, nullable=False, index=True)
     scheduled_time = Column(String(10), nullable=True)  # HH:MM format
+
+    # Derived from priority / scheduled_date + scheduled_time so queue queries
+    # can use the composite indexes above (kept in sync on flush)
+    priority_rank = Column(SmallInteger, nullable=False, server_default="3")
+    scheduled_at = Column(DateTime, nullable=False)
     
     # Timing tracking
     started_at = Column(DateTime(timezone=True), nullable=True)
@@ -407,6 +446,13 @@ class HousekeepingTask(Base):
     def __repr__(self):
         return f"<HousekeepingTask {self.task_type} for Room {self.room_id} - {self.status}>"
 
+
+@event.listens_for(HousekeepingTask, "before_insert")
+@event.listens_for(HousekeepingTask, "before_update")
+def _sync_task_queue_columns(mapper, connection, task):
+    task.priority_rank = task_priority_rank(task.priority or "normal")
+    task.scheduled_at = task_scheduled_at(task.scheduled_date, task.scheduled_time)
+
 # -----------------------------
 # Audit Log
 # -----------------------------
@@ -442,3 +488,15 @@ class AuditLog(Base):
     
     def __repr__(self):
         return f"<AuditLog {self.action} on {self.entity_type}#{self.entity_id} by {self.username}>"
+
+
+# -----------------------------
+# Table versions
+# -----------------------------
+class TableVersion(Base):
+    """Commit counter per table, bumped in the writing transaction (see ``db.change_tracker``)"""
+    __tablename__ = "table_versions"
+
+    table_name = Column(String(64), primary_key=True)
+    version = Column(BigInteger, nullable=False, default=0)
+    changed_at = Column(DateTime(timezone=True), nullable=True)  # Time of the last bumping commit
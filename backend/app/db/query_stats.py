@@ -0,0 +1,122 @@
+"""
+Per-request SQL query counts, DB time and repeated-statement (N+1) detection.
+
+Engine-level ``before/after_cursor_execute`` listeners time every statement
+sent to the database and add it to the ``QueryStats`` of the request that is
+running (a context variable set by ``core.server_timing``, which Starlette
+carries into the threadpool running sync routes and dependencies). Statements
+are also grouped by shape (the SQL with literals and IN lists collapsed), so a
+loop issuing the same query per row shows up as one shape with a high count.
+
+``capture_queries`` collects every statement from any thread while it is
+open; the test suite's ``assert_max_queries`` fixture is built on it.
+"""
+import re
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+_current: ContextVar[Optional["QueryStats"]] = ContextVar("query_stats", default=None)
+_captures: List["QueryStats"] = []
+_captures_lock = threading.Lock()
+
+_START_KEY = "query_stats_start"
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"\bIN \((?:\s*\?\s*,)+\s*\?\s*\)", re.IGNORECASE)
+_PLACEHOLDER = re.compile(r"%\(\w+\)s|%s|:\w+|\$\d+")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def statement_shape(statement: str) -> str:
+    """The statement with whitespace, literals, placeholders and IN lists normalised."""
+    shape = _WHITESPACE.sub(" ", statement).strip()
+    shape = _STRING_LITERAL.sub("?", shape)
+    shape = _PLACEHOLDER.sub("?", shape)
+    shape = _NUMBER_LITERAL.sub("?", shape)
+    return _IN_LIST.sub("IN (?)", shape)
+
+
+class QueryStats:
+    """Query count, total DB time and per-shape counts for one unit of work."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0  # seconds
+        self.shapes: Counter = Counter()
+
+    def record(self, statement: str, duration: float) -> None:
+        self.count += 1
+        self.duration += duration
+        self.shapes[statement_shape(statement)] += 1
+
+    def repeated(self, threshold: int) -> List[tuple]:
+        """``(shape, count)`` for shapes that ran more than ``threshold`` times, most frequent first."""
+        return [(shape, count) for shape, count in self.shapes.most_common() if count > threshold]
+
+    def report(self) -> str:
+        lines = [f"{self.count} queries in {self.duration * 1000:.1f}ms"]
+        lines += [f"  {count:>4} x {shape}" for shape, count in self.shapes.most_common()]
+        return "\n".join(lines)
+
+
+def current() -> Optional[QueryStats]:
+    """Stats of the request being served on this context, if any."""
+    return _current.get()
+
+
+def start() -> object:
+    """Begin collecting for the current context; returns a token for ``stop``."""
+    return _current.set(QueryStats())
+
+
+def stop(token) -> None:
+    _current.reset(token)
+
+
+@contextmanager
+def capture_queries() -> Iterator[QueryStats]:
+    """Collect every statement executed (on any thread) while the block runs."""
+    stats = QueryStats()
+    with _captures_lock:
+        _captures.append(stats)
+    try:
+        yield stats
+    finally:
+        with _captures_lock:
+            _captures.remove(stats)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault(_START_KEY, []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info[_START_KEY].pop()
+    stats = _current.get()
+    if stats is None and not _captures:
+        return
+    duration = time.perf_counter() - started
+    if stats is not None:
+        stats.record(statement, duration)
+    if _captures:
+        with _captures_lock:
+            for capture in _captures:
+                capture.record(statement, duration)
+
+
+@event.listens_for(Engine, "handle_error")
+def _handle_error(exception_context):
+    # after_cursor_execute does not fire for failed statements
+    connection = exception_context.connection
+    if connection is not None and connection.info.get(_START_KEY):
+        connection.info[_START_KEY].pop()
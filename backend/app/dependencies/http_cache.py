@@ -0,0 +1,159 @@
+"""
+Conditional GET support (ETag / Last-Modified -> 304 Not Modified).
+
+``conditional_get(*tables)`` is a route dependency for GETs whose response
+depends only on the given tables. It runs after authentication and before the
+route body, so a matching ``If-None-Match`` (or ``If-Modified-Since``) returns
+304 without running the route's query or serializing anything.
+
+The validator for a set of tables is one aggregate query: each table's
+commit counter in ``table_versions`` (bumped inside every writing transaction,
+see ``db.change_tracker``), plus row count, max id and latest timestamps to
+catch writes made outside the ORM. It is cached per process and reused until a
+local commit touches one of the tables or ``HTTP_CACHE_VALIDATOR_TTL`` seconds
+pass, which bounds how long another worker's write can go unnoticed. ETags are
+weak (the body may be compressed differently) and also cover the URL, the user
+and today's date, since list filters, permissions and "today" relative reports
+change the body too.
+
+``Last-Modified`` has one-second resolution, so it is only sent once the
+second of the last change is over (plus commit latency): a later write in that
+same second would otherwise leave it unchanged and validate stale copies.
+"""
+import hashlib
+import threading
+import time
+from datetime import date, datetime, timedelta, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Dict, Optional, Tuple
+
+from fastapi import Depends, HTTPException, Request, Response, status
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from ..core import metrics
+from ..core.config import settings
+from ..core.security import get_current_user
+from ..db import change_tracker, models
+from ..db.session import get_db
+from .security import require_role
+
+# A change stamped in second S is committed (and visible) well before S + 2
+LAST_MODIFIED_SETTLE = timedelta(seconds=2)
+
+_lock = threading.Lock()
+_validators: Dict[Tuple[str, ...], tuple] = {}  # tables -> (local version, computed at, fingerprint, last modified)
+
+
+def _as_utc(value: Optional[datetime]) -> Optional[datetime]:
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)  # func.now() is UTC
+    return value
+
+
+def _compute(db: Session, tables: Tuple[str, ...]) -> Tuple[str, Optional[datetime]]:
+    versions = models.TableVersion.__table__
+    columns = []
+    timestamp_columns = []
+    for name in tables:
+        table = models.Base.metadata.tables[name]
+        version = select(versions.c.version).where(versions.c.table_name == name)
+        columns.append(version.scalar_subquery())
+        columns.append(select(func.count()).select_from(table).scalar_subquery())
+        columns.append(select(func.max(table.c.id)).scalar_subquery())
+        timestamps = [
+            select(func.max(table.c[c])).scalar_subquery()
+            for c in ("created_at", "issued_at", "updated_at") if c in table.c
+        ]
+        timestamps.append(select(versions.c.changed_at).where(versions.c.table_name == name).scalar_subquery())
+        columns.extend(timestamps)
+        timestamp_columns.extend(range(len(columns) - len(timestamps), len(columns)))
+    row = db.execute(select(*columns)).one()
+
+    changed = [_as_utc(row[i]) for i in timestamp_columns if row[i] is not None]
+    return repr(tuple(row)), max(changed, default=None)
+
+
+def table_validator(db: Session, tables: Tuple[str, ...]) -> Tuple[str, Optional[datetime]]:
+    """Fingerprint and last modification time of ``tables`` (cached, see module docstring)."""
+    version = change_tracker.table_version(*tables)
+    now = time.monotonic()
+    with _lock:
+        cached = _validators.get(tables)
+    if cached and cached[0] == version and now - cached[1] < settings.HTTP_CACHE_VALIDATOR_TTL:
+        metrics.record_cache("http_validator", hit=True)
+        return cached[2], cached[3]
+    metrics.record_cache("http_validator", hit=False)
+
+    fingerprint, last_modified = _compute(db, tables)
+    with _lock:
+        _validators[tables] = (version, now, fingerprint, last_modified)
+    return fingerprint, last_modified
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    if header.strip() == "*":
+        return True
+    # Weak comparison: W/"x" and "x" match
+    tag = etag.removeprefix("W/")
+    return any(candidate.strip().removeprefix("W/") == tag for candidate in header.split(","))
+
+
+def _not_modified_since(header: str, last_modified: datetime) -> bool:
+    try:
+        since = parsedate_to_datetime(header)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    return last_modified.replace(microsecond=0) <= since
+
+
+def conditional_get(*tables: str, max_age: int = 0, roles: Tuple[models.PermissionLevel, ...] = ()):
+    """
+    Dependency factory adding ETag/Last-Modified validators and 304 handling.
+
+    ``max_age`` lets clients reuse the response without asking for that many
+    seconds (reference data); otherwise they must revalidate every time.
+    ``roles`` repeats the route's role check so a 304 is never sent where the
+    route itself would answer 403.
+    """
+    tables = tuple(sorted(tables))
+    change_tracker.track_in_database(*tables)
+    authenticate = require_role(*roles) if roles else get_current_user
+    cache_control = f"private, max-age={max_age}" if max_age else "private, no-cache"
+
+    def dependency(
+        request: Request,
+        response: Response,
+        current_user: models.User = Depends(authenticate),
+        db: Session = Depends(get_db)
+    ) -> None:
+        fingerprint, last_modified = table_validator(db, tables)
+        # Reports relative to "today" change at midnight even if no row does
+        start_of_day = datetime.combine(date.today(), datetime.min.time()).astimezone(timezone.utc)
+        last_modified = max(last_modified, start_of_day) if last_modified else start_of_day
+        # Only vouch for a Last-Modified second once no more commits can land in it
+        settled = datetime.now(timezone.utc) - last_modified.replace(microsecond=0) >= LAST_MODIFIED_SETTLE
+        digest = hashlib.sha1(
+            f"{fingerprint}|{request.url.path}?{request.url.query}|{current_user.id}|{date.today()}".encode()
+        ).hexdigest()
+        headers = {"ETag": f'W/"{digest}"', "Cache-Control": cache_control}
+        if settled:
+            headers["Last-Modified"] = format_datetime(last_modified, usegmt=True)
+
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match is not None:
+            not_modified = _etag_matches(if_none_match, headers["ETag"])
+        else:
+            if_modified_since = request.headers.get("if-modified-since")
+            not_modified = (
+                settled and if_modified_since is not None and _not_modified_since(if_modified_since, last_modified)
+            )
+        if not_modified:
+            raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        response.headers.update(headers)
+
+    return dependency
@@ -2,7 +2,7 @@ import uvicorn
 import signal
 import asyncio
 from contextlib import asynccontextmanager
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from slowapi import Limiter
@@ -10,10 +10,19 @@ from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
 from fastapi.responses import JSONResponse
 import os
+import hmac
 import logging
 
 # Import routers
-from backend.app.api import reports, rooms, guests, bookings, auth, room_types, users, payments, invoices, audit_logs, pricing_rules, housekeeping
+from backend.app.api import reports, rooms, guests, bookings, auth, room_types, users, payments, invoices, audit_logs, pricing_rules, housekeeping, night_audit, events
+from backend.app.services.invoice_renderer import shutdown_render_pool
+from backend.app.services import event_stream, room_status_board
+from backend.app.core import metrics
+from backend.app.core.config import settings
+from backend.app.core.compression import CompressionMiddleware
+from backend.app.core.responses import FastJSONResponse
+from backend.app.core.server_timing import ServerTimingMiddleware
+from backend.app.db.session import SessionLocal, engine
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -23,17 +32,35 @@ logger = logging.getLogger(__name__)
 shutdown_event = asyncio.Event()
 
 
+def _preload_room_status_board():
+    db = SessionLocal()
+    try:
+        room_status_board.load(db)
+    except Exception:
+        # Not fatal: the board loads on first use instead
+        logger.exception("Could not preload room status board")
+    finally:
+        db.close()
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Manage application lifespan with graceful startup and shutdown"""
     # Startup
     logger.info("Starting Hotel Management System API...")
+    if settings.ROOM_STATUS_BOARD_PRELOAD:
+        await asyncio.to_thread(_preload_room_status_board)
+    if settings.METRICS_ENABLED:
+        metrics.start(settings.METRICS_DIR, settings.METRICS_FLUSH_SECONDS)
     yield
     # Shutdown
     logger.info("Initiating graceful shutdown...")
     shutdown_event.set()
+    event_stream.shutdown()
     # Give in-flight requests time to complete
     await asyncio.sleep(2)
+    shutdown_render_pool()
+    metrics.shutdown()
     logger.info("Shutdown complete")
 
 
@@ -42,6 +69,7 @@ app = FastAPI(
     description="Backend API for a full-featured hotel management system",
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=FastJSONResponse,
 )
 
 # Configure rate limiting
@@ -76,6 +104,20 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+    gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+    brotli_quality=settings.COMPRESSION_BROTLI_QUALITY,
+)
+
+if settings.DATABASE_QUERY_STATS:
+    app.add_middleware(ServerTimingMiddleware, repeated_query_warning=settings.DATABASE_REPEATED_QUERY_WARNING)
+
+if settings.METRICS_ENABLED:
+    app.add_middleware(metrics.MetricsMiddleware)
+    metrics.instrument_engine(engine)
+
 # Register routers
 app.include_router(rooms.router, prefix="/rooms", tags=["Rooms"])
 app.include_router(room_types.router, prefix="/room-types", tags=["Room Types"])
@@ -89,6 +131,8 @@ app.include_router(reports.router, prefix="/reports", tags=["Reports"])
 app.include_router(audit_logs.router, tags=["Audit Logs"])
 app.include_router(pricing_rules.router, tags=["Pricing Rules"])
 app.include_router(housekeeping.router, tags=["Housekeeping"])
+app.include_router(night_audit.router, tags=["Night Audit"])
+app.include_router(events.router, tags=["Live Updates"])
 
 if os.path.exists("frontend"):
     app.mount("/static", StaticFiles(directory="frontend"), name="static")
@@ -113,6 +157,20 @@ def health_check():
     return {"status": "healthy", "message": "Service is running"}
 
 
+# Prometheus metrics endpoint
+@app.get("/metrics", include_in_schema=False)
+async def metrics_endpoint(request: Request):
+    """Metrics of all workers (see core/metrics.py) in the Prometheus text format"""
+    if not settings.METRICS_ENABLED:
+        return JSONResponse(status_code=404, content={"detail": "Not Found"})
+    if settings.METRICS_TOKEN:
+        expected = f"Bearer {settings.METRICS_TOKEN}"
+        if not hmac.compare_digest(request.headers.get("Authorization", ""), expected):
+            return JSONResponse(status_code=401, content={"detail": "Not authenticated"})
+    collected = await asyncio.to_thread(metrics.collect, settings.METRICS_DIR)
+    return Response(metrics.render(collected), media_type=metrics.CONTENT_TYPE)
+
+
 def handle_shutdown(signum, frame):
     """Handle shutdown signals gracefully"""
     logger.info(f"Received signal {signum}, initiating graceful shutdown...")
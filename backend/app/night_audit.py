@@ -0,0 +1,29 @@
+"""
+Run the night audit from the command line (e.g. from cron at end of day).
+
+Usage:
+    python -m backend.app.night_audit [--date YYYY-MM-DD]
+"""
+import argparse
+from datetime import date
+
+from backend.app.db.session import SessionLocal
+from backend.app.services.night_audit_service import NightAuditService
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--date", type=date.fromisoformat, default=None, help="Day being closed (defaults to today)")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        summary = NightAuditService.run(db, args.date)
+    finally:
+        db.close()
+    for key, value in summary.items():
+        print(f"{key}: {value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,586 @@
+"""
+Generate a synthetic hotel dataset for development and load testing.
+
+Builds staff users, room types, rooms, guests and a booking history of
+``--years`` up to today (plus ``--future-days`` of reservations ahead) with
+seasonal and weekend demand. Every booking goes through a realistic lifecycle
+(pending/confirmed → checked in → checked out, or cancelled/no-show) with the
+matching payments, invoices, checkout-cleaning tasks and audit log entries.
+Rooms also get periodic inspections and the occasional maintenance task.
+
+Rows are generated day by day and written in batches (multi-row executemany,
+or COPY on PostgreSQL), so memory stays flat however large the dataset is.
+The same ``--seed`` and ``--end-date`` always produce the same data.
+
+All staff accounts share one password (``--password``). Tables must be empty
+unless ``--reset`` is given, which deletes every row first.
+
+Usage:
+    python -m backend.app.sample_data [--rooms 100] [--guests 5000] [--years 2] [--seed 0]
+    python -m backend.app.sample_data --rooms 5000 --guests 2000000 --years 5 --reset   # ~10M rows
+"""
+import argparse
+import csv
+import io
+import json
+import random
+import sys
+import time as timer
+from dataclasses import dataclass, field
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from itertools import accumulate
+from typing import Callable, Dict, Iterator, List, Optional
+
+from sqlalchemy import create_engine, func, select, text
+from sqlalchemy.engine import Connection, Engine
+
+from backend.app.core.security import get_password_hash
+from backend.app.db import models
+from backend.app.services.invoice_service import InvoiceService
+
+ROOM_TYPES = [
+    # name, base price, capacity, share of rooms, square meters
+    ("Single Room", Decimal("60.00"), 1, 0.25, 20),
+    ("Double Room", Decimal("90.00"), 2, 0.40, 28),
+    ("Family Room", Decimal("140.00"), 4, 0.15, 40),
+    ("Suite", Decimal("210.00"), 3, 0.15, 55),
+    ("Deluxe Suite", Decimal("320.00"), 4, 0.05, 75),
+]
+ROOMS_PER_FLOOR = 20
+
+# Probability that a free room gets a new arrival on a given day, by month
+ARRIVAL_RATE = [0.30, 0.32, 0.38, 0.42, 0.48, 0.60, 0.70, 0.72, 0.52, 0.45, 0.34, 0.40]
+WEEKEND_ARRIVAL_BOOST = 1.25  # Friday and Saturday
+SEASONAL_PRICE = [0.90, 0.90, 0.95, 1.00, 1.05, 1.20, 1.30, 1.30, 1.10, 1.00, 0.95, 1.15]
+
+STAY_NIGHTS = [1, 2, 3, 4, 5, 6, 7, 10, 14]
+STAY_WEIGHTS = list(accumulate([24, 26, 18, 10, 7, 4, 7, 2, 2]))
+SUMMER_STAY_WEIGHTS = list(accumulate([12, 18, 18, 12, 10, 7, 14, 5, 4]))
+
+PAYMENT_METHODS = [m.value for m in models.PaymentMethod if m is not models.PaymentMethod.ONLINE]
+PAYMENT_METHOD_WEIGHTS = list(accumulate([10, 55, 20, 10]))
+
+FIRST_NAMES = [
+    "James", "Mary", "John", "Patricia", "Robert", "Jennifer", "Michael", "Linda", "David", "Elizabeth",
+    "William", "Barbara", "Richard", "Susan", "Joseph", "Jessica", "Thomas", "Sarah", "Carlos", "Karen",
+    "Ahmed", "Fatima", "Wei", "Mei", "Hiroshi", "Yuki", "Lukas", "Anna", "Mateo", "Sofia", "Ivan", "Olga",
+    "Arjun", "Priya", "Kwame", "Amara", "Liam", "Emma", "Noah", "Olivia",
+]
+LAST_NAMES = [
+    "Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis", "Rodriguez", "Martinez",
+    "Hernandez", "Lopez", "Wilson", "Anderson", "Thomas", "Taylor", "Moore", "Jackson", "Martin", "Lee",
+    "Mueller", "Schmidt", "Rossi", "Dubois", "Kowalski", "Novak", "Ivanov", "Wang", "Li", "Zhang", "Tanaka",
+    "Sato", "Kim", "Park", "Singh", "Patel", "Okafor", "Mensah", "Silva", "Santos",
+]
+NATIONALITIES = ["US", "GB", "DE", "FR", "IT", "ES", "NL", "PL", "CN", "JP", "KR", "IN", "BR", "CA", "AU"]
+DOCUMENT_TYPES = ["passport", "ID card", "driver's license"]
+SPECIAL_REQUESTS = ["Late check-in", "High floor", "Extra pillows", "Baby cot", "Quiet room", "Airport pickup"]
+
+STATUS = models.BookingStatus
+TASK = models.TaskStatus
+PAID = models.Payment.PaymentStatus.PAID.value
+PENDING_PAYMENT = models.Payment.PaymentStatus.PENDING.value
+REFUNDED = models.Payment.PaymentStatus.REFUNDED.value
+
+
+@dataclass
+class GeneratorConfig:
+    rooms: int = 100
+    guests: int = 5000
+    years: float = 2.0  # Booking history before end_date
+    future_days: int = 180  # Reservations after end_date
+    end_date: Optional[date] = None  # "Today" of the dataset; defaults to date.today()
+    staff: int = 20  # Managers, front desk and housekeepers (plus the admin)
+    seed: int = 0
+    batch_size: int = 10_000
+    admin_username: str = "admin"
+    password: str = "changeme123"
+    audit_logs: bool = True
+
+
+@dataclass
+class _Staff:
+    admin: int
+    managers: List[int] = field(default_factory=list)
+    front_desk: List[int] = field(default_factory=list)
+    housekeepers: List[int] = field(default_factory=list)
+    usernames: Dict[int, str] = field(default_factory=dict)
+
+
+# ---------------------------------------------------------------------------
+# Batched writer
+# ---------------------------------------------------------------------------
+
+class _BatchWriter:
+    """
+    Buffers rows per table and writes them in batches.
+
+    Rows carry explicit primary keys so children can reference parents before
+    anything is written. Buffers are flushed together in dependency order
+    whenever one fills up, so foreign keys always point at written rows.
+    """
+
+    def __init__(self, connection: Connection, batch_size: int):
+        self.connection = connection
+        self.batch_size = batch_size
+        self.use_copy = connection.dialect.name == "postgresql" and connection.dialect.driver == "psycopg2"
+        self.buffers: Dict[str, List[dict]] = {}
+        self.order: List[str] = [table.name for table in models.Base.metadata.sorted_tables]
+        self.counts: Dict[str, int] = {}
+
+    def add(self, table: str, row: dict):
+        buffer = self.buffers.setdefault(table, [])
+        buffer.append(row)
+        if len(buffer) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        for name in self.order:
+            rows = self.buffers.get(name)
+            if not rows:
+                continue
+            table = models.Base.metadata.tables[name]
+            if self.use_copy:
+                self._copy(table, rows)
+            else:
+                self.connection.execute(table.insert(), rows)
+            self.counts[name] = self.counts.get(name, 0) + len(rows)
+            self.buffers[name] = []
+        self.connection.commit()
+
+    def _copy(self, table, rows: List[dict]):
+        columns = list(rows[0])
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for row in rows:
+            writer.writerow([_copy_value(row[column]) for column in columns])
+        buffer.seek(0)
+        column_list = ", ".join(f'"{column}"' for column in columns)
+        with self.connection.connection.dbapi_connection.cursor() as cursor:
+            cursor.copy_expert(f'COPY "{table.name}" ({column_list}) FROM STDIN WITH (FORMAT csv, NULL \'\\N\')', buffer)
+
+
+def _copy_value(value):
+    if value is None:
+        return "\\N"
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    return value
+
+
+# ---------------------------------------------------------------------------
+# Reference data
+# ---------------------------------------------------------------------------
+
+def _users(writer: _BatchWriter, config: GeneratorConfig, now: datetime) -> _Staff:
+    password_hash = get_password_hash(config.password)  # bcrypt is slow; hash once
+    managers = max(1, config.staff // 10)
+    housekeepers = max(1, config.staff * 2 // 5)
+    front_desk = max(1, config.staff - managers - housekeepers)
+
+    staff = _Staff(admin=1)
+    accounts = [(config.admin_username, models.PermissionLevel.ADMIN, None)]
+    accounts += [(f"manager{i}", models.PermissionLevel.MANAGER, staff.managers) for i in range(1, managers + 1)]
+    accounts += [(f"frontdesk{i}", models.PermissionLevel.REGULAR, staff.front_desk) for i in range(1, front_desk + 1)]
+    accounts += [(f"housekeeper{i}", models.PermissionLevel.REGULAR, staff.housekeepers) for i in range(1, housekeepers + 1)]
+    for user_id, (username, level, group) in enumerate(accounts, start=1):
+        writer.add("users", {
+            "id": user_id, "username": username, "password_hash": password_hash,
+            "permission_level": level.value, "is_active": True, "created_at": now,
+        })
+        staff.usernames[user_id] = username
+        if group is not None:
+            group.append(user_id)
+    return staff
+
+
+def _rooms(writer: _BatchWriter, config: GeneratorConfig, rng: random.Random, now: datetime) -> List[tuple]:
+    """Write room types and rooms; returns (room_id, price, capacity) per room."""
+    weights = list(accumulate(share for *_, share, _ in ROOM_TYPES))
+    for type_id, (name, price, capacity, _, _) in enumerate(ROOM_TYPES, start=1):
+        writer.add("room_types", {
+            "id": type_id, "name": name, "base_price": price, "capacity": capacity,
+            "description": f"{name} for up to {capacity} guest{'s' if capacity > 1 else ''}", "created_at": now,
+        })
+
+    rooms = []
+    for index in range(config.rooms):
+        type_index = rng.choices(range(len(ROOM_TYPES)), cum_weights=weights)[0]
+        _, price, capacity, _, size = ROOM_TYPES[type_index]
+        floor = index // ROOMS_PER_FLOOR + 1
+        has_view = rng.random() < 0.3
+        price = price + (Decimal("15.00") if has_view else 0)
+        writer.add("rooms", {
+            "id": index + 1,
+            "number": f"{floor}{index % ROOMS_PER_FLOOR + 1:02d}",
+            "room_type_id": type_index + 1,
+            "price_per_night": price,
+            "square_meters": size + rng.randint(-3, 5),
+            "floor": floor,
+            "maintenance_status": models.RoomMaintenanceStatus.AVAILABLE.value,
+            "has_view": has_view,
+            "is_smoking": False,
+            "created_at": now,
+        })
+        rooms.append((index + 1, price, capacity))
+    return rooms
+
+
+def _policies_and_rules(writer: _BatchWriter, start: date, end: date, now: datetime):
+    for policy_id, (name, full, partial, percentage) in enumerate(
+        (("Standard", 7, 2, 50), ("Flexible", 1, 0, 0), ("Non-refundable", 0, 0, 0)), start=1,
+    ):
+        writer.add("cancellation_policies", {
+            "id": policy_id, "name": name, "full_refund_days": full, "partial_refund_days": partial,
+            "partial_refund_percentage": Decimal(percentage), "is_active": True, "created_at": now,
+        })
+
+    rules = [
+        dict(name="Weekend", rule_type="weekend", priority=5, adjustment_type="percentage",
+             adjustment_value=Decimal("10.00"), applicable_days="[4, 5]"),
+        dict(name="Early bird", rule_type="early_bird", priority=3, adjustment_type="percentage",
+             adjustment_value=Decimal("-10.00"), min_advance_days=60),
+        dict(name="Long stay", rule_type="long_stay", priority=2, adjustment_type="percentage",
+             adjustment_value=Decimal("-15.00"), min_nights=7),
+        dict(name="Loyalty", rule_type="loyalty", priority=1, adjustment_type="percentage",
+             adjustment_value=Decimal("-5.00"), min_loyalty_tier=2),
+    ]
+    for year in range(start.year, end.year + 1):
+        rules += [
+            dict(name=f"Summer {year}", rule_type="seasonal", priority=10, adjustment_type="percentage",
+                 adjustment_value=Decimal("25.00"), start_date=date(year, 6, 1), end_date=date(year, 8, 31)),
+            dict(name=f"Holidays {year}", rule_type="seasonal", priority=20, adjustment_type="percentage",
+                 adjustment_value=Decimal("30.00"), start_date=date(year, 12, 20), end_date=date(year, 12, 31)),
+        ]
+    for rule_id, rule in enumerate(rules, start=1):
+        writer.add("pricing_rules", {
+            "id": rule_id, "description": None, "room_type_id": None, "start_date": None, "end_date": None,
+            "applicable_days": None, "min_nights": None, "min_advance_days": None, "max_advance_days": None,
+            "min_loyalty_tier": None, "is_active": True, "created_at": now, **rule,
+        })
+
+
+def _guests(writer: _BatchWriter, config: GeneratorConfig, rng: random.Random, start: date):
+    for guest_id in range(1, config.guests + 1):
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        tier = rng.choices((0, 1, 2, 3), cum_weights=(85, 94, 98, 100))[0]
+        writer.add("guests", {
+            "id": guest_id,
+            "name": first,
+            "surname": last,
+            "phone_number": f"+1{rng.randint(200, 999)}{rng.randint(0, 9_999_999):07d}",
+            "email": f"{first.lower()}.{last.lower()}.{guest_id}@example.com",
+            "nationality": rng.choice(NATIONALITIES),
+            "gender": rng.choice(("male", "female")),
+            "birth_date": date(rng.randint(1945, 2005), rng.randint(1, 12), rng.randint(1, 28)),
+            "document_type": rng.choice(DOCUMENT_TYPES),
+            "document_id": f"{rng.randint(10_000_000, 99_999_999)}",
+            "loyalty_points": rng.randint(0, 500) + tier * 2000,
+            "vip_tier": tier,
+            "is_active": True,
+            "created_at": datetime.combine(start - timedelta(days=rng.randint(0, 365)), time(9)),
+        })
+
+
+# ---------------------------------------------------------------------------
+# Bookings and everything that follows from them
+# ---------------------------------------------------------------------------
+
+def _days(start: date, end: date) -> Iterator[date]:
+    day = start
+    while day < end:
+        yield day
+        day += timedelta(days=1)
+
+
+def _at(day: date, rng: random.Random, first_hour: int, last_hour: int) -> datetime:
+    return datetime.combine(day, time(rng.randint(first_hour, last_hour), rng.randint(0, 59)))
+
+
+class _Ids:
+    def __init__(self):
+        self.last: Dict[str, int] = {}
+
+    def next(self, table: str) -> int:
+        self.last[table] = self.last.get(table, 0) + 1
+        return self.last[table]
+
+
+def _audit(writer, ids, config, staff: _Staff, user_id, action, entity_type, entity_id, at, description, new_values=None):
+    if not config.audit_logs:
+        return
+    writer.add("audit_logs", {
+        "id": ids.next("audit_logs"), "user_id": user_id, "username": staff.usernames[user_id],
+        "action": action, "entity_type": entity_type, "entity_id": entity_id, "description": description,
+        "old_values": None, "new_values": json.dumps(new_values) if new_values else None,
+        "ip_address": "10.0.0.1", "user_agent": "sample-data", "created_at": at,
+    })
+
+
+def _payment(writer, ids, config, staff, rng, booking_id, amount, status, at, user_id, method=None, reference=None,
+             refunded_at=None):
+    payment_id = ids.next("payments")
+    writer.add("payments", {
+        "id": payment_id, "booking_id": booking_id, "amount": amount, "currency": "USD",
+        "method": method or rng.choices(PAYMENT_METHODS, cum_weights=PAYMENT_METHOD_WEIGHTS)[0],
+        "status": status, "created_at": at, "processed_at": at if status != PENDING_PAYMENT else None,
+        "refunded_at": refunded_at, "reference": reference,
+    })
+    _audit(writer, ids, config, staff, user_id, "CREATE", "payment", payment_id, at,
+           f"Created payment for booking ID {booking_id}, amount {amount} USD")
+    return payment_id
+
+
+def _housekeeping_task(writer, ids, staff, rng, room_id, day, today, task_type, booking_id=None, priority="normal"):
+    scheduled_time = "11:00" if booking_id else None
+    row = {
+        "id": ids.next("housekeeping_tasks"), "room_id": room_id, "booking_id": booking_id,
+        "assigned_to": None, "created_by": staff.admin, "verified_by": None,
+        "task_type": task_type, "priority": priority, "status": TASK.PENDING.value,
+        "scheduled_date": day, "scheduled_time": scheduled_time,
+        "priority_rank": models.task_priority_rank(priority),
+        "scheduled_at": models.task_scheduled_at(day, scheduled_time),
+        "started_at": None, "completed_at": None, "verified_at": None, "notes": None,
+        "completion_notes": None, "verification_notes": None,
+        "estimated_duration_minutes": 30 if task_type == models.TaskType.CLEANING.value else 45,
+        "actual_duration_minutes": None, "is_checkout_cleaning": booking_id is not None,
+        "created_at": _at(day, rng, 7, 9),
+    }
+    if day < today or (day == today and rng.random() < 0.5):
+        started = _at(day, rng, 9, 14)
+        duration = max(10, int(rng.gauss(row["estimated_duration_minutes"], 8)))
+        row.update(
+            assigned_to=rng.choice(staff.housekeepers), started_at=started,
+            completed_at=started + timedelta(minutes=duration), actual_duration_minutes=duration,
+            status=TASK.COMPLETED.value,
+        )
+        if day < today and rng.random() < 0.7:
+            row.update(
+                status=TASK.VERIFIED.value, verified_by=rng.choice(staff.managers),
+                verified_at=row["completed_at"] + timedelta(minutes=rng.randint(10, 120)),
+            )
+        elif day == today and rng.random() < 0.4:
+            row.update(status=TASK.IN_PROGRESS.value, completed_at=None, actual_duration_minutes=None)
+    elif day <= today + timedelta(days=1):
+        row["assigned_to"] = rng.choice(staff.housekeepers)
+    writer.add("housekeeping_tasks", row)
+
+
+def _booking(writer, ids, config, staff, rng, room, guest_id, check_in, nights, today):
+    room_id, base_price, capacity = room
+    booking_id = ids.next("bookings")
+    check_out = check_in + timedelta(days=nights)
+    price = (base_price * Decimal(str(SEASONAL_PRICE[check_in.month - 1]))).quantize(Decimal("0.01"))
+    total = price * nights
+    lead_days = min(int(rng.expovariate(1 / 25)), 365)
+    created_at = _at(check_in - timedelta(days=lead_days), rng, 8, 22)
+    if created_at.date() > today:
+        created_at = _at(today, rng, 0, 7)
+    clerk = rng.choice(staff.front_desk)
+
+    if check_out <= today:
+        roll = rng.random()
+        status = STATUS.CANCELLED if roll < 0.07 else STATUS.NO_SHOW if roll < 0.10 else STATUS.CHECKED_OUT
+    elif check_in <= today:
+        status = STATUS.CHECKED_IN
+    else:
+        roll = rng.random()
+        status = STATUS.CANCELLED if roll < 0.06 else STATUS.PENDING if roll < 0.16 else STATUS.CONFIRMED
+
+    row = {
+        "id": booking_id, "booking_number": f"BK-{booking_id:09d}", "guest_id": guest_id, "room_id": room_id,
+        "created_by": clerk, "check_in": check_in, "check_out": check_out,
+        "number_of_guests": rng.randint(1, capacity), "price_per_night": price, "total_price": total,
+        "status": status.value, "actual_check_in": None, "actual_check_out": None, "cancelled_at": None,
+        "final_bill": None, "special_requests": rng.choice(SPECIAL_REQUESTS) if rng.random() < 0.1 else None,
+        "internal_notes": None, "created_at": created_at,
+    }
+    if status in (STATUS.CHECKED_IN, STATUS.CHECKED_OUT):
+        row["actual_check_in"] = _at(check_in, rng, 14, 21)
+    if status is STATUS.CHECKED_OUT:
+        row["actual_check_out"] = _at(check_out, rng, 7, 11)
+        row["final_bill"] = total
+    elif status is STATUS.NO_SHOW:
+        row["final_bill"] = total
+    elif status is STATUS.CANCELLED:
+        window = max(0, (min(check_in, today) - created_at.date()).days)
+        row["cancelled_at"] = _at(created_at.date() + timedelta(days=rng.randint(0, window)), rng, 8, 22)
+    writer.add("bookings", row)
+
+    number = row["booking_number"]
+    _audit(writer, ids, config, staff, clerk, "CREATE", "booking", booking_id, created_at,
+           f"Created booking #{number} for guest ID {guest_id}",
+           {"booking_number": number, "guest_id": guest_id, "room_id": room_id, "check_in": str(check_in),
+            "check_out": str(check_out), "status": STATUS.CONFIRMED.value})
+    if row["actual_check_in"]:
+        _audit(writer, ids, config, staff, clerk, "CHECK_IN", "booking", booking_id, row["actual_check_in"],
+               f"Guest checked in for booking #{number}")
+
+    # Deposit at booking time for about a third of guests (not for pending bookings)
+    deposit = None
+    if status is not STATUS.PENDING and rng.random() < 0.35:
+        deposit = (total * Decimal("0.30")).quantize(Decimal("0.01"))
+        refunded = status is STATUS.CANCELLED and rng.random() < 0.6
+        payment_id = _payment(writer, ids, config, staff, rng, booking_id, deposit, REFUNDED if refunded else PAID,
+                              created_at, clerk, refunded_at=row["cancelled_at"] if refunded else None)
+        if refunded:
+            _audit(writer, ids, config, staff, clerk, "REFUND", "payment", payment_id, row["cancelled_at"],
+                   f"Refunded payment ID {payment_id}")
+    elif status is STATUS.PENDING and rng.random() < 0.5:
+        _payment(writer, ids, config, staff, rng, booking_id, total, PENDING_PAYMENT, created_at, clerk)
+
+    if status is STATUS.CHECKED_OUT:
+        checked_out_at = row["actual_check_out"]
+        _payment(writer, ids, config, staff, rng, booking_id, total - (deposit or 0), PAID, checked_out_at, clerk)
+        _audit(writer, ids, config, staff, clerk, "CHECK_OUT", "booking", booking_id, checked_out_at,
+               f"Guest checked out for booking #{number}")
+        subtotal, tax, invoice_total = InvoiceService.invoice_amounts(total)
+        invoice_id = ids.next("invoices")
+        writer.add("invoices", {
+            "id": invoice_id, "booking_id": booking_id,
+            "invoice_number": f"INV-{check_out:%Y%m%d}-{invoice_id:06X}",
+            "subtotal": subtotal, "tax": tax, "total": invoice_total, "issued_at": checked_out_at,
+        })
+        _housekeeping_task(writer, ids, staff, rng, room_id, check_out, today, models.TaskType.CLEANING.value,
+                           booking_id=booking_id, priority="high" if rng.random() < 0.2 else "normal")
+    elif status is STATUS.NO_SHOW:
+        # Charged in full, as the night audit does
+        _payment(writer, ids, config, staff, rng, booking_id, total, PAID,
+                 datetime.combine(check_in + timedelta(days=1), time(0, 5)), staff.admin,
+                 method="no_show_charge", reference=f"No-show charge for booking {number}")
+    elif status is STATUS.CANCELLED:
+        _audit(writer, ids, config, staff, clerk, "CANCEL", "booking", booking_id, row["cancelled_at"],
+               f"Cancelled booking #{number}")
+
+
+def _room_maintenance(writer, ids, staff, rng, room_id, day, today):
+    if rng.random() < 0.03:
+        task_type, priority = models.TaskType.MAINTENANCE.value, rng.choice(("normal", "high", "urgent"))
+    elif rng.random() < 0.15:
+        task_type, priority = models.TaskType.DEEP_CLEANING.value, "low"
+    else:
+        task_type, priority = models.TaskType.INSPECTION.value, "low"
+    _housekeeping_task(writer, ids, staff, rng, room_id, day, today, task_type, priority=priority)
+
+
+def _sync_sequences(connection: Connection, tables: List[str]):
+    """Point PostgreSQL id sequences past the explicit ids that were inserted."""
+    if connection.dialect.name != "postgresql":
+        return
+    for table in tables:
+        connection.execute(text(
+            f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+            f"COALESCE((SELECT MAX(id) FROM \"{table}\"), 0) + 1, false)"
+        ))
+    connection.commit()
+
+
+def generate(engine: Engine, config: GeneratorConfig, reset: bool = False,
+             progress: Optional[Callable[[str], None]] = None) -> Dict[str, int]:
+    """
+    Generate a dataset into ``engine``'s database (schema must already exist).
+
+    Returns the number of rows written per table.
+    """
+    rng = random.Random(config.seed)
+    today = config.end_date or date.today()
+    start = today - timedelta(days=round(config.years * 365))
+    end = today + timedelta(days=config.future_days)
+    now = datetime.combine(today, time(6))
+    tables = models.Base.metadata.sorted_tables
+
+    with engine.connect() as connection:
+        if reset:
+            for table in reversed(tables):
+                if table is not models.TableVersion.__table__:  # Versions only ever go up
+                    connection.execute(table.delete())
+            connection.commit()
+        else:
+            for table in ("users", "rooms", "guests", "bookings"):
+                if connection.scalar(select(func.count()).select_from(models.Base.metadata.tables[table])):
+                    raise ValueError(f"Table {table} is not empty; pass reset=True (--reset) to replace its data")
+        if connection.dialect.name == "sqlite":
+            connection.exec_driver_sql("PRAGMA synchronous = OFF")
+
+        writer = _BatchWriter(connection, config.batch_size)
+        ids = _Ids()
+        staff = _users(writer, config, now)
+        rooms = _rooms(writer, config, rng, now)
+        _policies_and_rules(writer, start, end, now)
+        _guests(writer, config, rng, start)
+        writer.flush()
+
+        # Walk the calendar; a free room gets an arrival with the day's seasonal probability.
+        # Returning guests are more likely: ids are skewed towards the low end.
+        free_from = [start] * len(rooms)
+        next_inspection = [start + timedelta(days=rng.randint(0, 29)) for _ in rooms]
+        started = timer.perf_counter()
+        for day in _days(start, end):
+            rate = ARRIVAL_RATE[day.month - 1] * (WEEKEND_ARRIVAL_BOOST if day.weekday() in (4, 5) else 1)
+            weights = SUMMER_STAY_WEIGHTS if day.month in (6, 7, 8) else STAY_WEIGHTS
+            for index, room in enumerate(rooms):
+                if day <= today + timedelta(days=7) and next_inspection[index] == day:
+                    _room_maintenance(writer, ids, staff, rng, room[0], day, today)
+                    next_inspection[index] = day + timedelta(days=rng.randint(20, 40))
+                if free_from[index] > day or rng.random() >= rate:
+                    continue
+                nights = rng.choices(STAY_NIGHTS, cum_weights=weights)[0]
+                guest_id = int(config.guests * rng.random() ** 1.5) + 1
+                _booking(writer, ids, config, staff, rng, room, guest_id, day, nights, today)
+                free_from[index] = day + timedelta(days=nights)
+            if progress and day.day == 1:
+                progress(f"{day:%Y-%m}: {ids.last.get('bookings', 0)} bookings ({timer.perf_counter() - started:.0f}s)")
+        writer.flush()
+        _sync_sequences(connection, [table.name for table in tables if table.name in writer.counts])
+
+    return {table.name: writer.counts[table.name] for table in tables if table.name in writer.counts}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    defaults = GeneratorConfig()
+    parser.add_argument("--database-url", help="Target database (defaults to DATABASE_URL)")
+    parser.add_argument("--rooms", type=int, default=defaults.rooms)
+    parser.add_argument("--guests", type=int, default=defaults.guests)
+    parser.add_argument("--years", type=float, default=defaults.years, help="Years of booking history")
+    parser.add_argument("--future-days", type=int, default=defaults.future_days, help="Days of reservations ahead")
+    parser.add_argument("--end-date", type=date.fromisoformat, help="Dataset's 'today' (defaults to today)")
+    parser.add_argument("--staff", type=int, default=defaults.staff)
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    parser.add_argument("--batch-size", type=int, default=defaults.batch_size)
+    parser.add_argument("--admin-username", default=defaults.admin_username)
+    parser.add_argument("--password", default=defaults.password, help="Password for every staff account")
+    parser.add_argument("--no-audit-logs", action="store_true")
+    parser.add_argument("--create-tables", action="store_true", help="Create missing tables (no migrations)")
+    parser.add_argument("--reset", action="store_true", help="Delete all existing rows first")
+    args = parser.parse_args()
+
+    config = GeneratorConfig(
+        rooms=args.rooms, guests=args.guests, years=args.years, future_days=args.future_days,
+        end_date=args.end_date, staff=args.staff, seed=args.seed, batch_size=args.batch_size,
+        admin_username=args.admin_username, password=args.password, audit_logs=not args.no_audit_logs,
+    )
+    if args.database_url:
+        engine = create_engine(args.database_url)
+    else:
+        from backend.app.db.session import engine
+
+    if args.create_tables:
+        models.Base.metadata.create_all(bind=engine)
+
+    started = timer.perf_counter()
+    try:
+        counts = generate(engine, config, reset=args.reset, progress=print)
+    except ValueError as exc:
+        print(exc, file=sys.stderr)
+        sys.exit(1)
+    elapsed = timer.perf_counter() - started
+    for table, count in counts.items():
+        print(f"{table}: {count}")
+    total = sum(counts.values())
+    print(f"{total} rows in {elapsed:.1f}s ({total / elapsed:,.0f} rows/s)")
+
+
+if __name__ == "__main__":
+    main()
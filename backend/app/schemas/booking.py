@@ -18,6 +18,7 @@ class BookingBase(BaseModel):
 
 class BookingCreate(BookingBase):
     booking_number: Optional[str] = Field(None, max_length=20)  # server can generate if not provided
+    quote_id: Optional[str] = Field(None, max_length=200)  # from /pricing-rules/calculate-price
 
 class GuestBasic(BaseModel):
     id: int
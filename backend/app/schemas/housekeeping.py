@@ -1,8 +1,8 @@
 """
 Pydantic schemas for Housekeeping Tasks
 """
-from pydantic import BaseModel, ConfigDict, field_validator
-from typing import Optional
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+from typing import List, Literal, Optional
 from datetime import date, datetime, time
 
 
@@ -67,6 +67,11 @@ class HousekeepingTaskUpdate(BaseModel):
     estimated_duration_minutes: Optional[int] = None
     assigned_to: Optional[int] = None
     
+    @field_validator("scheduled_time")
+    @classmethod
+    def validate_time_format(cls, v: Optional[str]) -> Optional[str]:
+        return HousekeepingTaskBase.validate_time_format(v)
+    
     @field_validator("status")
     @classmethod
     def validate_status(cls, v: Optional[str]) -> Optional[str]:
@@ -113,6 +118,70 @@ class TaskVerificationRequest(BaseModel):
     verification_notes: Optional[str] = None
 
 
+class DailyTaskGenerationResult(BaseModel):
+    """Schema for the result of daily task generation"""
+    scheduled_date: date
+    tasks_created: int
+    checkout_cleanings: int
+    stayover_cleanings: int
+    turndowns: int
+    skipped_existing: int
+
+
+class AutoAssignRequest(BaseModel):
+    """Schema for auto-assigning a day's unassigned tasks"""
+    scheduled_date: Optional[date] = None  # Defaults to today
+    staff_ids: Optional[List[int]] = None  # Defaults to all active regular users
+
+
+class StaffWorkload(BaseModel):
+    """Schema for one staff member's share of an auto-assignment"""
+    user_id: int
+    username: str
+    task_count: int
+    total_minutes: int
+    floors: List[int]
+
+
+class AutoAssignResult(BaseModel):
+    """Schema for the result of auto-assignment"""
+    scheduled_date: date
+    tasks_assigned: int
+    staff: List[StaffWorkload]
+
+
+class TaskSyncOperation(BaseModel):
+    """One queued task transition from a mobile device"""
+    op_id: str = Field(..., min_length=1, max_length=64)  # Client-generated, echoed back in the result
+    task_id: int
+    action: Literal["start", "complete"]
+    occurred_at: datetime  # When the housekeeper did it on the device
+    completion_notes: Optional[str] = None
+    actual_duration_minutes: Optional[int] = None
+
+
+class TaskSyncRequest(BaseModel):
+    """Schema for flushing a device's queued transitions"""
+    operations: List[TaskSyncOperation] = Field(..., max_length=200)
+
+
+class TaskSyncResult(BaseModel):
+    """Outcome of one queued transition"""
+    op_id: str
+    task_id: int
+    result: Literal["applied", "duplicate", "rejected"]
+    detail: Optional[str] = None
+    task_status: Optional[str] = None
+
+
+class TaskSyncResponse(BaseModel):
+    """Schema for the batch sync response"""
+    applied: int
+    duplicates: int
+    rejected: int
+    results: List[TaskSyncResult]
+
+
 class HousekeepingDashboard(BaseModel):
     """Schema for housekeeping dashboard statistics"""
     total_tasks: int
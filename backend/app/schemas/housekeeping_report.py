@@ -35,6 +35,7 @@ class RoomStatusInfo(BaseModel):
     has_pending_tasks: bool
     has_in_progress_tasks: bool
     next_booking_checkin: date | None
+    current_guest: str | None = None
 
 
 class HousekeepingDashboard(BaseModel):
@@ -0,0 +1,13 @@
+from pydantic import BaseModel
+from decimal import Decimal
+from datetime import date
+
+
+class NightAuditSummary(BaseModel):
+    business_date: date
+    no_shows: int
+    no_show_charges: int
+    no_show_charge_total: Decimal
+    invoices_created: int
+    invoice_total: Decimal
+    duration_ms: float
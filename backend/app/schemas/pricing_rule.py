@@ -1,7 +1,7 @@
 """
 Pydantic schemas for Pricing Rules
 """
-from pydantic import BaseModel, ConfigDict, field_validator
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 from typing import Optional, List
 from datetime import date, datetime
 from decimal import Decimal
@@ -89,6 +89,7 @@ class PriceCalculationRequest(BaseModel):
     check_in: date
     check_out: date
     guest_loyalty_tier: int = 0
+    guest_id: Optional[int] = None  # Quote for this guest; their VIP tier replaces guest_loyalty_tier
     base_price: Optional[Decimal] = None  # If not provided, uses room_type base_price
 
 
@@ -100,5 +101,134 @@ class PriceCalculationResponse(BaseModel):
     adjusted_price_per_night: Decimal
     total_price: Decimal
     savings: Decimal  # Amount saved from rules
+    quote_id: Optional[str] = None  # Pass to booking creation to lock in this price
+    quote_expires_at: Optional[datetime] = None
     
     model_config = ConfigDict(from_attributes=True)
+
+
+class PriceQuoteItem(BaseModel):
+    """One stay to price within a batch quote"""
+    room_type_id: int
+    check_in: date
+    check_out: date
+    guest_loyalty_tier: int = 0
+
+
+class BatchPriceQuoteRequest(BaseModel):
+    """Request schema for pricing many stays at once"""
+    quotes: List[PriceQuoteItem] = Field(..., min_length=1, max_length=500)
+
+
+class BatchPriceQuoteResult(PriceQuoteItem):
+    """Result for one batch item: either a quote or an error message"""
+    quote: Optional[PriceCalculationResponse] = None
+    error: Optional[str] = None
+
+
+class BatchPriceQuoteResponse(BaseModel):
+    """Response schema for batch price quotes (same order as the request)"""
+    results: List[BatchPriceQuoteResult]
+
+
+class RoomTypeRateCalendar(BaseModel):
+    """Nightly rates of one room type; rates[i] is the rate for start_date + i days"""
+    room_type_id: int
+    room_type_name: str
+    base_price: Decimal
+    rates: List[float]
+
+
+class RateCalendarResponse(BaseModel):
+    """Response schema for the nightly rate calendar"""
+    start_date: date
+    days: int
+    guest_loyalty_tier: int
+    room_types: List[RoomTypeRateCalendar]
+
+
+class RoomTypeLOSMatrix(BaseModel):
+    """Total stay prices of one room type; totals[i][n - 1] = arrive start_date + i, stay n nights"""
+    room_type_id: int
+    room_type_name: str
+    totals: List[List[float]]
+
+
+class LOSMatrixResponse(BaseModel):
+    """Response schema for the arrival date x length-of-stay price matrix"""
+    start_date: date
+    days: int
+    max_nights: int
+    guest_loyalty_tier: int
+    room_types: List[RoomTypeLOSMatrix]
+
+
+class PricingSimulationRequest(BaseModel):
+    """Draft rules to replay against historical bookings (nothing is saved)"""
+    start_date: date  # Check-in range of the bookings to replay
+    end_date: date
+    rules: List[PricingRuleCreate] = Field(..., min_length=1, max_length=500)
+
+
+class SimulatedRuleResult(BaseModel):
+    """Contribution of one draft rule; index is its position in the request"""
+    index: int
+    name: str
+    rule_type: str
+    priority: int
+    bookings_affected: int
+    nights_affected: int
+    uplift: float  # Revenue change caused by this rule, in stacking order
+
+
+class PricingSimulationResponse(BaseModel):
+    """Response schema for a pricing rule what-if simulation"""
+    start_date: date
+    end_date: date
+    bookings: int
+    nights: int
+    actual_revenue: float  # What the bookings were actually charged
+    base_revenue: float  # Room type base prices, no rules
+    simulated_revenue: float  # Base prices with the draft rules applied
+    uplift: float  # simulated_revenue - actual_revenue
+    rules: List[SimulatedRuleResult]
+
+
+class RuleOverlap(BaseModel):
+    """Two rules whose date ranges intersect (None = open-ended)"""
+    rule_id: int
+    other_rule_id: int
+    overlap_start: Optional[date] = None
+    overlap_end: Optional[date] = None
+
+
+class ShadowedRule(BaseModel):
+    """A rule that always stacks on a higher-priority rule of the same type"""
+    rule_id: int
+    shadowed_by: int
+
+
+class RuleSegment(BaseModel):
+    """Date segment with a constant set of active rules and their combined effect"""
+    start_date: Optional[date] = None
+    end_date: Optional[date] = None
+    rule_ids: List[int]  # In application order
+    effective_price: Decimal
+    effective_change_percent: Decimal
+
+
+class RoomTypeRuleAnalysis(BaseModel):
+    """Overlap analysis of the rules that can apply to one room type"""
+    room_type_id: int
+    room_type_name: str
+    base_price: Decimal
+    rule_count: int
+    overlaps: List[RuleOverlap]
+    shadowed: List[ShadowedRule]
+    segments: List[RuleSegment]
+
+
+class RuleAnalysisResponse(BaseModel):
+    """Response schema for pricing rule overlap/conflict analysis"""
+    active_rules: int
+    room_types: List[RoomTypeRuleAnalysis]
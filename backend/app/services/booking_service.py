@@ -1,5 +1,7 @@
 from uuid import uuid4
 
+from sqlalchemy import or_, select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session, joinedload
 from datetime import datetime, date
 from typing import Optional
@@ -7,9 +9,24 @@ from fastapi import HTTPException
 
 from ..db import models
 from ..utils.availability import is_room_available
-from ..utils.pagination import paginate, apply_sorting
-from ..schemas.booking import BookingCreate, BookingUpdate
+from ..utils.pagination import paginate_projection, apply_sorting
+from ..utils.projection import Projection
+from ..schemas.booking import BookingCreate, BookingUpdate, BookingResponse
 from .refund_policy import RefundPolicyService
+from . import price_quotes
+from ..utils.money import from_cents, to_cents
+
+BOOKING_LIST = Projection(
+    BookingResponse,
+    models.Booking,
+    nested={"guest": models.Guest},
+    computed={
+        "number_of_nights": (
+            (models.Booking.check_in, models.Booking.check_out),
+            lambda check_in, check_out: (check_out - check_in).days,
+        ),
+    },
+)
 
 
 class BookingService:
@@ -43,8 +60,26 @@ class BookingService:
         if not room:
             raise ValueError("Room not found.")
 
-        # Freeze price at booking time
-        price_per_night = room.price_per_night
+        # Freeze price at booking time: a price quote locks in the rule-adjusted rate
+        quote = None
+        if data.quote_id:
+            quote = price_quotes.verify(data.quote_id)
+            if quote is None:
+                raise ValueError("Price quote is invalid or has expired.")
+            if (
+                quote.room_type_id != room.room_type_id
+                or quote.check_in != data.check_in
+                or quote.check_out != data.check_out
+            ):
+                raise ValueError("Price quote does not match the room type and dates of this booking.")
+            guest = db.get(models.Guest, data.guest_id)
+            if (quote.guest_id is not None and quote.guest_id != data.guest_id) or (
+                quote.loyalty_tier > ((guest.vip_tier or 0) if guest else 0)
+            ):
+                raise ValueError("Price quote was issued for a different guest or loyalty tier.")
+            price_per_night = quote.price_per_night
+        else:
+            price_per_night = room.price_per_night
 
         # Calculate total price
         nights = (data.check_out - data.check_in).days
@@ -66,9 +101,17 @@ class BookingService:
             status=models.BookingStatus.PENDING.value,
             special_requests=data.special_requests,
             internal_notes=data.internal_notes,
+            price_quote_nonce=quote.nonce if quote else None,
         )
         db.add(booking)
-        db.commit()
+        try:
+            db.commit()
+        except IntegrityError:
+            # The unique nonce makes redemption atomic with the booking insert
+            db.rollback()
+            if quote and db.scalar(select(models.Booking.id).where(models.Booking.price_quote_nonce == quote.nonce)):
+                raise ValueError("Price quote has already been used.")
+            raise
         db.refresh(booking)
         return booking
 
@@ -90,28 +133,30 @@ class BookingService:
         List bookings with role-based filtering:
         - ADMIN, MANAGER: see all bookings
         - REGULAR: see only own bookings (created_by == user.id)
+        
+        Items are serialized ``BookingResponse`` dicts read through a column
+        projection, so no Booking/Guest entities are loaded.
         """
-        query = db.query(models.Booking).options(joinedload(models.Booking.guest))
+        query = select(*BOOKING_LIST.columns).join(models.Guest, models.Booking.guest_id == models.Guest.id)
         
         # Filter by role
         if current_user and current_user.permission_level == models.PermissionLevel.REGULAR:
-            query = query.filter(models.Booking.created_by == current_user.id)
+            query = query.where(models.Booking.created_by == current_user.id)
         
         # Apply filters
         if status:
-            query = query.filter(models.Booking.status == status)
+            query = query.where(models.Booking.status == status)
         if check_in_from:
-            query = query.filter(models.Booking.check_in >= check_in_from)
+            query = query.where(models.Booking.check_in >= check_in_from)
         if check_in_to:
-            query = query.filter(models.Booking.check_in <= check_in_to)
+            query = query.where(models.Booking.check_in <= check_in_to)
         if search:
-            # Search by guest name or booking number
-            from sqlalchemy import or_
-            query = query.filter(
+            # Search by guest name or booking number (guest is already joined)
+            query = query.where(
                 or_(
                     models.Booking.booking_number.ilike(f"%{search}%"),
-                    models.Booking.guest.has(models.Guest.name.ilike(f"%{search}%")),
-                    models.Booking.guest.has(models.Guest.surname.ilike(f"%{search}%"))
+                    models.Guest.name.ilike(f"%{search}%"),
+                    models.Guest.surname.ilike(f"%{search}%")
                 )
             )
         
@@ -121,7 +166,7 @@ class BookingService:
         query = apply_sorting(query, models.Booking, sort_by, sort_order)
         
         # Apply pagination
-        return paginate(query, page, page_size)
+        return paginate_projection(db, query, BOOKING_LIST, page, page_size)
 
     @staticmethod
     def update_booking(db: Session, booking_id: int, data: BookingUpdate):
@@ -198,7 +243,7 @@ class BookingService:
                 # If actual timestamps are on the same day (tests or quick check-outs),
                 # fall back to the originally booked nights to avoid a zero final bill.
                 actual_nights = (booking.check_out - booking.check_in).days
-            booking.final_bill = actual_nights * booking.price_per_night
+            booking.final_bill = from_cents(actual_nights * to_cents(booking.price_per_night))
         
         # Auto-create housekeeping task for checkout cleaning
         BookingService._create_checkout_cleaning_task(db, booking)
@@ -219,6 +264,14 @@ class BookingService:
         from backend.app.services.housekeeping_service import HousekeepingService
         from backend.app.schemas.housekeeping import HousekeepingTaskCreate
         
+        # The daily schedule may already include this departure
+        already_scheduled = db.query(models.HousekeepingTask.id).filter(
+            models.HousekeepingTask.booking_id == booking.id,
+            models.HousekeepingTask.is_checkout_cleaning.is_(True),
+        ).first()
+        if already_scheduled:
+            return
+
         # Determine priority based on next booking
         priority = "normal"
         scheduled_date = date.today()
@@ -0,0 +1,418 @@
+"""
+Live change events for front desk and housekeeping screens (Server-Sent Events).
+
+Session hooks turn committed room, booking and housekeeping task changes into
+compact delta events and publish them on a bus, which hands every event to
+every worker. Each worker keeps the most recent events in a ring buffer so a
+reconnecting client can resume from ``Last-Event-ID``; a client that missed
+more than the buffer holds gets a ``reset`` event and should refetch.
+
+Bulk statements (daily task generation, auto-assignment, night audit) change
+many rows at once and publish a single ``refresh`` event for the entity
+instead of one delta per row.
+
+Buses (``EVENT_BUS``):
+
+- ``memory``: in-process only, for a single worker.
+- ``socket``: one unix datagram socket per worker in ``EVENT_BUS_SOCKET_DIR``;
+  publishing sends to every worker's socket, including our own. Same host
+  only, no broker needed.
+- ``"package.module:ClassName"``: any other ``EventBus`` implementation.
+"""
+import asyncio
+import glob
+import importlib
+import json
+import logging
+import os
+import socket
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from datetime import date, datetime
+from typing import AsyncIterator, Callable, Dict, Iterable, List, Optional, Set
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from ..core.config import settings
+from ..db import models
+
+logger = logging.getLogger(__name__)
+
+EVENT_TYPES = ("room", "task", "booking")
+
+# Columns carried in each delta, per model
+_TRACKED = {
+    models.Room: ("room", ("number", "floor", "maintenance_status")),
+    models.HousekeepingTask: ("task", ("room_id", "status", "priority", "assigned_to", "scheduled_date")),
+    models.Booking: ("booking", ("room_id", "guest_id", "status", "check_in", "check_out")),
+}
+_TABLE_TYPES = {"rooms": "room", "housekeeping_tasks": "task", "bookings": "booking"}
+
+
+# -----------------------------
+# Buses
+# -----------------------------
+class EventBus(ABC):
+    """Delivers published payloads to every worker's ``deliver`` callback."""
+
+    @abstractmethod
+    def start(self, deliver: Callable[[bytes], None]) -> None:
+        ...
+
+    @abstractmethod
+    def publish(self, payload: bytes) -> None:
+        ...
+
+    def close(self) -> None:
+        pass
+
+
+class InProcessBus(EventBus):
+    def start(self, deliver):
+        self._deliver = deliver
+
+    def publish(self, payload):
+        self._deliver(payload)
+
+
+class LocalSocketBus(EventBus):
+    """Fan-out over unix datagram sockets, one per worker, in a shared directory."""
+
+    MAX_PAYLOAD = 65536
+
+    def __init__(self, directory: Optional[str] = None):
+        self.directory = directory or settings.EVENT_BUS_SOCKET_DIR
+        self.path = os.path.join(self.directory, f"{os.getpid()}-{id(self):x}.sock")
+        self._sock: Optional[socket.socket] = None
+
+    def start(self, deliver):
+        os.makedirs(self.directory, exist_ok=True)
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        sock.bind(self.path)
+        self._sock = sock
+        threading.Thread(target=self._receive, args=(sock, deliver), name="event-bus", daemon=True).start()
+
+    def _receive(self, sock, deliver):
+        while True:
+            try:
+                payload = sock.recv(self.MAX_PAYLOAD)
+            except OSError:
+                return  # Closed
+            try:
+                deliver(payload)
+            except Exception:
+                logger.exception("Could not deliver event")
+
+    def publish(self, payload):
+        if len(payload) > self.MAX_PAYLOAD:
+            raise ValueError("Event payload too large for the socket bus")
+        with socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM) as sender:
+            sender.setblocking(False)  # Never stall a commit on a busy worker
+            for path in glob.glob(os.path.join(self.directory, "*.sock")):
+                try:
+                    sender.sendto(payload, path)
+                except (ConnectionRefusedError, FileNotFoundError):
+                    # Worker gone; remove its socket file
+                    try:
+                        os.unlink(path)
+                    except OSError:
+                        pass
+                except BlockingIOError:
+                    logger.warning("Event bus socket %s is full; event dropped", path)
+
+    def close(self):
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+            try:
+                os.unlink(self.path)
+            except OSError:
+                pass
+
+
+def _create_bus(name: str) -> EventBus:
+    if name == "memory":
+        return InProcessBus()
+    if name == "socket":
+        return LocalSocketBus()
+    module_name, _, class_name = name.partition(":")
+    return getattr(importlib.import_module(module_name), class_name)()
+
+
+# -----------------------------
+# Ring buffer
+# -----------------------------
+class EventBuffer:
+    """
+    The last ``size`` events in arrival order, for ``Last-Event-ID`` resume.
+
+    Ids are time-based per publishing worker, so events from different
+    workers can arrive out of id order; nothing here assumes they don't.
+    """
+
+    def __init__(self, size: int, horizon: int = 0):
+        self._events = deque(maxlen=size)
+        # Largest id that may have been missed (evicted, or published before
+        # this worker started listening)
+        self._horizon = horizon
+
+    def append(self, event: dict) -> None:
+        if len(self._events) == self._events.maxlen:
+            self._horizon = max(self._horizon, self._events[0]["event_id"])
+        self._events.append(event)
+
+    def since(self, last_event_id: int) -> Optional[List[dict]]:
+        """
+        Events the client may not have after ``last_event_id``, or None if some
+        may be missing.
+
+        That is everything that arrived after ``last_event_id`` plus any earlier
+        arrival with a larger id (the client may have been following a worker
+        that received them in another order), so an event can repeat but a
+        buffered one is never skipped.
+        """
+        if last_event_id < self._horizon:
+            return None
+        events = list(self._events)
+        after = next((i + 1 for i, e in enumerate(events) if e["event_id"] == last_event_id), len(events))
+        return [e for e in events[:after] if e["event_id"] > last_event_id] + events[after:]
+
+
+class EventFilter:
+    """Per-client selection of event types and rooms (None means all)."""
+
+    def __init__(self, types: Optional[Iterable[str]] = None, room_ids: Optional[Iterable[int]] = None):
+        self.types = set(types) if types else None
+        self.room_ids = set(room_ids) if room_ids else None
+
+    def matches(self, event: dict) -> bool:
+        if self.types is not None and event["type"] not in self.types:
+            return False
+        if event.get("op") == "refresh":
+            return True
+        if self.room_ids is not None:
+            return event.get("room_id") in self.room_ids
+        return True
+
+
+# -----------------------------
+# Dispatch
+# -----------------------------
+_RESET = {"type": "reset"}  # Queued for a subscriber that fell too far behind
+_CLOSED = None  # Queued to end streams at shutdown
+
+_lock = threading.Lock()
+_last_id = 0
+_bus: Optional[EventBus] = None
+_buffer = EventBuffer(settings.EVENT_STREAM_BUFFER_SIZE)
+_subscribers: Set["Subscription"] = set()
+
+
+def _next_id() -> int:
+    """Time-based ids, so resume works against any worker on the host."""
+    global _last_id
+    with _lock:
+        _last_id = max(time.time_ns(), _last_id + 1)
+        return _last_id
+
+
+def get_bus() -> EventBus:
+    global _bus, _buffer
+    with _lock:
+        if _bus is None:
+            bus = _create_bus(settings.EVENT_BUS)
+            bus.start(_deliver)
+            _buffer = EventBuffer(settings.EVENT_STREAM_BUFFER_SIZE, horizon=time.time_ns())
+            _bus = bus
+        return _bus
+
+
+def set_bus(bus: Optional[EventBus]) -> None:
+    """Replace the bus (None goes back to ``EVENT_BUS`` on next use)."""
+    global _bus, _buffer
+    with _lock:
+        old, _bus = _bus, None
+        _buffer = EventBuffer(settings.EVENT_STREAM_BUFFER_SIZE, horizon=time.time_ns())
+    if old is not None:
+        old.close()
+    if bus is not None:
+        bus.start(_deliver)
+        with _lock:
+            _bus = bus
+
+
+def publish(events: List[dict]) -> None:
+    """Assign ids and publish; never raises (callers are commit hooks)."""
+    try:
+        bus = get_bus()
+        for event_data in events:
+            event_data["event_id"] = _next_id()
+            bus.publish(json.dumps(event_data, default=_json_default, separators=(",", ":")).encode())
+    except Exception:
+        logger.exception("Could not publish change events")
+
+
+def _json_default(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return str(value)
+
+
+def _deliver(payload: bytes) -> None:
+    event_data = json.loads(payload)
+    with _lock:
+        _buffer.append(event_data)
+        subscribers = list(_subscribers)
+    for subscription in subscribers:
+        if subscription.event_filter.matches(event_data):
+            subscription.push(event_data)
+
+
+def replay(last_event_id: int) -> Optional[List[dict]]:
+    """Buffered events after ``last_event_id`` (None: too old, client must reset)."""
+    get_bus()
+    with _lock:
+        return _buffer.since(last_event_id)
+
+
+class Subscription:
+    def __init__(self, event_filter: EventFilter, loop: asyncio.AbstractEventLoop):
+        self.event_filter = event_filter
+        self.loop = loop
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=settings.EVENT_STREAM_CLIENT_QUEUE)
+
+    def push(self, item) -> None:
+        try:
+            self.loop.call_soon_threadsafe(self._put, item)
+        except RuntimeError:
+            pass  # Loop already closed
+
+    def _put(self, item) -> None:
+        try:
+            self.queue.put_nowait(item)
+        except asyncio.QueueFull:
+            # Slow client: drop what it has queued and make it resync
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(_RESET)
+
+
+def shutdown() -> None:
+    """End every open stream (so the worker can exit) and close the bus."""
+    with _lock:
+        subscribers = list(_subscribers)
+    for subscription in subscribers:
+        subscription.push(_CLOSED)
+    set_bus(None)
+
+
+def format_event(event_data: dict) -> str:
+    if event_data is _RESET:
+        return "event: reset\ndata: {}\n\n"
+    data = json.dumps(event_data, default=_json_default, separators=(",", ":"))
+    return f"id: {event_data['event_id']}\nevent: {event_data['type']}\ndata: {data}\n\n"
+
+
+async def stream(event_filter: EventFilter, last_event_id: Optional[int] = None) -> AsyncIterator[str]:
+    """SSE text for one client: replay after ``last_event_id``, then live events."""
+    get_bus()
+    subscription = Subscription(event_filter, asyncio.get_running_loop())
+    # Subscribe before replaying so nothing published in between is lost
+    with _lock:
+        _subscribers.add(subscription)
+    try:
+        yield f"retry: {settings.EVENT_STREAM_RETRY_MS}\n\n"
+        # Ids are not monotonic across workers, so dedupe against exactly what
+        # replay covered rather than a high-water mark
+        replayed: Set[int] = set()
+        if last_event_id is not None:
+            missed = replay(last_event_id)
+            if missed is None:
+                yield format_event(_RESET)
+            else:
+                for event_data in missed:
+                    if event_filter.matches(event_data):
+                        yield format_event(event_data)
+                    replayed.add(event_data["event_id"])
+
+        while True:
+            try:
+                item = await asyncio.wait_for(subscription.queue.get(), settings.EVENT_STREAM_HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+            if item is _CLOSED:
+                return
+            if replayed and item is not _RESET and item["event_id"] in replayed:
+                replayed.discard(item["event_id"])
+                continue  # Already sent during replay
+            yield format_event(item)
+    finally:
+        with _lock:
+            _subscribers.discard(subscription)
+
+
+# -----------------------------
+# Session hooks
+# -----------------------------
+_PENDING_KEY = "event_stream_pending"
+
+
+def _pending(session: Session) -> Dict[tuple, dict]:
+    return session.info.setdefault(_PENDING_KEY, {})
+
+
+def _value(value):
+    return value.value if hasattr(value, "value") else value
+
+
+def _delta(obj, event_type: str, columns, op: str) -> Optional[dict]:
+    state = inspect(obj)
+    if "id" not in state.dict:
+        return None  # Expired; nothing to report without emitting SQL
+    delta = {"type": event_type, "op": op, f"{event_type}_id": state.dict["id"]}
+    for column in columns:
+        if column in state.dict:
+            delta[column] = _value(state.dict[column])
+    return delta
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_flushed_changes(session, flush_context):
+    pending = _pending(session)
+    for objects, op in ((session.new, "created"), (session.dirty, "updated"), (session.deleted, "deleted")):
+        for obj in objects:
+            tracked = _TRACKED.get(type(obj))
+            if tracked is None or (op == "updated" and not session.is_modified(obj)):
+                continue
+            event_type, columns = tracked
+            delta = _delta(obj, event_type, columns, op)
+            if delta is not None:
+                key = (event_type, delta[f"{event_type}_id"])
+                if key in pending and pending[key]["op"] == "created" and op == "updated":
+                    delta["op"] = "created"
+                pending[key] = delta
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _collect_bulk_changes(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        table = getattr(orm_execute_state.statement, "table", None)
+        event_type = _TABLE_TYPES.get(getattr(table, "name", None))
+        if event_type is not None:
+            _pending(orm_execute_state.session)[(event_type, "refresh")] = {"type": event_type, "op": "refresh"}
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_committed_changes(session):
+    pending = session.info.pop(_PENDING_KEY, None)
+    if pending:
+        publish(list(pending.values()))
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_rolled_back_changes(session):
+    session.info.pop(_PENDING_KEY, None)
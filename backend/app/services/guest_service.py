@@ -1,10 +1,13 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import or_
+from sqlalchemy import or_, select
 from typing import Optional, List
 
 from ..db import models
-from ..schemas.guest import GuestCreate, GuestUpdate
-from ..utils.pagination import paginate, apply_sorting
+from ..schemas.guest import GuestCreate, GuestResponse, GuestUpdate
+from ..utils.pagination import paginate_projection, apply_sorting
+from ..utils.projection import Projection
+
+GUEST_LIST = Projection(GuestResponse, models.Guest)
 
 class GuestService:
 
@@ -23,12 +26,13 @@ class GuestService:
     @staticmethod
     def list_guests(db: Session, page: int = 1, page_size: int = 50, search: Optional[str] = None,
                    sort_by: Optional[str] = None, sort_order: str = "asc"):
-        query = db.query(models.Guest)
+        """List guests as serialized ``GuestResponse`` dicts (column projection, no ORM entities)."""
+        query = select(*GUEST_LIST.columns)
         
         # Apply search filter
         if search:
             search_pattern = f"%{search}%"
-            query = query.filter(
+            query = query.where(
                 or_(
                     models.Guest.name.ilike(search_pattern),
                     models.Guest.surname.ilike(search_pattern),
@@ -41,7 +45,7 @@ class GuestService:
         query = apply_sorting(query, models.Guest, sort_by, sort_order)
         
         # Apply pagination
-        return paginate(query, page, page_size)
+        return paginate_projection(db, query, GUEST_LIST, page, page_size)
 
     @staticmethod
     def update_guest(db: Session, guest_id: int, guest_in: GuestUpdate) -> Optional[models.Guest]:
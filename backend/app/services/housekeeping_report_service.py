@@ -1,9 +1,11 @@
+from collections import defaultdict
 from datetime import date, datetime, timedelta
 from decimal import Decimal
 from sqlalchemy import func, and_
 from sqlalchemy.orm import Session
 from typing import List, Dict
 from ..db import models
+from . import room_status_board
 
 
 class HousekeepingReportService:
@@ -113,9 +115,11 @@ class HousekeepingReportService:
             func.date(models.HousekeepingTask.completed_at) <= end_date
         ).all()
         
+        completed_by_staff = defaultdict(list)
         for task in completed_tasks:
             if task.assigned_to:
                 staff_ids.add(task.assigned_to)
+                completed_by_staff[task.assigned_to].append(task)
         
         # Get staff who verified tasks
         verified_tasks = db.query(models.HousekeepingTask).filter(
@@ -124,9 +128,17 @@ class HousekeepingReportService:
             func.date(models.HousekeepingTask.verified_at) <= end_date
         ).all()
         
+        verified_by_staff = defaultdict(int)
         for task in verified_tasks:
             if task.verified_by:
                 staff_ids.add(task.verified_by)
+                verified_by_staff[task.verified_by] += 1
+        
+        # One lookup for all staff instead of one (plus two task queries) per member
+        users = {
+            user.id: user
+            for user in db.query(models.User).filter(models.User.id.in_(staff_ids))
+        } if staff_ids else {}
         
         # Build metrics for each staff member
         staff_metrics = []
@@ -136,25 +148,12 @@ class HousekeepingReportService:
         total_duration_count = 0
         
         for staff_id in staff_ids:
-            user = db.query(models.User).filter(models.User.id == staff_id).first()
+            user = users.get(staff_id)
             if not user:
                 continue
             
-            # Tasks completed by this staff
-            completed = db.query(models.HousekeepingTask).filter(
-                models.HousekeepingTask.assigned_to == staff_id,
-                models.HousekeepingTask.completed_at.isnot(None),
-                func.date(models.HousekeepingTask.completed_at) >= start_date,
-                func.date(models.HousekeepingTask.completed_at) <= end_date
-            ).all()
-            
-            # Tasks verified by this staff
-            verified = db.query(models.HousekeepingTask).filter(
-                models.HousekeepingTask.verified_by == staff_id,
-                models.HousekeepingTask.verified_at.isnot(None),
-                func.date(models.HousekeepingTask.verified_at) >= start_date,
-                func.date(models.HousekeepingTask.verified_at) <= end_date
-            ).count()
+            completed = completed_by_staff[staff_id]
+            verified = verified_by_staff[staff_id]
             
             # Calculate average duration and total hours
             durations = [task.actual_duration_minutes for task in completed if task.actual_duration_minutes]
@@ -196,55 +195,27 @@ class HousekeepingReportService:
     
     @staticmethod
     def get_room_status_grid(db: Session) -> Dict:
-        """Get grid view of all rooms with housekeeping status"""
+        """Get grid view of all rooms with housekeeping status (served from the room status board)"""
         
         today = date.today()
         
-        # Get all rooms with their room type
-        rooms = db.query(models.Room).join(models.RoomType).all()
-        
         room_info_list = []
         status_summary = {}
         
-        for room in rooms:
-            # Check for pending/in-progress tasks
-            pending_tasks = db.query(models.HousekeepingTask).filter(
-                models.HousekeepingTask.room_id == room.id,
-                models.HousekeepingTask.status == models.TaskStatus.PENDING.value
-            ).count()
-            
-            in_progress_tasks = db.query(models.HousekeepingTask).filter(
-                models.HousekeepingTask.room_id == room.id,
-                models.HousekeepingTask.status == models.TaskStatus.IN_PROGRESS.value
-            ).count()
-            
-            # Find next booking check-in
-            next_booking = db.query(models.Booking).filter(
-                models.Booking.room_id == room.id,
-                models.Booking.check_in >= today,
-                models.Booking.status.in_([
-                    models.BookingStatus.CONFIRMED.value,
-                    models.BookingStatus.PENDING.value
-                ])
-            ).order_by(models.Booking.check_in).first()
-            
-            next_checkin = next_booking.check_in if next_booking else None
-            
-            # Get maintenance status as string
-            maintenance_status = room.maintenance_status.value if hasattr(room.maintenance_status, 'value') else str(room.maintenance_status)
-            
+        for record in room_status_board.snapshot(db):
             room_info_list.append({
-                "room_id": room.id,
-                "room_number": room.number,
-                "room_type": room.room_type.name,
-                "maintenance_status": maintenance_status,
-                "has_pending_tasks": pending_tasks > 0,
-                "has_in_progress_tasks": in_progress_tasks > 0,
-                "next_booking_checkin": next_checkin
+                "room_id": record.room_id,
+                "room_number": record.room_number,
+                "room_type": record.room_type,
+                "maintenance_status": record.maintenance_status,
+                "has_pending_tasks": record.pending_tasks > 0,
+                "has_in_progress_tasks": record.in_progress_tasks > 0,
+                "next_booking_checkin": record.next_checkin,
+                "current_guest": record.current_guest,
             })
             
             # Update summary
-            status_summary[maintenance_status] = status_summary.get(maintenance_status, 0) + 1
+            status_summary[record.maintenance_status] = status_summary.get(record.maintenance_status, 0) + 1
         
         # Sort by room number
         room_info_list.sort(key=lambda x: x["room_number"])
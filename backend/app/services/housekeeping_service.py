@@ -2,26 +2,38 @@
 Housekeeping Service
 Handles task creation, assignment, updates, and queries
 """
-from datetime import datetime, date, time
+import heapq
+from collections import defaultdict
+from datetime import datetime, date, time, timedelta
 from typing import Optional, List
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
+from sqlalchemy import or_, case, exists, insert, select, update
 from fastapi import HTTPException, status
 
-from backend.app.db.models import HousekeepingTask, Room, User, Booking, TaskStatus, TaskType, TaskPriority
+from backend.app.db.models import (
+    HousekeepingTask, Room, User, Booking, BookingStatus, PermissionLevel, TaskStatus, TaskType, TaskPriority,
+    task_priority_rank, task_scheduled_at,
+)
 from backend.app.schemas.housekeeping import (
     HousekeepingTaskCreate,
     HousekeepingTaskUpdate,
     TaskAssignRequest,
     TaskCompletionRequest,
     TaskVerificationRequest,
+    TaskSyncOperation,
 )
+from backend.app.services import task_notifier
 # from backend.app.utils.audit import log_audit  # TODO: Fix audit logging signature
 
 
 class HousekeepingService:
     """Service for managing housekeeping tasks"""
 
+    # Daily schedule templates: (task_type, scheduled_time, estimated_duration_minutes)
+    CHECKOUT_CLEANING = ("cleaning", "10:00", 45)
+    STAYOVER_CLEANING = ("cleaning", "11:00", 30)
+    TURNDOWN = ("turndown", "18:00", 15)
+
     def __init__(self, db: Session):
         self.db = db
 
@@ -77,6 +89,7 @@ class HousekeepingService:
         self.db.add(task)
         self.db.commit()
         self.db.refresh(task)
+        task_notifier.notify()
 
         # TODO: Add audit logging
 
@@ -128,53 +141,32 @@ class HousekeepingService:
             query = query.filter(HousekeepingTask.scheduled_date == scheduled_date)
         
         if is_overdue is not None:
+            # Tasks without a time have scheduled_at at the end of their day
             now = datetime.now()
-            today = now.date()
-            current_time = now.time()
-            
+            open_statuses = [TaskStatus.PENDING.value, TaskStatus.IN_PROGRESS.value]
+
             if is_overdue:
-                # Task is overdue if:
-                # 1. Scheduled date is before today, OR
-                # 2. Scheduled date is today and scheduled_time is before now
-                # AND status is not completed or verified
+                # Still open and past its scheduled date/time: one range per
+                # status on (status, priority_rank, scheduled_at)
                 query = query.filter(
-                    and_(
-                        HousekeepingTask.status.in_([TaskStatus.PENDING.value, TaskStatus.IN_PROGRESS.value]),
-                        or_(
-                            HousekeepingTask.scheduled_date < today,
-                            and_(
-                                HousekeepingTask.scheduled_date == today,
-                                HousekeepingTask.scheduled_time < current_time
-                            )
-                        )
-                    )
+                    HousekeepingTask.status.in_(open_statuses),
+                    HousekeepingTask.scheduled_at < now,
                 )
             else:
                 # Not overdue: scheduled date/time is in the future OR already completed/verified
                 query = query.filter(
                     or_(
                         HousekeepingTask.status.in_([TaskStatus.COMPLETED.value, TaskStatus.VERIFIED.value]),
-                        HousekeepingTask.scheduled_date > today,
-                        and_(
-                            HousekeepingTask.scheduled_date == today,
-                            HousekeepingTask.scheduled_time >= current_time
-                        )
+                        HousekeepingTask.scheduled_at >= now,
                     )
                 )
 
-        # Order by priority (urgent > high > normal > low) then scheduled date/time
-        from sqlalchemy import case
-        priority_order = case(
-            (HousekeepingTask.priority == 'urgent', 1),
-            (HousekeepingTask.priority == 'high', 2),
-            (HousekeepingTask.priority == 'normal', 3),
-            (HousekeepingTask.priority == 'low', 4),
-            else_=5
-        )
+        # Order by priority (urgent > high > normal > low) then scheduled date/time,
+        # matching the composite queue indexes
         query = query.order_by(
-            priority_order,
-            HousekeepingTask.scheduled_date,
-            HousekeepingTask.scheduled_time
+            HousekeepingTask.priority_rank,
+            HousekeepingTask.scheduled_at,
+            HousekeepingTask.id,
         )
 
         # Apply pagination
@@ -217,6 +209,7 @@ class HousekeepingService:
 
         self.db.commit()
         self.db.refresh(task)
+        task_notifier.notify()
 
         # TODO: Add audit logging
 
@@ -246,6 +239,7 @@ class HousekeepingService:
 
         self.db.commit()
         self.db.refresh(task)
+        task_notifier.notify()
 
         
 
@@ -375,3 +369,377 @@ class HousekeepingService:
 
         self.db.delete(task)
         self.db.commit()
+
+    def generate_daily_tasks(self, target_date: date, created_by_id: int) -> dict:
+        """
+        Build the housekeeping schedule for a day in one query and one bulk insert.
+
+        - Departures (check_out == target_date): checkout cleaning, urgent if the
+          room has an arrival the same day, high if it has one the next day
+        - In-house stays: a stayover cleaning and an evening turndown
+
+        Bookings that already have a task of that type on the date (e.g. a
+        checkout cleaning created at check-out) are skipped, so it is safe to
+        run more than once.
+        """
+        next_date = target_date + timedelta(days=1)
+
+        def has_task(task_type: str):
+            return exists().where(
+                HousekeepingTask.booking_id == Booking.id,
+                HousekeepingTask.scheduled_date == target_date,
+                HousekeepingTask.task_type == task_type,
+            )
+
+        rows = self.db.execute(
+            select(
+                Booking.id,
+                Booking.room_id,
+                Booking.booking_number,
+                Booking.check_in,
+                Booking.check_out,
+                Booking.status,
+                has_task("cleaning").label("has_cleaning"),
+                has_task("turndown").label("has_turndown"),
+            ).where(
+                Booking.status.in_([
+                    BookingStatus.PENDING.value,
+                    BookingStatus.CONFIRMED.value,
+                    BookingStatus.CHECKED_IN.value,
+                    BookingStatus.CHECKED_OUT.value,
+                ]),
+                Booking.check_in <= next_date,
+                Booking.check_out >= target_date,
+            )
+        ).all()
+
+        # Earliest upcoming arrival per room decides departure priority
+        arrival_priority = {}
+        for row in rows:
+            if BookingStatus(row.status) in (BookingStatus.PENDING, BookingStatus.CONFIRMED):
+                priority = "urgent" if row.check_in == target_date else "high" if row.check_in == next_date else None
+                if priority and arrival_priority.get(row.room_id) != "urgent":
+                    arrival_priority[row.room_id] = priority
+
+        def task(row, template, priority, notes, is_checkout_cleaning=False):
+            task_type, scheduled_time, duration = template
+            return {
+                "room_id": row.room_id,
+                "booking_id": row.id,
+                "task_type": task_type,
+                "priority": priority,
+                "status": TaskStatus.PENDING.value,
+                "scheduled_date": target_date,
+                "scheduled_time": scheduled_time,
+                # Bulk inserts skip ORM flush events, so set the queue columns here
+                "priority_rank": task_priority_rank(priority),
+                "scheduled_at": task_scheduled_at(target_date, scheduled_time),
+                "notes": notes,
+                "estimated_duration_minutes": duration,
+                "is_checkout_cleaning": is_checkout_cleaning,
+                "created_by": created_by_id,
+            }
+
+        tasks = []
+        summary = {"checkout_cleanings": 0, "stayover_cleanings": 0, "turndowns": 0, "skipped_existing": 0}
+        for row in rows:
+            booking_status = BookingStatus(row.status)
+            if row.check_out == target_date and booking_status in (BookingStatus.CHECKED_IN, BookingStatus.CHECKED_OUT):
+                if row.has_cleaning:
+                    summary["skipped_existing"] += 1
+                    continue
+                tasks.append(task(
+                    row, self.CHECKOUT_CLEANING, arrival_priority.get(row.room_id, "normal"),
+                    f"Checkout cleaning for booking #{row.booking_number}", is_checkout_cleaning=True,
+                ))
+                summary["checkout_cleanings"] += 1
+            elif booking_status == BookingStatus.CHECKED_IN and row.check_in < target_date < row.check_out:
+                if row.has_cleaning:
+                    summary["skipped_existing"] += 1
+                else:
+                    tasks.append(task(row, self.STAYOVER_CLEANING, "normal", f"Stayover cleaning for booking #{row.booking_number}"))
+                    summary["stayover_cleanings"] += 1
+                if row.has_turndown:
+                    summary["skipped_existing"] += 1
+                else:
+                    tasks.append(task(row, self.TURNDOWN, "low", f"Turndown service for booking #{row.booking_number}"))
+                    summary["turndowns"] += 1
+
+        if tasks:
+            self.db.execute(insert(HousekeepingTask), tasks)
+            self.db.commit()
+            task_notifier.notify()
+
+        summary["scheduled_date"] = target_date
+        summary["tasks_created"] = len(tasks)
+        return summary
+
+    @staticmethod
+    def plan_assignments(tasks: list, staff_ids: List[int]) -> dict:
+        """
+        Balance ``(task_id, floor, minutes, priority)`` tasks across staff.
+
+        Floors are handed out whole, largest first, to the least-loaded person
+        (a min-heap of loads). A floor only spills over to the next least-loaded
+        person once the current one would pass the per-person average, so
+        workloads stay even while each person covers as few floors as possible.
+        Within a floor, urgent work comes first. O(n log n).
+
+        Returns {task_id: staff_id}.
+        """
+        if not tasks or not staff_ids:
+            return {}
+
+        floors = defaultdict(list)
+        for task in tasks:
+            floors[task[1]].append(task)
+        floor_minutes = {floor: sum(t[2] for t in group) for floor, group in floors.items()}
+        target = sum(floor_minutes.values()) / len(staff_ids)
+
+        loads = [(0, position, staff_id) for position, staff_id in enumerate(staff_ids)]
+        heapq.heapify(loads)
+        plan = {}
+        for floor in sorted(floors, key=lambda f: (-floor_minutes[f], f is None, f or 0)):
+            load, position, staff_id = heapq.heappop(loads)
+            group = sorted(floors[floor], key=lambda t: (task_priority_rank(t[3]), -t[2], t[0]))
+            for task_id, _, minutes, _ in group:
+                if load > 0 and load + minutes > target and loads and loads[0][0] < load:
+                    load, position, staff_id = heapq.heapreplace(loads, (load, position, staff_id))
+                plan[task_id] = staff_id
+                load += minutes
+            heapq.heappush(loads, (load, position, staff_id))
+        return plan
+
+    def auto_assign_tasks(
+        self,
+        scheduled_date: date,
+        assigned_by_id: int,
+        staff_ids: Optional[List[int]] = None,
+    ) -> dict:
+        """
+        Assign the day's unassigned pending tasks across staff in one UPDATE.
+
+        Staff defaults to every active regular user. Tasks assigned by someone
+        else in the meantime are left alone (the UPDATE only touches rows that
+        are still unassigned and pending).
+        """
+        if staff_ids:
+            staff = self.db.execute(
+                select(User.id, User.username).where(User.id.in_(staff_ids))
+            ).all()
+            missing = set(staff_ids) - {row.id for row in staff}
+            if missing:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail=f"User {min(missing)} not found"
+                )
+        else:
+            staff = self.db.execute(
+                select(User.id, User.username).where(
+                    User.is_active.is_(True),
+                    User.permission_level == PermissionLevel.REGULAR.value,
+                ).order_by(User.id)
+            ).all()
+        if not staff:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="No staff available for assignment"
+            )
+        usernames = {row.id: row.username for row in staff}
+
+        tasks = self.db.execute(
+            select(
+                HousekeepingTask.id,
+                Room.floor,
+                HousekeepingTask.estimated_duration_minutes,
+                HousekeepingTask.priority,
+            ).join(Room, Room.id == HousekeepingTask.room_id).where(
+                HousekeepingTask.scheduled_date == scheduled_date,
+                HousekeepingTask.status == TaskStatus.PENDING.value,
+                HousekeepingTask.assigned_to.is_(None),
+            )
+        ).all()
+        tasks = [(task_id, floor, minutes or 0, priority) for task_id, floor, minutes, priority in tasks]
+        plan = self.plan_assignments(tasks, [row.id for row in staff])
+
+        assigned = 0
+        if plan:
+            assigned = self.db.execute(
+                update(HousekeepingTask)
+                .where(
+                    HousekeepingTask.id.in_(plan.keys()),
+                    HousekeepingTask.status == TaskStatus.PENDING.value,
+                    HousekeepingTask.assigned_to.is_(None),
+                )
+                .values(assigned_to=case(plan, value=HousekeepingTask.id))
+            ).rowcount
+            self.db.commit()
+            task_notifier.notify()
+
+        workload = {staff_id: {"task_count": 0, "total_minutes": 0, "floors": set()} for staff_id in usernames}
+        for task_id, floor, minutes, _ in tasks:
+            entry = workload[plan[task_id]]
+            entry["task_count"] += 1
+            entry["total_minutes"] += minutes
+            if floor is not None:
+                entry["floors"].add(floor)
+
+        return {
+            "scheduled_date": scheduled_date,
+            "tasks_assigned": assigned,
+            "staff": [
+                {
+                    "user_id": staff_id,
+                    "username": usernames[staff_id],
+                    "task_count": entry["task_count"],
+                    "total_minutes": entry["total_minutes"],
+                    "floors": sorted(entry["floors"]),
+                }
+                for staff_id, entry in workload.items()
+            ],
+        }
+
+    def sync_task_transitions(self, operations: List[TaskSyncOperation], user_id: int) -> dict:
+        """
+        Apply a device's queued start/complete transitions in one transaction.
+
+        Operations are applied in ``occurred_at`` order with the device's
+        timestamps. Each gets its own result instead of failing the batch:
+
+        - applied: the transition was made
+        - duplicate: the task is already in (or past) that state for this
+          user, e.g. the device is replaying a batch whose response was lost
+        - rejected: not found, not assigned to the caller, or invalid state
+        """
+        task_ids = {op.task_id for op in operations}
+        tasks = {
+            task.id: task
+            for task in self.db.query(HousekeepingTask).filter(HousekeepingTask.id.in_(task_ids))
+        } if task_ids else {}
+
+        now = datetime.now()
+        started_states = {TaskStatus.IN_PROGRESS.value, TaskStatus.COMPLETED.value, TaskStatus.VERIFIED.value}
+        finished_states = {TaskStatus.COMPLETED.value, TaskStatus.VERIFIED.value}
+        results = {}
+
+        for op in sorted(operations, key=lambda o: self._local_time(o.occurred_at)):
+            task = tasks.get(op.task_id)
+            if task is None:
+                results[id(op)] = ("rejected", f"Housekeeping task {op.task_id} not found", None)
+                continue
+            if task.assigned_to != user_id:
+                results[id(op)] = ("rejected", "You are not assigned to this task", task.status)
+                continue
+
+            # Device clocks drift; never record a transition in the future
+            occurred_at = min(self._local_time(op.occurred_at), now)
+            if op.action == "start":
+                if task.status in started_states:
+                    results[id(op)] = ("duplicate", None, task.status)
+                    continue
+                if task.status != TaskStatus.PENDING.value:
+                    results[id(op)] = ("rejected", f"Cannot start task with status {task.status}", task.status)
+                    continue
+                task.status = TaskStatus.IN_PROGRESS.value
+                task.started_at = occurred_at
+            else:
+                if task.status in finished_states:
+                    results[id(op)] = ("duplicate", None, task.status)
+                    continue
+                if task.status not in (TaskStatus.PENDING.value, TaskStatus.IN_PROGRESS.value):
+                    results[id(op)] = ("rejected", f"Cannot complete task with status {task.status}", task.status)
+                    continue
+                task.status = TaskStatus.COMPLETED.value
+                task.completed_at = occurred_at
+                if op.completion_notes:
+                    task.completion_notes = op.completion_notes
+                if op.actual_duration_minutes is not None:
+                    task.actual_duration_minutes = op.actual_duration_minutes
+            results[id(op)] = ("applied", None, task.status)
+
+        self.db.commit()
+        if any(result[0] == "applied" for result in results.values()):
+            # Wake next-task long-polls so they re-check the queue after the batch
+            task_notifier.notify()
+
+        # Results in request order, so the device can match them to its queue
+        items = []
+        for op in operations:
+            result, detail, task_status = results[id(op)]
+            items.append({
+                "op_id": op.op_id,
+                "task_id": op.task_id,
+                "result": result,
+                "detail": detail,
+                "task_status": task_status,
+            })
+        return {
+            "applied": sum(1 for item in items if item["result"] == "applied"),
+            "duplicates": sum(1 for item in items if item["result"] == "duplicate"),
+            "rejected": sum(1 for item in items if item["result"] == "rejected"),
+            "results": items,
+        }
+
+    CLAIM_ATTEMPTS = 3
+
+    def next_task(self, user_id: int, today: Optional[date] = None) -> Optional[HousekeepingTask]:
+        """
+        The caller's next task: their own highest-priority pending task due by
+        today, otherwise an unassigned one claimed for them.
+
+        The claim is a single ``UPDATE ... WHERE status = 'pending' AND
+        assigned_to IS NULL RETURNING id``, so when two people claim at once
+        exactly one gets the task; the other retries with the next one.
+        """
+        today = today or date.today()
+        own = self.db.execute(
+            select(HousekeepingTask.id)
+            .where(
+                HousekeepingTask.assigned_to == user_id,
+                HousekeepingTask.status == TaskStatus.PENDING.value,
+                HousekeepingTask.scheduled_date <= today,
+            )
+            .order_by(HousekeepingTask.priority_rank, HousekeepingTask.scheduled_at, HousekeepingTask.id)
+            .limit(1)
+        ).scalar()
+        if own is not None:
+            return self.db.get(HousekeepingTask, own)
+
+        unassigned = (
+            HousekeepingTask.status == TaskStatus.PENDING.value,
+            HousekeepingTask.assigned_to.is_(None),
+        )
+        for _ in range(self.CLAIM_ATTEMPTS):
+            candidate = (
+                select(HousekeepingTask.id)
+                .where(*unassigned, HousekeepingTask.scheduled_date <= today)
+                .order_by(HousekeepingTask.priority_rank, HousekeepingTask.scheduled_at, HousekeepingTask.id)
+                .limit(1)
+                .with_for_update(skip_locked=True)
+                .scalar_subquery()
+            )
+            claimed = self.db.execute(
+                update(HousekeepingTask)
+                .where(HousekeepingTask.id == candidate, *unassigned)
+                .values(assigned_to=user_id)
+                .returning(HousekeepingTask.id)
+                .execution_options(synchronize_session=False)
+            ).scalar()
+            self.db.commit()
+            if claimed is not None:
+                task = self.db.get(HousekeepingTask, claimed)
+                self.db.refresh(task)
+                return task
+            # Lost the race (or nothing left): stop once there is nothing to claim
+            if self.db.execute(select(HousekeepingTask.id).where(*unassigned, HousekeepingTask.scheduled_date <= today).limit(1)).scalar() is None:
+                break
+        # End the read transaction: a long-poll waits after this and must not hold a pooled connection
+        self.db.commit()
+        return None
+
+    @staticmethod
+    def _local_time(value: datetime) -> datetime:
+        """Naive local time, like the datetime.now() values stored elsewhere."""
+        if value.tzinfo is not None:
+            return value.astimezone().replace(tzinfo=None)
+        return value
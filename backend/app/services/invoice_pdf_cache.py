@@ -0,0 +1,130 @@
+"""
+Content-addressed on-disk cache of rendered invoice PDFs.
+
+The key is a SHA-256 of the render data plus the template version, so an
+invoice whose booking, guest or amounts change simply misses and is
+re-rendered; stale entries are never served and age out by eviction.
+Files are written atomically (temp file + rename), so concurrent workers
+sharing the directory never read a partial PDF.
+
+The directory is bounded by ``INVOICE_PDF_CACHE_MAX_BYTES``: once a write
+pushes it over, least recently used files (by mtime, refreshed on every hit)
+are deleted until it is back under 90% of the limit.
+"""
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from typing import Dict, Optional
+
+from ..core import metrics
+from ..core.config import settings
+from .invoice_renderer import TEMPLATE_VERSION
+
+_SUFFIX = ".pdf"
+
+_lock = threading.Lock()
+# Bytes on disk as last seen by this process; None until the first scan
+_size: Optional[int] = None
+
+
+def cache_key(data: Dict[str, str]) -> str:
+    payload = json.dumps(data, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(f"{TEMPLATE_VERSION}\n{payload}".encode("utf-8")).hexdigest()
+
+
+def _path(key: str) -> str:
+    # Two-level fan-out keeps directories small
+    return os.path.join(settings.INVOICE_PDF_CACHE_DIR, key[:2], key + _SUFFIX)
+
+
+def get(key: str) -> Optional[bytes]:
+    path = _path(key)
+    try:
+        with open(path, "rb") as f:
+            pdf = f.read()
+    except FileNotFoundError:
+        metrics.record_cache("invoice_pdf", hit=False)
+        return None
+    metrics.record_cache("invoice_pdf", hit=True)
+    try:
+        os.utime(path)  # Mark as recently used
+    except OSError:
+        pass
+    return pdf
+
+
+def put(key: str, pdf: bytes) -> None:
+    global _size
+    if settings.INVOICE_PDF_CACHE_MAX_BYTES <= 0 or len(pdf) > settings.INVOICE_PDF_CACHE_MAX_BYTES:
+        return
+    path = _path(key)
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(pdf)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+    with _lock:
+        if _size is None:
+            _size = _scan_size()
+        else:
+            _size += len(pdf)
+        if _size > settings.INVOICE_PDF_CACHE_MAX_BYTES:
+            _size = _evict(int(settings.INVOICE_PDF_CACHE_MAX_BYTES * 0.9))
+
+
+def clear() -> None:
+    """Delete every cached PDF (used by tests)."""
+    global _size
+    with _lock:
+        for path, _, _ in _entries():
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+        _size = 0
+
+
+def _entries():
+    root = settings.INVOICE_PDF_CACHE_DIR
+    if not os.path.isdir(root):
+        return
+    for dirpath, _, filenames in os.walk(root):
+        for name in filenames:
+            if not name.endswith(_SUFFIX):
+                continue
+            path = os.path.join(dirpath, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue  # Evicted by another worker
+            yield path, st.st_size, st.st_mtime
+
+
+def _scan_size() -> int:
+    return sum(size for _, size, _ in _entries())
+
+
+def _evict(target: int) -> int:
+    """Delete least recently used files until the total is <= target; return the new total."""
+    entries = sorted(_entries(), key=lambda e: e[2])
+    total = sum(size for _, size, _ in entries)
+    for path, size, _ in entries:
+        if total <= target:
+            break
+        try:
+            os.unlink(path)
+        except OSError:
+            continue
+        total -= size
+    return total
@@ -0,0 +1,201 @@
+"""
+Invoice PDF rendering.
+
+``render_invoice_pdf`` is a pure function of a small dict of preformatted
+strings (see ``InvoiceService.invoice_render_data``), so it can run in a
+worker process and its output can be cached by content. Paragraph and table
+styles are built once per process instead of on every call.
+
+Rendering is CPU-bound pure Python, so it runs on a small process pool
+(``INVOICE_RENDER_WORKERS``; 0 renders inline). As with password hashing,
+admission is bounded: when the pool and its queue are full, single renders
+fail fast with 503 instead of queueing without limit.
+"""
+import multiprocessing
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+from fastapi import HTTPException, status
+
+from ..core.config import settings
+
+try:
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib import colors
+    from reportlab.lib.styles import getSampleStyleSheet
+    from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
+    REPORTLAB_AVAILABLE = True
+except ImportError:
+    REPORTLAB_AVAILABLE = False
+
+# Part of every cache key: bump whenever the layout below changes so cached
+# PDFs rendered with the old template are not served again.
+TEMPLATE_VERSION = "1"
+
+_styles = None
+_table_style = None
+
+
+def _templates():
+    """Paragraph and table styles, built on first use in each process."""
+    global _styles, _table_style
+    if _styles is None:
+        _styles = getSampleStyleSheet()
+        _table_style = TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 12),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+            ('GRID', (0, 0), (-1, -1), 1, colors.black),
+            ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
+        ])
+    return _styles, _table_style
+
+
+def render_invoice_pdf(data: Dict[str, str]) -> bytes:
+    """Render one invoice. ``invariant`` output makes equal data give equal bytes."""
+    styles, table_style = _templates()
+    buffer = BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=letter, invariant=1)
+    elements = []
+
+    # Title
+    elements.append(Paragraph("<b>INVOICE</b>", styles['Title']))
+    elements.append(Spacer(1, 12))
+
+    # Invoice details
+    elements.append(Paragraph(f"""
+        <b>Invoice Number:</b> {data['invoice_number']}<br/>
+        <b>Issue Date:</b> {data['issued_at']}<br/>
+        <b>Booking ID:</b> {data['booking_id']}<br/>
+        <b>Booking Number:</b> {data['booking_number']}<br/>
+    """, styles['Normal']))
+    elements.append(Spacer(1, 20))
+
+    # Guest information
+    elements.append(Paragraph(f"""
+        <b>Guest Information:</b><br/>
+        Name: {data['guest_name']}<br/>
+        Email: {data['guest_email']}<br/>
+    """, styles['Normal']))
+    elements.append(Spacer(1, 20))
+
+    # Booking details table
+    rows = [
+        ['Description', 'Quantity', 'Rate', 'Amount'],
+        [f"Room Stay (Room #{data['room_number']})", data['nights'], f"${data['rate']}", f"${data['subtotal']}"],
+        ['', '', 'Subtotal:', f"${data['subtotal']}"],
+        ['', '', 'Tax (10%):', f"${data['tax']}"],
+        ['', '', 'Total:', f"${data['total']}"],
+    ]
+    table = Table(rows, colWidths=[250, 80, 100, 100])
+    table.setStyle(table_style)
+    elements.append(table)
+    elements.append(Spacer(1, 30))
+
+    # Footer
+    elements.append(Paragraph("""
+        <b>Thank you for your business!</b><br/>
+        For any questions, please contact our front desk.
+    """, styles['Normal']))
+
+    doc.build(elements)
+    return buffer.getvalue()
+
+
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_lock = threading.Lock()
+# Admission control: running + queued render jobs across all requests
+_render_slots = threading.BoundedSemaphore(
+    max(settings.INVOICE_RENDER_WORKERS, 1) + settings.INVOICE_RENDER_QUEUE_LIMIT
+)
+
+
+def _get_executor() -> Optional[ProcessPoolExecutor]:
+    """The shared render pool, started on first use (None renders inline)."""
+    global _executor
+    if settings.INVOICE_RENDER_WORKERS <= 0:
+        return None
+    with _executor_lock:
+        if _executor is None:
+            # spawn: forking a process that runs server threads is not safe
+            _executor = ProcessPoolExecutor(
+                max_workers=settings.INVOICE_RENDER_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _executor
+
+
+def shutdown_render_pool() -> None:
+    """Stop the worker processes (next render starts a new pool)."""
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=True, cancel_futures=True)
+            _executor = None
+
+
+def render_pdf(data: Dict[str, str]) -> bytes:
+    """Render one invoice on the pool, or raise 503 when it is saturated."""
+    if not _render_slots.acquire(blocking=False):
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Invoice rendering is busy. Please retry shortly.",
+            headers={"Retry-After": "1"},
+        )
+    try:
+        executor = _get_executor()
+        if executor is None:
+            return render_invoice_pdf(data)
+        return executor.submit(render_invoice_pdf, data).result()
+    finally:
+        _render_slots.release()
+
+
+def render_many(items: Iterable[Tuple[object, Dict[str, str]]]) -> Iterator[Tuple[object, bytes]]:
+    """
+    Render ``(key, data)`` pairs, yielding ``(key, pdf)`` in input order.
+
+    At most one job per worker is in flight beyond the one being consumed,
+    so memory stays bounded however many invoices are exported. Unlike
+    ``render_pdf`` this waits for a free slot instead of failing.
+    """
+    executor = _get_executor()
+    if executor is None:
+        for key, data in items:
+            yield key, render_invoice_pdf(data)
+        return
+
+    window = settings.INVOICE_RENDER_WORKERS
+    pending = deque()
+    try:
+        for key, data in items:
+            _render_slots.acquire()
+            try:
+                pending.append((key, executor.submit(render_invoice_pdf, data)))
+            except BaseException:
+                _render_slots.release()
+                raise
+            if len(pending) >= window:
+                yield _collect(pending.popleft())
+        while pending:
+            yield _collect(pending.popleft())
+    finally:
+        # Client went away mid-export: drop queued jobs and free their slots
+        for _, future in pending:
+            future.cancel()
+            _render_slots.release()
+
+
+def _collect(job) -> Tuple[object, bytes]:
+    key, future = job
+    try:
+        return key, future.result()
+    finally:
+        _render_slots.release()
@@ -1,24 +1,16 @@
-from datetime import datetime
-from datetime import datetime, timezone
+import zipfile
+from datetime import date, datetime, time, timedelta, timezone
 from decimal import Decimal
 from uuid import uuid4
-from io import BytesIO
-from typing import Optional
+from typing import Dict, Iterator, Optional, Tuple
 
 from sqlalchemy.orm import Session
 from fastapi import HTTPException
 
 from ..db import models
 from ..utils.pagination import paginate, apply_sorting
-
-try:
-    from reportlab.lib.pagesizes import letter
-    from reportlab.lib import colors
-    from reportlab.lib.styles import getSampleStyleSheet
-    from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-    REPORTLAB_AVAILABLE = True
-except ImportError:
-    REPORTLAB_AVAILABLE = False
+from . import invoice_pdf_cache
+from .invoice_renderer import REPORTLAB_AVAILABLE, render_many, render_pdf
 
 
 class InvoiceService:
@@ -49,6 +41,18 @@ class InvoiceService:
         # Apply pagination
         return paginate(query, page, page_size)
     
+    @staticmethod
+    def invoice_amounts(final_bill) -> Tuple[Decimal, Decimal, Decimal]:
+        """(subtotal, tax, total) for a final bill; tax is 10%, rounded half-even."""
+        subtotal = Decimal(final_bill)
+        tax = (subtotal * Decimal('0.10')).quantize(Decimal('0.01'))
+        total = (subtotal + tax).quantize(Decimal('0.01'))
+        return subtotal, tax, total
+
+    @staticmethod
+    def new_invoice_number() -> str:
+        return f"INV-{datetime.now(timezone.utc).strftime('%Y%m%d')}-{uuid4().hex[:6].upper()}"
+
     @staticmethod
     def generate_invoice(db: Session, booking_id: int) -> models.Invoice:
         booking = db.query(models.Booking).filter(models.Booking.id == booking_id).first()
@@ -58,15 +62,11 @@ class InvoiceService:
         if booking.final_bill is None:
             raise HTTPException(status_code=400, detail="Booking final bill not set")
 
-        subtotal = Decimal(booking.final_bill)
-        tax = (subtotal * Decimal('0.10')).quantize(Decimal('0.01'))
-        total = (subtotal + tax).quantize(Decimal('0.01'))
-
-        invoice_number = f"INV-{datetime.now(timezone.utc).strftime('%Y%m%d')}-{uuid4().hex[:6].upper()}"
+        subtotal, tax, total = InvoiceService.invoice_amounts(booking.final_bill)
 
         invoice = models.Invoice(
             booking_id=booking_id,
-            invoice_number=invoice_number,
+            invoice_number=InvoiceService.new_invoice_number(),
             subtotal=subtotal,
             tax=tax,
             total=total,
@@ -76,90 +76,131 @@ class InvoiceService:
         db.refresh(invoice)
         return invoice
 
+    @staticmethod
+    def _render_data_query(db: Session):
+        """Columns the PDF template needs, in one joined query (no ORM objects)."""
+        return db.query(
+            models.Invoice.id,
+            models.Invoice.invoice_number,
+            models.Invoice.issued_at,
+            models.Invoice.subtotal,
+            models.Invoice.tax,
+            models.Invoice.total,
+            models.Booking.id.label("booking_id"),
+            models.Booking.booking_number,
+            models.Booking.check_in,
+            models.Booking.check_out,
+            models.Booking.price_per_night,
+            models.Guest.name.label("guest_name"),
+            models.Guest.surname.label("guest_surname"),
+            models.Guest.email.label("guest_email"),
+            models.Room.number.label("room_number"),
+        ).join(
+            models.Booking, models.Booking.id == models.Invoice.booking_id
+        ).outerjoin(
+            models.Guest, models.Guest.id == models.Booking.guest_id
+        ).outerjoin(
+            models.Room, models.Room.id == models.Booking.room_id
+        )
+
+    @staticmethod
+    def _render_data(row) -> Dict[str, str]:
+        """Preformatted strings for ``render_invoice_pdf`` (also the PDF cache key)."""
+        return {
+            "invoice_number": row.invoice_number,
+            "issued_at": row.issued_at.strftime('%Y-%m-%d %H:%M') if row.issued_at else 'N/A',
+            "booking_id": str(row.booking_id),
+            "booking_number": row.booking_number or 'N/A',
+            "guest_name": f"{row.guest_name} {row.guest_surname}" if row.guest_name else 'N/A',
+            "guest_email": row.guest_email or 'N/A',
+            "room_number": row.room_number or 'N/A',
+            "nights": str((row.check_out - row.check_in).days),
+            "rate": str(row.price_per_night),
+            "subtotal": str(row.subtotal),
+            "tax": str(row.tax),
+            "total": str(row.total),
+        }
+
     @staticmethod
     def generate_invoice_pdf(db: Session, invoice_id: int) -> bytes:
-        """Generate a PDF invoice document"""
+        """Generate a PDF invoice document (served from the PDF cache when unchanged)"""
         if not REPORTLAB_AVAILABLE:
             raise HTTPException(status_code=500, detail="PDF generation not available. Install reportlab.")
-        
-        invoice = db.query(models.Invoice).filter(models.Invoice.id == invoice_id).first()
-        if not invoice:
-            raise HTTPException(status_code=404, detail="Invoice not found")
-        
-        booking = db.query(models.Booking).filter(models.Booking.id == invoice.booking_id).first()
-        if not booking:
+
+        row = InvoiceService._render_data_query(db).filter(models.Invoice.id == invoice_id).first()
+        if not row:
+            if not db.query(models.Invoice.id).filter(models.Invoice.id == invoice_id).first():
+                raise HTTPException(status_code=404, detail="Invoice not found")
             raise HTTPException(status_code=404, detail="Booking not found")
-        
-        # Create PDF in memory
-        buffer = BytesIO()
-        doc = SimpleDocTemplate(buffer, pagesize=letter)
-        elements = []
-        styles = getSampleStyleSheet()
-        
-        # Title
-        title = Paragraph(f"<b>INVOICE</b>", styles['Title'])
-        elements.append(title)
-        elements.append(Spacer(1, 12))
-        
-        # Invoice details
-        invoice_info = Paragraph(f"""
-            <b>Invoice Number:</b> {invoice.invoice_number}<br/>
-            <b>Issue Date:</b> {invoice.issued_at.strftime('%Y-%m-%d %H:%M') if invoice.issued_at else 'N/A'}<br/>
-            <b>Booking ID:</b> {booking.id}<br/>
-            <b>Booking Number:</b> {booking.booking_number or 'N/A'}<br/>
-        """, styles['Normal'])
-        elements.append(invoice_info)
-        elements.append(Spacer(1, 20))
-        
-        # Guest information
-        guest_info = Paragraph(f"""
-            <b>Guest Information:</b><br/>
-            Name: {booking.guest.name if booking.guest else 'N/A'} {booking.guest.surname if booking.guest else ''}<br/>
-            Email: {booking.guest.email if booking.guest else 'N/A'}<br/>
-        """, styles['Normal'])
-        elements.append(guest_info)
-        elements.append(Spacer(1, 20))
-        
-        # Booking details table
-        data = [
-            ['Description', 'Quantity', 'Rate', 'Amount'],
-            [f'Room Stay (Room #{booking.room.number if booking.room else "N/A"})', 
-             str(booking.number_of_nights), 
-             f'${booking.price_per_night}', 
-             f'${invoice.subtotal}'],
-            ['', '', 'Subtotal:', f'${invoice.subtotal}'],
-            ['', '', 'Tax (10%):', f'${invoice.tax}'],
-            ['', '', 'Total:', f'${invoice.total}'],
-        ]
-        
-        table = Table(data, colWidths=[250, 80, 100, 100])
-        table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 12),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black),
-            ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
-        ]))
-        
-        elements.append(table)
-        elements.append(Spacer(1, 30))
-        
-        # Footer
-        footer = Paragraph("""
-            <b>Thank you for your business!</b><br/>
-            For any questions, please contact our front desk.
-        """, styles['Normal'])
-        elements.append(footer)
-        
-        # Build PDF
-        doc.build(elements)
-        
-        # Get the PDF bytes
-        pdf_bytes = buffer.getvalue()
-        buffer.close()
-        
+
+        data = InvoiceService._render_data(row)
+        key = invoice_pdf_cache.cache_key(data)
+        pdf_bytes = invoice_pdf_cache.get(key)
+        if pdf_bytes is None:
+            pdf_bytes = render_pdf(data)
+            invoice_pdf_cache.put(key, pdf_bytes)
         return pdf_bytes
+
+    @staticmethod
+    def export_invoice_pdfs(db: Session, start_date: date, end_date: date) -> Iterator[bytes]:
+        """
+        ZIP of the PDFs of every invoice issued in [start_date, end_date], as chunks.
+
+        Only the (small) render data is loaded up front; PDFs come from the
+        cache or the render pool a few at a time and are written to the
+        archive as they arrive, so memory does not grow with the range.
+        """
+        if not REPORTLAB_AVAILABLE:
+            raise HTTPException(status_code=500, detail="PDF generation not available. Install reportlab.")
+
+        rows = InvoiceService._render_data_query(db).filter(
+            models.Invoice.issued_at >= datetime.combine(start_date, time.min),
+            models.Invoice.issued_at < datetime.combine(end_date + timedelta(days=1), time.min),
+        ).order_by(models.Invoice.issued_at, models.Invoice.id).all()
+        items = [(f"{row.invoice_number}.pdf", InvoiceService._render_data(row)) for row in rows]
+        return _zip_stream(_export_pdfs(items))
+
+
+def _export_pdfs(items) -> Iterator[Tuple[str, bytes]]:
+    """Cached PDFs first, then the misses through the render pool."""
+    misses = []
+    for name, data in items:
+        key = invoice_pdf_cache.cache_key(data)
+        pdf_bytes = invoice_pdf_cache.get(key)
+        if pdf_bytes is None:
+            misses.append(((name, key), data))
+        else:
+            yield name, pdf_bytes
+    for (name, key), pdf_bytes in render_many(misses):
+        invoice_pdf_cache.put(key, pdf_bytes)
+        yield name, pdf_bytes
+
+
+class _ChunkWriter:
+    """Write-only file object collecting what ZipFile writes until it is drained."""
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _zip_stream(files: Iterator[Tuple[str, bytes]]) -> Iterator[bytes]:
+    # The writer is not seekable, so ZipFile emits data descriptors after each
+    # member instead of rewriting headers. PDFs are already compressed: store them.
+    writer = _ChunkWriter()
+    with zipfile.ZipFile(writer, mode="w", compression=zipfile.ZIP_STORED) as archive:
+        for name, pdf_bytes in files:
+            archive.writestr(name, pdf_bytes)
+            yield writer.drain()
+    yield writer.drain()  # Central directory
@@ -0,0 +1,133 @@
+"""
+Night audit: the end-of-day batch that replaces per-booking API calls.
+
+Each stage is a couple of set-based statements committed as its own
+transaction, so a failure in a later stage leaves earlier stages applied and
+the audit can simply be re-run (every stage only picks up work that is still
+outstanding).
+"""
+import time
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Optional
+
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.orm import Session
+
+from ..db import models
+from ..utils.audit import log_audit
+from ..utils.money import from_cents, to_cents
+from .invoice_service import InvoiceService
+
+
+class NightAuditService:
+    @staticmethod
+    def mark_no_shows(db: Session, business_date: date) -> dict:
+        """
+        CONFIRMED bookings due on or before ``business_date`` that never checked
+        in become NO_SHOW, each charged its full bill (as ``mark_no_show`` does).
+        """
+        now = datetime.now()
+        rows = db.execute(
+            update(models.Booking)
+            .where(
+                models.Booking.status == models.BookingStatus.CONFIRMED.value,
+                models.Booking.check_in <= business_date,
+            )
+            .values(status=models.BookingStatus.NO_SHOW.value)
+            .returning(
+                models.Booking.id,
+                models.Booking.booking_number,
+                func.coalesce(models.Booking.final_bill, models.Booking.total_price),
+            )
+        ).all()
+
+        charges = [
+            {
+                "booking_id": booking_id,
+                "amount": amount,
+                "currency": "USD",
+                "method": "no_show_charge",
+                "status": models.Payment.PaymentStatus.PAID.value,
+                "processed_at": now,
+                "reference": f"No-show charge for booking {booking_number}",
+            }
+            for booking_id, booking_number, amount in rows
+            if amount and amount > 0
+        ]
+        if charges:
+            db.execute(insert(models.Payment), charges)
+        db.commit()
+
+        return {
+            "no_shows": len(rows),
+            "no_show_charges": len(charges),
+            "no_show_charge_total": from_cents(sum(to_cents(c["amount"]) for c in charges)),
+        }
+
+    @staticmethod
+    def create_missing_invoices(db: Session) -> dict:
+        """Invoice every CHECKED_OUT booking with a final bill and no invoice yet."""
+        missing = db.execute(
+            select(models.Booking.id, models.Booking.final_bill).where(
+                models.Booking.status == models.BookingStatus.CHECKED_OUT.value,
+                models.Booking.final_bill.is_not(None),
+                ~select(models.Invoice.id).where(models.Invoice.booking_id == models.Booking.id).exists(),
+            )
+        ).all()
+
+        invoices = []
+        if missing:
+            # Numbers are random per day; skip ones already taken so a rare
+            # collision cannot abort the whole batch on the unique constraint.
+            prefix = InvoiceService.new_invoice_number().rsplit("-", 1)[0] + "-"
+            taken = set(db.scalars(
+                select(models.Invoice.invoice_number).where(models.Invoice.invoice_number.like(prefix + "%"))
+            ))
+            for booking_id, final_bill in missing:
+                invoice_number = InvoiceService.new_invoice_number()
+                while invoice_number in taken:
+                    invoice_number = InvoiceService.new_invoice_number()
+                taken.add(invoice_number)
+                subtotal, tax, total = InvoiceService.invoice_amounts(final_bill)
+                invoices.append({
+                    "booking_id": booking_id,
+                    "invoice_number": invoice_number,
+                    "subtotal": subtotal,
+                    "tax": tax,
+                    "total": total,
+                })
+            db.execute(insert(models.Invoice), invoices)
+        db.commit()
+
+        return {
+            "invoices_created": len(invoices),
+            "invoice_total": from_cents(sum(to_cents(i["total"]) for i in invoices)),
+        }
+
+    @staticmethod
+    def run(db: Session, business_date: Optional[date] = None, user: Optional[models.User] = None) -> dict:
+        """Run every stage for ``business_date`` (default today) and record a summary."""
+        business_date = business_date or date.today()
+        started = time.perf_counter()
+
+        summary = {"business_date": business_date}
+        summary.update(NightAuditService.mark_no_shows(db, business_date))
+        summary.update(NightAuditService.create_missing_invoices(db))
+        summary["duration_ms"] = round((time.perf_counter() - started) * 1000, 1)
+
+        log_audit(
+            db=db,
+            user=user,
+            action="NIGHT_AUDIT",
+            entity_type="night_audit",
+            description=(
+                f"Night audit for {business_date}: {summary['no_shows']} no-shows, "
+                f"{summary['invoices_created']} invoices created"
+            ),
+            new_values={
+                key: str(value) if isinstance(value, (date, Decimal)) else value
+                for key, value in summary.items()
+            },
+        )
+        return summary
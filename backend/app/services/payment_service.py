@@ -4,10 +4,15 @@ from typing import Optional, List
 
 from fastapi import HTTPException
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import func, select
 
 from ..db import models
-from ..utils.pagination import paginate, apply_sorting
+from ..schemas.payment import PaymentResponse
+from ..utils.pagination import paginate_projection, apply_sorting
+from ..utils.projection import Projection
+from ..utils.money import to_cents
+
+PAYMENT_LIST = Projection(PaymentResponse, models.Payment)
 
 
 class PaymentService:
@@ -56,15 +61,16 @@ class PaymentService:
             models.Payment.status == models.Payment.PaymentStatus.PAID.value,
         )
         paid_sum = paid_sum_q.scalar() or 0
+        # Compare in integer cents (SQLite returns SUM of NUMERIC as float)
         try:
-            paid_sum = Decimal(paid_sum)
+            paid_cents = to_cents(paid_sum)
         except Exception:
-            paid_sum = Decimal(str(paid_sum))
+            paid_cents = to_cents(str(paid_sum))
 
         if booking.final_bill is None:
             raise HTTPException(status_code=400, detail="Booking final bill not set")
 
-        if (paid_sum + Decimal(payment.amount)) > Decimal(booking.final_bill):
+        if paid_cents + to_cents(payment.amount) > to_cents(booking.final_bill):
             raise HTTPException(status_code=400, detail="Processing this payment would exceed the booking final bill")
 
         payment.status = models.Payment.PaymentStatus.PAID.value
@@ -117,18 +123,16 @@ class PaymentService:
         - ADMIN/MANAGER: see all payments
         - REGULAR: see payments only for bookings they created (booking.created_by == current_user.id)
         """
-        if current_user.permission_level in (models.PermissionLevel.ADMIN, models.PermissionLevel.MANAGER):
-            # Admin/Manager can see all payments
-            query = db.query(models.Payment)
-        else:
+        query = select(*PAYMENT_LIST.columns)
+        if current_user.permission_level not in (models.PermissionLevel.ADMIN, models.PermissionLevel.MANAGER):
             # REGULAR users only see payments for bookings they created
-            query = db.query(models.Payment).join(
+            query = query.join(
                 models.Booking, models.Payment.booking_id == models.Booking.id
-            ).filter(models.Booking.created_by == current_user.id)
+            ).where(models.Booking.created_by == current_user.id)
         
         # Apply filters
         if status:
-            query = query.filter(models.Payment.status == status)
+            query = query.where(models.Payment.status == status)
         
         # Apply sorting (default to created_at desc)
         if not sort_by:
@@ -136,4 +140,4 @@ class PaymentService:
         query = apply_sorting(query, models.Payment, sort_by, sort_order)
         
         # Apply pagination
-        return paginate(query, page, page_size)
+        return paginate_projection(db, query, PAYMENT_LIST, page, page_size)
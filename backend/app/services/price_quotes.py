@@ -0,0 +1,93 @@
+"""
+Signed, self-contained price quotes that bookings can redeem.
+
+``calculate_price`` hands out a quote id carrying everything the price was
+computed for (room type, dates, loyalty tier, optionally the guest), the
+nightly price in cents and an expiry time, followed by an HMAC signature made
+with the application secret. Any worker can verify a quote without shared
+state, and ids cannot be forged or altered.
+
+Quotes are single-use: a booking stores the quote's nonce in the unique
+``bookings.price_quote_nonce`` column, so a second redemption fails inside the
+booking's own transaction.
+"""
+import base64
+import binascii
+import hashlib
+import hmac
+import json
+import secrets
+import time
+from dataclasses import dataclass
+from datetime import date, datetime, timezone
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Optional
+
+from ..core.config import settings
+from ..utils.money import from_cents, to_cents
+
+_VERSION = 1
+
+
+@dataclass(frozen=True)
+class PriceQuote:
+    """A quoted stay and the nightly price locked in for it."""
+    nonce: str
+    room_type_id: int
+    check_in: date
+    check_out: date
+    loyalty_tier: int
+    guest_id: Optional[int]
+    price_per_night: Decimal
+    expires_at: datetime
+
+
+def _sign(payload: str) -> str:
+    digest = hmac.new(settings.JWT_SECRET.encode(), payload.encode(), hashlib.sha256).hexdigest()
+    return digest[:32]
+
+
+def issue(
+    room_type_id: int,
+    check_in: date,
+    check_out: date,
+    loyalty_tier: int,
+    guest_id: Optional[int],
+    price_per_night: Decimal,
+) -> tuple[str, datetime]:
+    """
+    Return a signed quote id and its expiry time (UTC).
+
+    The nightly price is rounded half-up to cents, as a booking stores it.
+    """
+    expires_at = int(time.time()) + settings.PRICE_QUOTE_TTL_SECONDS
+    fields = [
+        _VERSION, room_type_id, check_in.isoformat(), check_out.isoformat(), loyalty_tier, guest_id,
+        to_cents(price_per_night, ROUND_HALF_UP), expires_at, secrets.token_urlsafe(9),
+    ]
+    payload = base64.urlsafe_b64encode(json.dumps(fields, separators=(",", ":")).encode()).decode().rstrip("=")
+    return f"{payload}.{_sign(payload)}", datetime.fromtimestamp(expires_at, timezone.utc)
+
+
+def verify(quote_id: str) -> Optional[PriceQuote]:
+    """Return the quote for a correctly signed, unexpired id, or None."""
+    payload, _, signature = quote_id.partition(".")
+    if not payload or not hmac.compare_digest(signature, _sign(payload)):
+        return None
+    try:
+        fields = json.loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))
+        version, room_type_id, check_in, check_out, tier, guest_id, cents, expires_at, nonce = fields
+    except (binascii.Error, ValueError, TypeError):
+        return None
+    if version != _VERSION or expires_at <= time.time():
+        return None
+    return PriceQuote(
+        nonce=nonce,
+        room_type_id=room_type_id,
+        check_in=date.fromisoformat(check_in),
+        check_out=date.fromisoformat(check_out),
+        loyalty_tier=tier,
+        guest_id=guest_id,
+        price_per_night=from_cents(cents),
+        expires_at=datetime.fromtimestamp(expires_at, timezone.utc),
+    )
@@ -0,0 +1,191 @@
+"""
+Overlap and conflict analysis for pricing rules.
+
+``calculate_price`` stacks every matching rule, so rules whose date ranges
+overlap silently compound. For each room type (its own rules plus global
+ones) this module reports:
+
+- overlapping rule pairs, found with an interval tree over the rules' date
+  ranges in O((n + k) log n) for n rules and k overlapping pairs
+- shadowed rules: a rule is shadowed by a higher-priority rule of the same
+  type that applies to every stay it applies to, so its adjustment always
+  stacks on top of the other one (usually an accidental double discount)
+- date segments with the rules active in each and their cumulative effect
+  on the room type's base price (ignoring stay-level conditions)
+"""
+from datetime import date
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from ..utils.money import ExactAmount, apply_adjustments
+from .pricing_engine import CompiledRule, CompiledRuleSet
+
+# Open-ended date ranges are mapped onto ordinals outside any real date
+OPEN_START = date.min.toordinal() - 1
+OPEN_END = date.max.toordinal() + 1
+
+Interval = Tuple[int, int, CompiledRule]
+
+
+def rule_interval(rule: CompiledRule) -> Interval:
+    """Closed [start, end] ordinal interval of a rule's date range."""
+    start = rule.start_date.toordinal() if rule.start_date else OPEN_START
+    end = rule.end_date.toordinal() if rule.end_date else OPEN_END
+    return start, end, rule
+
+
+class IntervalTree:
+    """
+    Static centered interval tree over closed integer intervals.
+
+    Each node keeps the intervals containing its center sorted by start and
+    by end, so an overlap query costs O(log n + m) for m results.
+    """
+
+    __slots__ = ("center", "by_start", "by_end", "left", "right")
+
+    def __init__(self, intervals: List[Interval]):
+        points = sorted({p for start, end, _ in intervals for p in (start, end)})
+        self.center = points[len(points) // 2] if points else 0
+        here, left, right = [], [], []
+        for interval in intervals:
+            if interval[1] < self.center:
+                left.append(interval)
+            elif interval[0] > self.center:
+                right.append(interval)
+            else:
+                here.append(interval)
+        self.by_start = sorted(here, key=lambda i: i[0])
+        self.by_end = sorted(here, key=lambda i: i[1], reverse=True)
+        self.left = IntervalTree(left) if left else None
+        self.right = IntervalTree(right) if right else None
+
+    def overlapping(self, lo: int, hi: int) -> Iterator[Interval]:
+        """Yield every interval that intersects [lo, hi]."""
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            if hi < node.center:
+                for interval in node.by_start:
+                    if interval[0] > hi:
+                        break
+                    yield interval
+                if node.left:
+                    stack.append(node.left)
+            elif lo > node.center:
+                for interval in node.by_end:
+                    if interval[1] < lo:
+                        break
+                    yield interval
+                if node.right:
+                    stack.append(node.right)
+            else:
+                yield from node.by_start
+                if node.left:
+                    stack.append(node.left)
+                if node.right:
+                    stack.append(node.right)
+
+
+def _to_date(ordinal: int) -> Optional[date]:
+    if ordinal <= OPEN_START or ordinal >= OPEN_END:
+        return None
+    return date.fromordinal(ordinal)
+
+
+def _always_applies_with(a: CompiledRule, b: CompiledRule) -> bool:
+    """True if every stay that matches rule b also matches rule a."""
+    if a.room_type_id is not None and a.room_type_id != b.room_type_id:
+        return False
+    if a.weekday_mask is not None and (b.weekday_mask is None or b.weekday_mask & ~a.weekday_mask):
+        return False
+    if (a.min_nights or 0) > (b.min_nights or 0):
+        return False
+    if (a.min_advance_days or 0) > (b.min_advance_days or 0):
+        return False
+    if a.max_advance_days and not (b.max_advance_days and b.max_advance_days <= a.max_advance_days):
+        return False
+    if (a.min_loyalty_tier or 0) > (b.min_loyalty_tier or 0):
+        return False
+    return True
+
+
+def analyze_rules(rules: List[CompiledRule], base_price: Decimal) -> Dict:
+    """Overlaps, shadowed rules and cumulative segments for one room type's rules."""
+    # Application order, as in CompiledRuleSet.rules
+    order = {rule.id: position for position, rule in enumerate(rules)}
+    intervals = [rule_interval(rule) for rule in rules]
+    tree = IntervalTree(intervals) if intervals else None
+
+    overlaps = []
+    shadowed = []
+    for start, end, rule in intervals:
+        shadowed_by = None
+        for other_start, other_end, other in tree.overlapping(start, end):
+            if other.id == rule.id:
+                continue
+            if rule.id < other.id:
+                overlaps.append({
+                    "rule_id": rule.id,
+                    "other_rule_id": other.id,
+                    "overlap_start": _to_date(max(start, other_start)),
+                    "overlap_end": _to_date(min(end, other_end)),
+                })
+            if (
+                shadowed_by is None
+                and order[other.id] < order[rule.id]
+                and other.rule_type == rule.rule_type
+                and other_start <= start
+                and other_end >= end
+                and _always_applies_with(other, rule)
+            ):
+                shadowed_by = other
+        if shadowed_by is not None:
+            shadowed.append({"rule_id": rule.id, "shadowed_by": shadowed_by.id})
+    overlaps.sort(key=lambda o: (o["rule_id"], o["other_rule_id"]))
+
+    # Sweep the interval boundaries; the active set is constant in between
+    events: Dict[int, List[Tuple[int, CompiledRule]]] = {}
+    for start, end, rule in intervals:
+        events.setdefault(start, []).append((1, rule))
+        events.setdefault(end + 1, []).append((-1, rule))
+    segments = []
+    active: Dict[int, CompiledRule] = {}
+    boundaries = sorted(events)
+    for index, point in enumerate(boundaries):
+        for delta, rule in events[point]:
+            if delta > 0:
+                active[rule.id] = rule
+            else:
+                active.pop(rule.id, None)
+        if not active or index + 1 == len(boundaries):
+            continue
+        stacked = sorted(active.values(), key=lambda r: order[r.id])
+        adjusted, _ = apply_adjustments(ExactAmount.from_decimal(base_price), [r.adjustment for r in stacked])
+        price = adjusted.to_decimal()
+        change = (price - base_price) / base_price * 100 if base_price else Decimal("0")
+        segments.append({
+            "start_date": _to_date(point),
+            "end_date": _to_date(boundaries[index + 1] - 1),
+            "rule_ids": [r.id for r in stacked],
+            "effective_price": price.quantize(Decimal("0.01"), rounding=ROUND_HALF_UP),
+            "effective_change_percent": change.quantize(Decimal("0.01")),
+        })
+
+    return {"overlaps": overlaps, "shadowed": shadowed, "segments": segments}
+
+
+def analyze_rule_set(rule_set: CompiledRuleSet) -> List[Dict]:
+    """Per-room-type analysis of all active rules (global rules count for every room type)."""
+    results = []
+    for room_type_id in sorted(rule_set.base_prices):
+        rules = [r for r in rule_set.rules if r.room_type_id is None or r.room_type_id == room_type_id]
+        analysis = analyze_rules(rules, rule_set.base_prices[room_type_id])
+        analysis.update({
+            "room_type_id": room_type_id,
+            "room_type_name": rule_set.room_type_names[room_type_id],
+            "base_price": rule_set.base_prices[room_type_id],
+            "rule_count": len(rules),
+        })
+        results.append(analysis)
+    return results
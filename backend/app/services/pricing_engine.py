@@ -0,0 +1,503 @@
+"""
+Compiled, in-memory pricing rule set.
+
+Active pricing rules and room type base prices are loaded once per process and
+compiled into a structure that answers "which rules apply to this stay?"
+without touching the database:
+
+- ``applicable_days`` JSON is parsed once into a weekday bitmask
+- rules are pre-sorted by priority (highest first)
+- rules are bucketed by room type and by date interval, so a quote only
+  bisects into the segment containing its check-in date
+- rules are also laid out column-wise as NumPy arrays (``RuleArrays``) so whole
+  grids of stays (room types x dates) can be priced in one vectorized pass
+
+The compiled set is rebuilt when the pricing_rules/room_types change counters
+move (see ``db.change_tracker``) or after ``PRICING_RULE_CACHE_TTL`` seconds, so
+other workers pick up changes without a database round trip per quote.
+"""
+import json
+import threading
+import time
+from bisect import bisect_right
+from collections import OrderedDict
+from datetime import date, timedelta
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Dict, List, Optional, Union
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from ..core import metrics
+from ..core.config import settings
+from ..db import change_tracker
+from ..db.models import PricingRule, RoomType
+from ..utils.money import Adjustment, ExactAmount, apply_adjustments, to_cents
+
+ALL_WEEKDAYS = 0b1111111
+
+TRACKED_TABLES = (PricingRule.__tablename__, RoomType.__tablename__)
+
+
+def parse_weekday_mask(applicable_days: Optional[str]) -> Optional[int]:
+    """
+    Convert an ``applicable_days`` JSON string (e.g. "[4, 5]") into a weekday bitmask.
+
+    Returns None when the rule has no weekday restriction (missing or invalid JSON).
+    An empty list yields 0, i.e. the rule never matches.
+    """
+    if not applicable_days:
+        return None
+    try:
+        days = json.loads(applicable_days)
+    except (json.JSONDecodeError, TypeError):
+        return None
+    if not isinstance(days, list):
+        return None
+    mask = 0
+    for day in days:
+        if isinstance(day, int) and not isinstance(day, bool) and 0 <= day <= 6:
+            mask |= 1 << day
+    return mask
+
+
+def stay_weekday_mask(check_in: date, total_nights: int) -> int:
+    """Bitmask of the weekdays covered by the nights of a stay."""
+    if total_nights >= 7:
+        return ALL_WEEKDAYS
+    nights = ((1 << total_nights) - 1) << check_in.weekday()
+    return (nights | (nights >> 7)) & ALL_WEEKDAYS
+
+
+class CompiledRule:
+    """Immutable snapshot of a pricing rule, ready for evaluation."""
+
+    __slots__ = (
+        "id", "name", "rule_type", "priority", "adjustment_type", "adjustment_value", "adjustment",
+        "room_type_id", "start_date", "end_date", "weekday_mask",
+        "min_nights", "min_advance_days", "max_advance_days", "min_loyalty_tier",
+    )
+
+    def __init__(self, rule: PricingRule):
+        self.id = rule.id
+        self.name = rule.name
+        self.rule_type = rule.rule_type
+        self.priority = rule.priority or 0
+        self.adjustment_type = rule.adjustment_type
+        self.adjustment_value = Decimal(rule.adjustment_value)
+        self.adjustment = Adjustment(self.adjustment_type, self.adjustment_value)
+        self.room_type_id = rule.room_type_id
+        self.start_date = rule.start_date
+        self.end_date = rule.end_date
+        self.weekday_mask = parse_weekday_mask(rule.applicable_days)
+        self.min_nights = rule.min_nights
+        self.min_advance_days = rule.min_advance_days
+        self.max_advance_days = rule.max_advance_days
+        self.min_loyalty_tier = rule.min_loyalty_tier
+
+    def covers(self, day: date) -> bool:
+        """True if the rule's date range includes the given check-in date."""
+        if self.start_date is not None and day < self.start_date:
+            return False
+        if self.end_date is not None and day > self.end_date:
+            return False
+        return True
+
+    def matches(self, total_nights: int, days_until_checkin: int, loyalty_tier: int, stay_mask: int) -> bool:
+        """Check the stay-level conditions (everything except room type and dates)."""
+        if self.min_nights and total_nights < self.min_nights:
+            return False
+        if self.min_advance_days and days_until_checkin < self.min_advance_days:
+            return False
+        if self.max_advance_days and days_until_checkin > self.max_advance_days:
+            return False
+        if self.min_loyalty_tier and loyalty_tier < self.min_loyalty_tier:
+            return False
+        if self.weekday_mask is not None and not (self.weekday_mask & stay_mask):
+            return False
+        return True
+
+
+class _DateBuckets:
+    """Rules of one room type split into date segments with a constant candidate list."""
+
+    __slots__ = ("boundaries", "segments")
+
+    def __init__(self, rules: List[CompiledRule]):
+        points = set()
+        for rule in rules:
+            if rule.start_date is not None:
+                points.add(rule.start_date)
+            if rule.end_date is not None:
+                points.add(rule.end_date + timedelta(days=1))
+        self.boundaries = sorted(points)
+
+        # Segment i covers [boundaries[i-1], boundaries[i]); segment 0 is open to the left.
+        representatives = [None] + self.boundaries
+        self.segments = []
+        for start in representatives:
+            if start is None:
+                active = [r for r in rules if r.start_date is None]
+            else:
+                active = [r for r in rules if r.covers(start)]
+            self.segments.append(active)
+
+    def candidates(self, day: date) -> List[CompiledRule]:
+        return self.segments[bisect_right(self.boundaries, day)]
+
+
+class RuleArrays:
+    """
+    Column-wise view of compiled rules for vectorized evaluation.
+
+    Each attribute is a 1-D array with one entry per rule, in application
+    (priority) order. Missing constraints are encoded so they never filter:
+    open date bounds become the int64 extremes, no weekday restriction becomes
+    all seven bits, and 0 means "no minimum/maximum" exactly like the falsy
+    checks in ``CompiledRule.matches``.
+    """
+
+    NO_ROOM_TYPE = -1
+
+    def __init__(self, rules: List[CompiledRule]):
+        lo, hi = np.iinfo(np.int64).min, np.iinfo(np.int64).max
+        self.count = len(rules)
+        self.room_type_id = np.array(
+            [r.room_type_id if r.room_type_id is not None else self.NO_ROOM_TYPE for r in rules], dtype=np.int64
+        )
+        self.start = np.array([r.start_date.toordinal() if r.start_date else lo for r in rules], dtype=np.int64)
+        self.end = np.array([r.end_date.toordinal() if r.end_date else hi for r in rules], dtype=np.int64)
+        self.weekday_mask = np.array(
+            [ALL_WEEKDAYS if r.weekday_mask is None else r.weekday_mask for r in rules], dtype=np.int64
+        )
+        self.min_nights = np.array([r.min_nights or 0 for r in rules], dtype=np.int64)
+        self.min_advance_days = np.array([r.min_advance_days or 0 for r in rules], dtype=np.int64)
+        self.max_advance_days = np.array([r.max_advance_days or 0 for r in rules], dtype=np.int64)
+        self.min_loyalty_tier = np.array([r.min_loyalty_tier or 0 for r in rules], dtype=np.int64)
+        self.is_percentage = np.array([r.adjustment_type == "percentage" for r in rules], dtype=bool)
+        self.adjustment_value = np.array([float(r.adjustment_value) for r in rules], dtype=np.float64)
+
+    def evaluate(
+        self,
+        base_price: np.ndarray,
+        room_type_id: np.ndarray,
+        check_in: np.ndarray,
+        total_nights: np.ndarray,
+        loyalty_tier: Union[int, np.ndarray],
+        today: Union[date, np.ndarray],
+        attribution: Optional["RuleAttribution"] = None,
+    ) -> np.ndarray:
+        """
+        Adjusted nightly price for every stay in a grid.
+
+        ``check_in`` holds date ordinals; all array arguments broadcast against
+        each other (e.g. room types as a column, dates as a row). ``today`` is
+        the quote date, or an array of per-stay booking date ordinals when
+        replaying history. Rules are applied in priority order with the same
+        arithmetic as a single quote; ``attribution`` optionally collects what
+        each rule contributed.
+        """
+        shape = np.broadcast_shapes(base_price.shape, room_type_id.shape, check_in.shape, total_nights.shape)
+        price = np.broadcast_to(base_price, shape).astype(np.float64)
+        for i, applies in enumerate(self._rule_masks(shape, room_type_id, check_in, total_nights, loyalty_tier, today)):
+            if not applies.any():
+                continue
+
+            if self.is_percentage[i]:
+                adjusted = price + price * (self.adjustment_value[i] / 100)
+            else:
+                adjusted = price + self.adjustment_value[i]
+            adjusted = np.where(applies, np.maximum(adjusted, 0.0), price)
+            if attribution is not None:
+                attribution.record(i, applies, adjusted - price)
+            price = adjusted
+        return price
+
+
+    def applicability(
+        self,
+        room_type_id: np.ndarray,
+        check_in: np.ndarray,
+        total_nights: np.ndarray,
+        loyalty_tier: Union[int, np.ndarray],
+        today: Union[date, np.ndarray],
+    ) -> np.ndarray:
+        """
+        Which rules apply to every stay in a grid, as a boolean array of the
+        broadcast grid shape plus one trailing axis per rule (same arguments
+        and conditions as ``evaluate``).
+        """
+        shape = np.broadcast_shapes(room_type_id.shape, check_in.shape, total_nights.shape)
+        masks = list(self._rule_masks(shape, room_type_id, check_in, total_nights, loyalty_tier, today))
+        if not masks:
+            return np.zeros(shape + (0,), dtype=bool)
+        return np.stack(masks, axis=-1)
+
+    def _rule_masks(self, shape, room_type_id, check_in, total_nights, loyalty_tier, today):
+        """Yield, per rule in application order, where it applies within a grid of ``shape``."""
+        today_ordinal = today.toordinal() if isinstance(today, date) else today
+        days_until = check_in - today_ordinal
+        # date.weekday() == (ordinal + 6) % 7
+        nights = np.minimum(total_nights, 7)
+        stay_bits = ((1 << nights) - 1) << ((check_in + 6) % 7)
+        stay_mask = (stay_bits | (stay_bits >> 7)) & ALL_WEEKDAYS
+
+        for i in range(self.count):
+            applies = (check_in >= self.start[i]) & (check_in <= self.end[i])
+            if self.min_loyalty_tier[i]:
+                applies = applies & (loyalty_tier >= self.min_loyalty_tier[i])
+            if self.room_type_id[i] != self.NO_ROOM_TYPE:
+                applies = applies & (room_type_id == self.room_type_id[i])
+            if self.min_nights[i]:
+                applies = applies & (total_nights >= self.min_nights[i])
+            if self.min_advance_days[i]:
+                applies = applies & (days_until >= self.min_advance_days[i])
+            if self.max_advance_days[i]:
+                applies = applies & (days_until <= self.max_advance_days[i])
+            if self.weekday_mask[i] != ALL_WEEKDAYS:
+                applies = applies & ((stay_mask & self.weekday_mask[i]) != 0)
+            yield np.broadcast_to(applies, shape)
+
+
+class RuleAttribution:
+    """Per-rule totals collected while evaluating a set of stays."""
+
+    def __init__(self, rule_count: int, weights: np.ndarray):
+        self.weights = weights  # e.g. nights per stay, so uplift is in stay revenue
+        self.stays = np.zeros(rule_count, dtype=np.int64)
+        self.weighted_stays = np.zeros(rule_count, dtype=np.int64)
+        self.uplift = np.zeros(rule_count, dtype=np.float64)
+
+    def record(self, index: int, applies: np.ndarray, delta: np.ndarray) -> None:
+        self.stays[index] += int(np.count_nonzero(applies))
+        self.weighted_stays[index] += int(self.weights[applies].sum())
+        self.uplift[index] += float((delta * self.weights).sum())
+
+
+class CompiledRuleSet:
+    """All active pricing rules plus room type base prices, compiled for fast quoting."""
+
+    # Derived results (rate calendars, LOS matrices, analyses) memoized per rule set
+    DERIVED_CACHE_SIZE = 64
+
+    def __init__(self, rules: List[PricingRule], room_types: List[RoomType], version: tuple):
+        self.version = version
+        self.loaded_at = time.monotonic()
+        self.base_prices: Dict[int, Decimal] = {rt.id: Decimal(rt.base_price) for rt in room_types}
+        self.room_type_names: Dict[int, str] = {rt.id: rt.name for rt in room_types}
+
+        compiled = [CompiledRule(r) for r in rules]
+        # Highest priority first; ties keep creation order
+        compiled.sort(key=lambda r: (-r.priority, r.id))
+        self.rules = compiled
+
+        global_rules = [r for r in compiled if r.room_type_id is None]
+        self._global_buckets = _DateBuckets(global_rules)
+        self._buckets: Dict[int, _DateBuckets] = {}
+        room_type_ids = set(self.base_prices) | {r.room_type_id for r in compiled if r.room_type_id is not None}
+        for room_type_id in room_type_ids:
+            # Sorted merge keeps the bucket lists in priority order
+            bucket_rules = [r for r in compiled if r.room_type_id is None or r.room_type_id == room_type_id]
+            self._buckets[room_type_id] = _DateBuckets(bucket_rules)
+
+        self.arrays = RuleArrays(compiled)
+        # Derived results live on the rule set, so a reload discards them
+        self._derived_cache: "OrderedDict[tuple, object]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+
+    def candidate_rules(self, room_type_id: int, check_in: date) -> List[CompiledRule]:
+        """Rules whose room type and date range match, in priority order."""
+        buckets = self._buckets.get(room_type_id, self._global_buckets)
+        return buckets.candidates(check_in)
+
+    def applicable_rules(
+        self,
+        room_type_id: int,
+        check_in: date,
+        total_nights: int,
+        loyalty_tier: int,
+        today: Optional[date] = None,
+    ) -> List[CompiledRule]:
+        """Rules that apply to the given stay, in the order they must be applied."""
+        days_until_checkin = (check_in - (today or date.today())).days
+        stay_mask = stay_weekday_mask(check_in, total_nights)
+        return [
+            rule for rule in self.candidate_rules(room_type_id, check_in)
+            if rule.matches(total_nights, days_until_checkin, loyalty_tier, stay_mask)
+        ]
+
+
+    def memoized(self, key: tuple, compute):
+        """Return a cached derived result for this rule set, computing it on a miss."""
+        with self._cache_lock:
+            cached = self._derived_cache.get(key)
+            if cached is not None:
+                self._derived_cache.move_to_end(key)
+                metrics.record_cache("pricing_derived", hit=True)
+                return cached
+        metrics.record_cache("pricing_derived", hit=False)
+
+        result = compute()
+
+        with self._cache_lock:
+            self._derived_cache[key] = result
+            while len(self._derived_cache) > self.DERIVED_CACHE_SIZE:
+                self._derived_cache.popitem(last=False)
+        return result
+
+    def _exact_grid(
+        self,
+        room_type_ids: List[int],
+        check_in: np.ndarray,
+        total_nights: np.ndarray,
+        loyalty_tier: int,
+        today: date,
+        nights_multiplier: Optional[np.ndarray] = None,
+    ) -> np.ndarray:
+        """
+        Prices for a grid of stays (room types on the first axis), in cents
+        rounded half-up, as a float array of currency units.
+
+        The vectorized pass only decides which rules apply to each cell. Each
+        distinct room type and rule combination is then priced once with
+        ``apply_adjustments``, the exact arithmetic ``calculate_price`` uses, so
+        no cell drifts by a cent. The nightly price is multiplied by
+        ``nights_multiplier`` before rounding, if given.
+        """
+        extra_dims = (1,) * (max(check_in.ndim, total_nights.ndim) - 1)
+        room_types = np.array(room_type_ids, dtype=np.int64).reshape((-1,) + extra_dims)
+        applies = self.arrays.applicability(room_types, check_in, total_nights, loyalty_tier, today)
+        shape = applies.shape[:-1]
+
+        cells = int(np.prod(shape))
+        flags = applies.reshape(cells, len(self.rules))
+        room_index = np.broadcast_to(np.arange(len(room_type_ids)).reshape(room_types.shape), shape).reshape(cells)
+        multiplier = np.broadcast_to(
+            nights_multiplier if nights_multiplier is not None else np.ones(1, dtype=np.int64), shape
+        ).reshape(cells)
+        # One fixed-width byte string per cell (room type, multiplier, packed rule flags),
+        # so np.unique sorts short opaque keys instead of rows of int64 columns.
+        rows = np.ascontiguousarray(np.concatenate([
+            room_index.astype(np.int64)[:, np.newaxis].view(np.uint8),
+            multiplier.astype(np.int64)[:, np.newaxis].view(np.uint8),
+            np.packbits(flags, axis=1),
+        ], axis=1))
+        _, first, inverse = np.unique(
+            rows.view(np.dtype((np.void, rows.shape[1]))).reshape(cells), return_index=True, return_inverse=True
+        )
+
+        prices = np.empty(len(first), dtype=np.float64)
+        nightly = {}
+        for k, cell in enumerate(first.tolist()):
+            rule_flags = flags[cell]
+            combination = (int(room_index[cell]), rule_flags.tobytes())
+            amount = nightly.get(combination)
+            if amount is None:
+                adjustments = [self.rules[i].adjustment for i in np.flatnonzero(rule_flags).tolist()]
+                base = ExactAmount.from_decimal(self.base_prices[room_type_ids[combination[0]]])
+                amount = nightly[combination] = apply_adjustments(base, adjustments)[0]
+            prices[k] = to_cents((amount * int(multiplier[cell])).to_decimal(), ROUND_HALF_UP) / 100
+        return prices[inverse.reshape(-1)].reshape(shape)
+
+    def rate_calendar(
+        self,
+        start_date: date,
+        days: int,
+        loyalty_tier: int,
+        room_type_ids: List[int],
+        today: Optional[date] = None,
+    ) -> Dict[int, List[float]]:
+        """
+        Nightly rate per room type for each date in [start_date, start_date + days).
+
+        The rate for a date is the adjusted price of a one-night stay arriving
+        that day, rounded half-up to cents exactly as a booking stores it.
+        Results are memoized on the rule set, so they are recomputed only after
+        rules or room types change (or the day rolls over).
+        """
+        today = today or date.today()
+
+        def compute():
+            dates = np.arange(start_date.toordinal(), start_date.toordinal() + days, dtype=np.int64)
+            prices = self._exact_grid(
+                room_type_ids, dates[np.newaxis, :], np.ones(1, dtype=np.int64), loyalty_tier, today,
+            )
+            return dict(zip(room_type_ids, prices.tolist()))
+
+        key = ("calendar", today, start_date, days, loyalty_tier, tuple(room_type_ids))
+        return self.memoized(key, compute)
+
+    def los_matrix(
+        self,
+        start_date: date,
+        days: int,
+        max_nights: int,
+        loyalty_tier: int,
+        room_type_ids: List[int],
+        today: Optional[date] = None,
+    ) -> Dict[int, List[List[float]]]:
+        """
+        Total stay price per room type for every arrival date x length of stay.
+
+        ``matrix[i][n - 1]`` is the total for arriving ``start_date + i`` days and
+        staying ``n`` nights: the exact ``calculate_price`` total for that stay,
+        rounded half-up to cents. Rule conditions that depend on the stay length
+        (``min_nights``, nights falling on ``applicable_days``) are evaluated per
+        cell in the same vectorized pass; memoized on the rule set like the rate
+        calendar.
+        """
+        today = today or date.today()
+
+        def compute():
+            arrivals = np.arange(start_date.toordinal(), start_date.toordinal() + days, dtype=np.int64)
+            nights = np.arange(1, max_nights + 1, dtype=np.int64)
+            # Grid axes: room type x arrival date x length of stay
+            totals = self._exact_grid(
+                room_type_ids,
+                arrivals[np.newaxis, :, np.newaxis],
+                nights[np.newaxis, np.newaxis, :],
+                loyalty_tier,
+                today,
+                nights_multiplier=nights[np.newaxis, np.newaxis, :],
+            )
+            return dict(zip(room_type_ids, totals.tolist()))
+
+        key = ("los", today, start_date, days, max_nights, loyalty_tier, tuple(room_type_ids))
+        return self.memoized(key, compute)
+
+
+_rule_set: Optional[CompiledRuleSet] = None
+_compile_lock = threading.Lock()
+
+
+def _is_fresh(rule_set: Optional[CompiledRuleSet], version: tuple) -> bool:
+    if rule_set is None or rule_set.version != version:
+        return False
+    return time.monotonic() - rule_set.loaded_at < settings.PRICING_RULE_CACHE_TTL
+
+
+def get_rule_set(db: Session) -> CompiledRuleSet:
+    """Return the compiled rule set, reloading it only if rules or room types changed."""
+    global _rule_set
+    version = change_tracker.table_version(*TRACKED_TABLES)
+    rule_set = _rule_set
+    if _is_fresh(rule_set, version):
+        metrics.record_cache("pricing_rule_set", hit=True)
+        return rule_set
+
+    with _compile_lock:
+        version = change_tracker.table_version(*TRACKED_TABLES)
+        if _is_fresh(_rule_set, version):
+            metrics.record_cache("pricing_rule_set", hit=True)
+            return _rule_set
+        metrics.record_cache("pricing_rule_set", hit=False)
+        rules = db.query(PricingRule).filter(PricingRule.is_active == True).all()
+        room_types = db.query(RoomType).all()
+        _rule_set = CompiledRuleSet(rules, room_types, version)
+        return _rule_set
+
+
+def invalidate() -> None:
+    """Drop the compiled rule set so the next quote reloads it."""
+    global _rule_set
+    _rule_set = None
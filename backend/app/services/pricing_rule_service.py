@@ -2,19 +2,33 @@
 Service layer for Pricing Rules
 """
 from typing import List, Optional
-from datetime import date, timedelta
+from datetime import date
 from decimal import Decimal
-import json
 
+import numpy as np
+from sqlalchemy import select
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
 
-from ..db.models import PricingRule, RoomType
+from ..db.models import Booking, BookingStatus, Guest, PricingRule, Room, RoomType
+from ..utils.money import ExactAmount, apply_adjustments
+from . import pricing_analysis, pricing_engine, price_quotes
+from .pricing_engine import CompiledRule, CompiledRuleSet, RuleArrays, RuleAttribution
 from ..schemas.pricing_rule import (
     PricingRuleCreate,
     PricingRuleUpdate,
     PriceCalculationRequest,
     PriceCalculationResponse,
+    BatchPriceQuoteRequest,
+    BatchPriceQuoteResult,
+    BatchPriceQuoteResponse,
+    RoomTypeRateCalendar,
+    RateCalendarResponse,
+    RoomTypeLOSMatrix,
+    LOSMatrixResponse,
+    PricingSimulationRequest,
+    SimulatedRuleResult,
+    PricingSimulationResponse,
+    RuleAnalysisResponse,
 )
 
 
@@ -114,57 +128,330 @@ class PricingRuleService:
         
         Rules are applied in order of priority (highest first).
         Multiple rules can be applied cumulatively.
+        
+        Quotes priced from the room type's own base price carry a short-lived
+        quote_id that booking creation accepts to lock in the nightly price.
+        With ``guest_id`` the quote is priced at, and bound to, that guest's
+        VIP tier.
         """
+        rule_set = pricing_engine.get_rule_set(db)
+
+        loyalty_tier = calc_request.guest_loyalty_tier
+        if calc_request.guest_id is not None:
+            guest = db.get(Guest, calc_request.guest_id)
+            if not guest:
+                raise ValueError(f"Guest {calc_request.guest_id} not found")
+            loyalty_tier = guest.vip_tier or 0
+
         # Get base price
         if calc_request.base_price:
             base_price = calc_request.base_price
         else:
-            room_type = db.query(RoomType).filter(RoomType.id == calc_request.room_type_id).first()
-            if not room_type:
-                raise ValueError(f"Room type {calc_request.room_type_id} not found")
-            base_price = room_type.base_price
+            base_price = rule_set.base_prices.get(calc_request.room_type_id)
+            if base_price is None:
+                # Room type created by another worker since the last reload
+                room_type = db.query(RoomType).filter(RoomType.id == calc_request.room_type_id).first()
+                if not room_type:
+                    raise ValueError(f"Room type {calc_request.room_type_id} not found")
+                base_price = room_type.base_price
         
+        result = PricingRuleService._quote(
+            rule_set,
+            base_price=base_price,
+            room_type_id=calc_request.room_type_id,
+            check_in=calc_request.check_in,
+            check_out=calc_request.check_out,
+            loyalty_tier=loyalty_tier,
+        )
+
+        # A caller-supplied base price is a what-if, not a bookable price
+        if not calc_request.base_price:
+            result.quote_id, result.quote_expires_at = price_quotes.issue(
+                room_type_id=calc_request.room_type_id,
+                check_in=calc_request.check_in,
+                check_out=calc_request.check_out,
+                loyalty_tier=loyalty_tier,
+                guest_id=calc_request.guest_id,
+                price_per_night=result.adjusted_price_per_night,
+            )
+        return result
+
+    @staticmethod
+    def calculate_prices_batch(
+        db: Session,
+        batch_request: BatchPriceQuoteRequest,
+    ) -> BatchPriceQuoteResponse:
+        """
+        Price many (room type, stay, loyalty tier) combinations in one pass
+        
+        Room types and rules are resolved once for the whole batch; results are
+        returned in request order, with per-item errors instead of failing the batch.
+        """
+        rule_set = pricing_engine.get_rule_set(db)
+        base_prices = dict(rule_set.base_prices)
+
+        # Resolve room types missing from the compiled set with a single query
+        missing = {q.room_type_id for q in batch_request.quotes} - base_prices.keys()
+        if missing:
+            for room_type in db.query(RoomType).filter(RoomType.id.in_(missing)).all():
+                base_prices[room_type.id] = room_type.base_price
+
+        results = []
+        for item in batch_request.quotes:
+            result = BatchPriceQuoteResult(**item.model_dump())
+            base_price = base_prices.get(item.room_type_id)
+            if base_price is None:
+                result.error = f"Room type {item.room_type_id} not found"
+            else:
+                try:
+                    result.quote = PricingRuleService._quote(
+                        rule_set,
+                        base_price=base_price,
+                        room_type_id=item.room_type_id,
+                        check_in=item.check_in,
+                        check_out=item.check_out,
+                        loyalty_tier=item.guest_loyalty_tier,
+                    )
+                except ValueError as e:
+                    result.error = str(e)
+            results.append(result)
+
+        return BatchPriceQuoteResponse(results=results)
+
+    @staticmethod
+    def rate_calendar(
+        db: Session,
+        start_date: date,
+        days: int,
+        guest_loyalty_tier: int = 0,
+        room_type_id: Optional[int] = None,
+    ) -> RateCalendarResponse:
+        """
+        Nightly rates for every room type (or one) over a date horizon
+        
+        Each rate is the adjusted price of a one-night stay arriving that day.
+        The whole dates x rules grid is evaluated in one vectorized pass and
+        cached on the compiled rule set until rules or room types change.
+        """
+        rule_set = pricing_engine.get_rule_set(db)
+        room_type_ids = PricingRuleService._grid_room_types(rule_set, room_type_id)
+
+        calendar = rule_set.rate_calendar(
+            start_date=start_date,
+            days=days,
+            loyalty_tier=guest_loyalty_tier,
+            room_type_ids=room_type_ids,
+        )
+        return RateCalendarResponse(
+            start_date=start_date,
+            days=days,
+            guest_loyalty_tier=guest_loyalty_tier,
+            room_types=[
+                RoomTypeRateCalendar(
+                    room_type_id=rt,
+                    room_type_name=rule_set.room_type_names[rt],
+                    base_price=rule_set.base_prices[rt],
+                    rates=calendar[rt],
+                )
+                for rt in room_type_ids
+            ],
+        )
+
+    @staticmethod
+    def los_matrix(
+        db: Session,
+        start_date: date,
+        days: int,
+        max_nights: int,
+        guest_loyalty_tier: int = 0,
+        room_type_id: Optional[int] = None,
+    ) -> LOSMatrixResponse:
+        """
+        Total stay price for every arrival date x length of stay, per room type
+        
+        Equivalent to calling calculate_price for each (arrival, nights) cell,
+        but evaluated as one vectorized grid and cached per rule-set version.
+        """
+        rule_set = pricing_engine.get_rule_set(db)
+        room_type_ids = PricingRuleService._grid_room_types(rule_set, room_type_id)
+
+        matrix = rule_set.los_matrix(
+            start_date=start_date,
+            days=days,
+            max_nights=max_nights,
+            loyalty_tier=guest_loyalty_tier,
+            room_type_ids=room_type_ids,
+        )
+        return LOSMatrixResponse(
+            start_date=start_date,
+            days=days,
+            max_nights=max_nights,
+            guest_loyalty_tier=guest_loyalty_tier,
+            room_types=[
+                RoomTypeLOSMatrix(
+                    room_type_id=rt,
+                    room_type_name=rule_set.room_type_names[rt],
+                    totals=matrix[rt],
+                )
+                for rt in room_type_ids
+            ],
+        )
+
+    @staticmethod
+    def simulate_rules(
+        db: Session,
+        sim_request: PricingSimulationRequest,
+    ) -> PricingSimulationResponse:
+        """
+        Replay draft pricing rules against historical bookings
+        
+        Bookings with check-in in the date range (confirmed, checked in or
+        checked out) are loaded column-wise and re-priced from today's room
+        type base prices with only the draft rules, as of the day each booking
+        was made. Nothing is written to the database.
+        """
+        if sim_request.end_date < sim_request.start_date:
+            raise ValueError("end_date must be on or after start_date")
+
+        # Draft rules are compiled from transient (never added) models;
+        # their id is the 1-based position in the request.
+        drafts = [
+            CompiledRule(PricingRule(id=index, **rule.model_dump()))
+            for index, rule in enumerate(sim_request.rules, start=1)
+        ]
+        drafts.sort(key=lambda r: (-r.priority, r.id))
+        arrays = RuleArrays(drafts)
+
+        rows = db.execute(
+            select(
+                Booking.check_in,
+                Booking.check_out,
+                Booking.created_at,
+                Booking.total_price,
+                Room.room_type_id,
+                Guest.vip_tier,
+            )
+            .join(Room, Booking.room_id == Room.id)
+            .outerjoin(Guest, Booking.guest_id == Guest.id)
+            .where(
+                Booking.check_in >= sim_request.start_date,
+                Booking.check_in <= sim_request.end_date,
+                Booking.status.in_([
+                    BookingStatus.CONFIRMED.value,
+                    BookingStatus.CHECKED_IN.value,
+                    BookingStatus.CHECKED_OUT.value,
+                ]),
+            )
+        ).all()
+        base_prices = {rt_id: float(price) for rt_id, price in db.execute(select(RoomType.id, RoomType.base_price))}
+
+        count = len(rows)
+        check_in, check_out, created_at, total_price, room_type_id, vip_tier = (
+            zip(*rows) if rows else ([],) * 6
+        )
+        check_in = np.fromiter((d.toordinal() for d in check_in), dtype=np.int64, count=count)
+        nights = np.fromiter((d.toordinal() for d in check_out), dtype=np.int64, count=count) - check_in
+        booked_on = np.fromiter(
+            (c.date().toordinal() if c else ci for c, ci in zip(created_at, check_in)), dtype=np.int64, count=count
+        )
+        actual = np.fromiter((float(p) for p in total_price), dtype=np.float64, count=count)
+        room_types = np.fromiter(room_type_id, dtype=np.int64, count=count)
+        tiers = np.fromiter((t or 0 for t in vip_tier), dtype=np.int64, count=count)
+        base = np.fromiter((base_prices.get(rt, 0.0) for rt in room_type_id), dtype=np.float64, count=count)
+
+        attribution = RuleAttribution(arrays.count, weights=nights)
+        nightly = arrays.evaluate(base, room_types, check_in, nights, tiers, booked_on, attribution=attribution)
+
+        simulated_revenue = float((nightly * nights).sum())
+        actual_revenue = float(actual.sum())
+        rule_results = [
+            SimulatedRuleResult(
+                index=rule.id,
+                name=rule.name,
+                rule_type=rule.rule_type,
+                priority=rule.priority,
+                bookings_affected=int(attribution.stays[i]),
+                nights_affected=int(attribution.weighted_stays[i]),
+                uplift=round(float(attribution.uplift[i]), 2),
+            )
+            for i, rule in enumerate(drafts)
+        ]
+        rule_results.sort(key=lambda r: r.index)
+
+        return PricingSimulationResponse(
+            start_date=sim_request.start_date,
+            end_date=sim_request.end_date,
+            bookings=count,
+            nights=int(nights.sum()),
+            actual_revenue=round(actual_revenue, 2),
+            base_revenue=round(float((base * nights).sum()), 2),
+            simulated_revenue=round(simulated_revenue, 2),
+            uplift=round(simulated_revenue - actual_revenue, 2),
+            rules=rule_results,
+        )
+
+    @staticmethod
+    def analyze_rules(db: Session) -> RuleAnalysisResponse:
+        """
+        Overlapping and shadowed active rules, and their stacked effect per date segment
+        
+        Analysed per room type (its own rules plus global ones) and cached on
+        the compiled rule set until rules or room types change.
+        """
+        rule_set = pricing_engine.get_rule_set(db)
+        room_types = rule_set.memoized(("analysis",), lambda: pricing_analysis.analyze_rule_set(rule_set))
+        return RuleAnalysisResponse(active_rules=len(rule_set.rules), room_types=room_types)
+
+    @staticmethod
+    def _grid_room_types(rule_set: CompiledRuleSet, room_type_id: Optional[int]) -> List[int]:
+        """Room types to include in a calendar/matrix (one, or all known)"""
+        if room_type_id is not None:
+            if room_type_id not in rule_set.base_prices:
+                raise ValueError(f"Room type {room_type_id} not found")
+            return [room_type_id]
+        return sorted(rule_set.base_prices)
+
+    @staticmethod
+    def _quote(
+        rule_set: CompiledRuleSet,
+        base_price: Decimal,
+        room_type_id: int,
+        check_in: date,
+        check_out: date,
+        loyalty_tier: int,
+    ) -> PriceCalculationResponse:
+        """Evaluate one stay against a compiled rule set (no database access)"""
         # Calculate nights
-        total_nights = (calc_request.check_out - calc_request.check_in).days
+        total_nights = (check_out - check_in).days
         if total_nights <= 0:
             raise ValueError("Check-out must be after check-in")
         
-        # Get applicable rules
-        applicable_rules = PricingRuleService._get_applicable_rules(
-            db=db,
-            room_type_id=calc_request.room_type_id,
-            check_in=calc_request.check_in,
-            check_out=calc_request.check_out,
+        # Get applicable rules (pure in-memory evaluation)
+        applicable_rules = rule_set.applicable_rules(
+            room_type_id=room_type_id,
+            check_in=check_in,
             total_nights=total_nights,
-            loyalty_tier=calc_request.guest_loyalty_tier,
+            loyalty_tier=loyalty_tier,
         )
         
-        # Apply rules
-        adjusted_price = base_price
-        applied_rules_details = []
-        
-        for rule in applicable_rules:
-            old_price = adjusted_price
-            
-            if rule.adjustment_type == "percentage":
-                adjustment = adjusted_price * (rule.adjustment_value / 100)
-                adjusted_price += adjustment
-            else:  # fixed_amount
-                adjusted_price += rule.adjustment_value
-            
-            # Ensure price doesn't go negative
-            adjusted_price = max(Decimal("0.00"), adjusted_price)
-            
-            applied_rules_details.append({
+        # Apply rules in exact integer arithmetic; Decimal only for the response
+        adjusted, steps = apply_adjustments(
+            ExactAmount.from_decimal(base_price), [rule.adjustment for rule in applicable_rules]
+        )
+        applied_rules_details = [
+            {
                 "rule_id": rule.id,
                 "rule_name": rule.name,
                 "rule_type": rule.rule_type,  # Already a string
                 "adjustment_type": rule.adjustment_type,
-                "adjustment_value": float(rule.adjustment_value),
-                "price_before": float(old_price),
-                "price_after": float(adjusted_price),
-            })
+                "adjustment_value": rule.adjustment.value,
+                "price_before": price_before,
+                "price_after": price_after,
+            }
+            for rule, (price_before, price_after) in zip(applicable_rules, steps)
+        ]
         
+        adjusted_price = adjusted.to_decimal()
         total_price = adjusted_price * total_nights
         base_total = base_price * total_nights
         savings = base_total - total_price
@@ -186,85 +473,11 @@ class PricingRuleService:
         check_out: date,
         total_nights: int,
         loyalty_tier: int,
-    ) -> List[PricingRule]:
+    ) -> List[CompiledRule]:
         """Get all applicable pricing rules for the given booking parameters"""
-        today = date.today()
-        days_until_checkin = (check_in - today).days
-        
-        # Query active rules, ordered by priority (descending)
-        query = db.query(PricingRule).filter(PricingRule.is_active == True)
-        
-        # Filter by room type (NULL means applies to all room types)
-        query = query.filter(
-            or_(
-                PricingRule.room_type_id == room_type_id,
-                PricingRule.room_type_id.is_(None)
-            )
-        )
-        
-        # Filter by date range (if specified)
-        query = query.filter(
-            or_(
-                and_(
-                    PricingRule.start_date.is_(None),
-                    PricingRule.end_date.is_(None)
-                ),
-                and_(
-                    PricingRule.start_date <= check_in,
-                    PricingRule.end_date >= check_in
-                ),
-                and_(
-                    PricingRule.start_date.is_(None),
-                    PricingRule.end_date >= check_in
-                ),
-                and_(
-                    PricingRule.start_date <= check_in,
-                    PricingRule.end_date.is_(None)
-                ),
-            )
+        return pricing_engine.get_rule_set(db).applicable_rules(
+            room_type_id=room_type_id,
+            check_in=check_in,
+            total_nights=total_nights,
+            loyalty_tier=loyalty_tier,
         )
-        
-        # Order by priority
-        query = query.order_by(PricingRule.priority.desc())
-        
-        rules = query.all()
-        
-        # Further filter rules based on conditions
-        applicable_rules = []
-        
-        for rule in rules:
-            # Check minimum nights
-            if rule.min_nights and total_nights < rule.min_nights:
-                continue
-            
-            # Check advance booking days
-            if rule.min_advance_days and days_until_checkin < rule.min_advance_days:
-                continue
-            
-            if rule.max_advance_days and days_until_checkin > rule.max_advance_days:
-                continue
-            
-            # Check loyalty tier
-            if rule.min_loyalty_tier and loyalty_tier < rule.min_loyalty_tier:
-                continue
-            
-            # Check applicable days of week
-            if rule.applicable_days:
-                try:
-                    applicable_days = json.loads(rule.applicable_days)
-                    # Check if any night of the stay falls on an applicable day
-                    applicable = False
-                    for i in range(total_nights):
-                        night_date = check_in + timedelta(days=i)
-                        if night_date.weekday() in applicable_days:
-                            applicable = True
-                            break
-                    if not applicable:
-                        continue
-                except (json.JSONDecodeError, TypeError):
-                    # Invalid JSON, skip this check
-                    pass
-            
-            applicable_rules.append(rule)
-        
-        return applicable_rules
@@ -5,6 +5,7 @@ from sqlalchemy.orm import Session
 
 from ..db import models
 from .payment_service import PaymentService
+from ..utils.money import from_cents, percent_of, to_cents
 
 
 class RefundPolicyService:
@@ -89,15 +90,15 @@ class RefundPolicyService:
             models.Payment.status == models.Payment.PaymentStatus.PAID.value,
         ).all()
         
-        # Process refunds proportionally
+        # Process refunds proportionally, in cents rounded as the NUMERIC(10, 2) column would
         for payment in paid_payments:
-            refund_amount = Decimal(payment.amount) * (refund_percentage / Decimal("100"))
+            refund_cents = percent_of(to_cents(payment.amount), refund_percentage)
             
-            if refund_amount > 0:
+            if refund_cents > 0:
                 # Create a refund payment record
                 refund = models.Payment(
                     booking_id=booking.id,
-                    amount=refund_amount,
+                    amount=from_cents(refund_cents),
                     currency=payment.currency,
                     method=payment.method,
                     status=models.Payment.PaymentStatus.REFUNDED.value,
@@ -3,6 +3,7 @@ from decimal import Decimal
 from sqlalchemy import func
 from sqlalchemy.orm import Session
 from ..db import models
+from ..utils.money import div_round, from_cents, percentage_hundredths, to_cents
 
 
 def _daterange(start_date: date, end_date: date):
@@ -12,6 +13,11 @@ def _daterange(start_date: date, end_date: date):
         cur = cur + timedelta(days=1)
 
 
+def _daily_revenue_cents(revenue_by_day: dict, start_date: date, end_date: date):
+    """(date, cents) for every day in the range; days without payments are 0."""
+    return [(d, revenue_by_day.get(d, 0)) for d in _daterange(start_date, end_date)]
+
+
 class ReportService:
     @staticmethod
     def occupancy_report(db: Session, start_date: date, end_date: date):
@@ -37,7 +43,7 @@ class ReportService:
             count = sum(1 for b in bookings if b.check_in <= d < b.check_out)
             occupancy_by_date[d] = count
 
-        # Build daily array and calculate metrics
+        # Build daily array and calculate metrics (rates as integer hundredths of a percent)
         daily = []
         total_occupied = 0
         total_room_nights = 0
@@ -47,7 +53,9 @@ class ReportService:
             occupied = occupancy_by_date.get(d, 0)
             occupancy_rate = Decimal('0')
             if total_rooms > 0:
-                occupancy_rate = (Decimal(occupied) / Decimal(total_rooms) * Decimal('100')).quantize(Decimal('0.01'))
+                rate = percentage_hundredths(occupied, total_rooms)
+                occupancy_rate = from_cents(rate)
+                occupancy_rates.append(rate)
             
             daily.append({
                 'date': d,
@@ -57,15 +65,14 @@ class ReportService:
             })
             total_occupied += occupied
             total_room_nights += occupied
-            occupancy_rates.append(occupancy_rate)
 
         days = len(daily)
         avg = Decimal('0')
         if days > 0 and total_rooms > 0:
-            avg = (Decimal(total_occupied) / Decimal(days * total_rooms) * Decimal('100')).quantize(Decimal('0.01'))
+            avg = from_cents(percentage_hundredths(total_occupied, days * total_rooms))
 
-        max_occupancy = max(occupancy_rates, default=Decimal('0'))
-        min_occupancy = min(occupancy_rates, default=Decimal('0'))
+        max_occupancy = from_cents(max(occupancy_rates)) if occupancy_rates else Decimal('0')
+        min_occupancy = from_cents(min(occupancy_rates)) if occupancy_rates else Decimal('0')
 
         return {
             'start_date': start_date,
@@ -104,24 +111,20 @@ class ReportService:
                     day_obj = day_val
             else:
                 day_obj = day_val
-            rows[day_obj] = Decimal(r.revenue)
+            rows[day_obj] = to_cents(r.revenue)
 
-        daily = []
-        total = Decimal('0')
-        for d in _daterange(start_date, end_date):
-            rev = rows.get(d) or Decimal('0')
-            rev = Decimal(rev).quantize(Decimal('0.01'))
-            daily.append({'date': d, 'revenue': rev})
-            total += rev
+        daily_cents = _daily_revenue_cents(rows, start_date, end_date)
+        daily = [{'date': d, 'revenue': from_cents(cents)} for d, cents in daily_cents]
+        total = sum(cents for _, cents in daily_cents)
 
         # Calculate metrics
         num_days = len(daily)
         avg_daily = Decimal('0')
         if num_days > 0:
-            avg_daily = (total / Decimal(num_days)).quantize(Decimal('0.01'))
+            avg_daily = from_cents(div_round(total, num_days))
         
-        max_daily = max((d['revenue'] for d in daily), default=Decimal('0'))
-        min_daily = min((d['revenue'] for d in daily), default=Decimal('0'))
+        max_daily = from_cents(max((cents for _, cents in daily_cents), default=0))
+        min_daily = from_cents(min((cents for _, cents in daily_cents), default=0))
         
         # Count UNIQUE paid bookings (not payment records) in date range
         paid_bookings_count = db.query(func.count(func.distinct(models.Payment.booking_id))).filter(
@@ -146,17 +149,17 @@ class ReportService:
         ).group_by(models.RoomType.name).all()
 
         room_type_breakdown = [
-            {'room_type': name, 'revenue': Decimal(rev).quantize(Decimal('0.01'))}
+            {'room_type': name, 'revenue': from_cents(to_cents(rev))}
             for name, rev in revenue_by_room_type
         ]
 
         return {
             'start_date': start_date,
             'end_date': end_date,
-            'total_revenue': total.quantize(Decimal('0.01')),
+            'total_revenue': from_cents(total),
             'average_daily_revenue': avg_daily,
-            'max_daily_revenue': max_daily.quantize(Decimal('0.01')),
-            'min_daily_revenue': min_daily.quantize(Decimal('0.01')),
+            'max_daily_revenue': max_daily,
+            'min_daily_revenue': min_daily,
             'total_paid_bookings': int(paid_bookings_count),
             'room_type_breakdown': room_type_breakdown,
             'daily': daily,
@@ -254,8 +257,8 @@ class ReportService:
         cancellation_rate = Decimal('0')
         no_show_rate = Decimal('0')
         if total > 0:
-            cancellation_rate = (Decimal(cancellations) / Decimal(total) * Decimal('100')).quantize(Decimal('0.01'))
-            no_show_rate = (Decimal(no_shows) / Decimal(total) * Decimal('100')).quantize(Decimal('0.01'))
+            cancellation_rate = from_cents(percentage_hundredths(cancellations, total))
+            no_show_rate = from_cents(percentage_hundredths(no_shows, total))
 
         return {
             'start_date': start_date,
@@ -1,8 +1,12 @@
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from typing import Optional
 from ..db import models
-from ..schemas.room import RoomCreate, RoomUpdate
-from ..utils.pagination import paginate, apply_sorting
+from ..schemas.room import RoomCreate, RoomUpdate, RoomResponse
+from ..utils.pagination import paginate_projection, apply_sorting
+from ..utils.projection import Projection
+
+ROOM_LIST = Projection(RoomResponse, models.Room)
 
 
 class RoomService:
@@ -32,21 +36,22 @@ class RoomService:
     def list_rooms(db: Session, page: int = 1, page_size: int = 50, status: Optional[str] = None, 
                    room_type_id: Optional[int] = None, search: Optional[str] = None, 
                    sort_by: Optional[str] = None, sort_order: str = "asc"):
-        query = db.query(models.Room)
+        """List rooms as serialized ``RoomResponse`` dicts (column projection, no ORM entities)."""
+        query = select(*ROOM_LIST.columns)
         
         # Apply filters
         if status:
-            query = query.filter(models.Room.maintenance_status == status)
+            query = query.where(models.Room.maintenance_status == status)
         if room_type_id:
-            query = query.filter(models.Room.room_type_id == room_type_id)
+            query = query.where(models.Room.room_type_id == room_type_id)
         if search:
-            query = query.filter(models.Room.number.ilike(f"%{search}%"))
+            query = query.where(models.Room.number.ilike(f"%{search}%"))
         
         # Apply sorting
         query = apply_sorting(query, models.Room, sort_by, sort_order)
         
         # Apply pagination
-        return paginate(query, page, page_size)
+        return paginate_projection(db, query, ROOM_LIST, page, page_size)
 
     @staticmethod
     def update_room(db: Session, room_id: int, data: RoomUpdate):
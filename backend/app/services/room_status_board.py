@@ -0,0 +1,237 @@
+"""
+In-memory room status board for the housekeeping grid.
+
+One compact record per room (maintenance status, open task counts, next
+check-in, current guest) is loaded once and then kept current from the
+writes this process commits:
+
+- Session hooks note which rooms a commit touched (rooms, bookings, tasks,
+  including check-in/out and task start/complete/verify) and mark them
+  stale. The next read refreshes only those rooms.
+- Bulk statements, guest and room type edits and schema changes mark the
+  whole board stale.
+- A full reload every ``ROOM_STATUS_BOARD_RECONCILE_SECONDS`` (and at the
+  start of each day, since "next check-in" is relative to today) repairs
+  drift from writes made by other workers or outside the ORM.
+
+When nothing changed, ``snapshot()`` serves the records without touching
+the database.
+"""
+import threading
+import time
+from datetime import date
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import event, func, inspect, select
+from sqlalchemy.orm import Session
+
+from ..core.config import settings
+from ..db import models
+
+
+class RoomStatus:
+    """Board record for one room."""
+
+    __slots__ = (
+        "room_id", "room_number", "room_type", "maintenance_status",
+        "pending_tasks", "in_progress_tasks", "next_checkin", "current_guest",
+    )
+
+    def __init__(self, room_id: int, room_number: str, room_type: str, maintenance_status: str):
+        self.room_id = room_id
+        self.room_number = room_number
+        self.room_type = room_type
+        self.maintenance_status = maintenance_status
+        self.pending_tasks = 0
+        self.in_progress_tasks = 0
+        self.next_checkin: Optional[date] = None
+        self.current_guest: Optional[str] = None
+
+
+_lock = threading.Lock()
+_refresh_lock = threading.Lock()
+_rooms: Dict[int, RoomStatus] = {}
+_loaded_at: Optional[float] = None
+_loaded_for: Optional[date] = None
+_stale_rooms: set = set()
+_reload_all = True
+
+_PENDING_KEY = "room_status_board_pending"
+_RELOAD_ALL = object()  # Marker in a session's pending set
+
+
+def _status_value(value) -> str:
+    return value.value if hasattr(value, "value") else str(value)
+
+
+def _load(db: Session, today: date, room_ids: Optional[Iterable[int]] = None) -> Dict[int, RoomStatus]:
+    """Build records for all rooms (or the given ones) with one query per source."""
+    def scoped(query, column):
+        return query.where(column.in_(room_ids)) if room_ids is not None else query
+
+    records = {}
+    for room_id, number, maintenance_status, room_type in db.execute(scoped(
+        select(models.Room.id, models.Room.number, models.Room.maintenance_status, models.RoomType.name)
+        .join(models.RoomType, models.RoomType.id == models.Room.room_type_id),
+        models.Room.id,
+    )):
+        records[room_id] = RoomStatus(room_id, number, room_type, _status_value(maintenance_status))
+
+    for room_id, task_status, count in db.execute(scoped(
+        select(models.HousekeepingTask.room_id, models.HousekeepingTask.status, func.count())
+        .where(models.HousekeepingTask.status.in_([models.TaskStatus.PENDING.value, models.TaskStatus.IN_PROGRESS.value]))
+        .group_by(models.HousekeepingTask.room_id, models.HousekeepingTask.status),
+        models.HousekeepingTask.room_id,
+    )):
+        record = records.get(room_id)
+        if record is None:
+            continue
+        if task_status == models.TaskStatus.PENDING.value:
+            record.pending_tasks = count
+        else:
+            record.in_progress_tasks = count
+
+    for room_id, next_checkin in db.execute(scoped(
+        select(models.Booking.room_id, func.min(models.Booking.check_in))
+        .where(
+            models.Booking.check_in >= today,
+            models.Booking.status.in_([models.BookingStatus.CONFIRMED.value, models.BookingStatus.PENDING.value]),
+        )
+        .group_by(models.Booking.room_id),
+        models.Booking.room_id,
+    )):
+        if room_id in records:
+            records[room_id].next_checkin = next_checkin
+
+    for room_id, name, surname in db.execute(scoped(
+        select(models.Booking.room_id, models.Guest.name, models.Guest.surname)
+        .join(models.Guest, models.Guest.id == models.Booking.guest_id)
+        .where(models.Booking.status == models.BookingStatus.CHECKED_IN.value),
+        models.Booking.room_id,
+    )):
+        if room_id in records:
+            records[room_id].current_guest = f"{name} {surname}"
+
+    return records
+
+
+def load(db: Session) -> None:
+    """(Re)load the whole board, e.g. at startup."""
+    global _rooms, _loaded_at, _loaded_for, _reload_all
+    today = date.today()
+    with _lock:
+        _reload_all = False
+        _stale_rooms.clear()
+    records = _load(db, today)
+    with _lock:
+        _rooms = records
+        _loaded_at = time.monotonic()
+        _loaded_for = today
+
+
+def invalidate(room_ids: Optional[Iterable[int]] = None) -> None:
+    """Mark rooms (or, with no argument, the whole board) as needing a refresh."""
+    global _reload_all
+    with _lock:
+        if room_ids is None:
+            _reload_all = True
+        else:
+            _stale_rooms.update(room_ids)
+
+
+def snapshot(db: Session) -> List[RoomStatus]:
+    """Current records, refreshing whatever writes have made stale first."""
+    global _rooms, _stale_rooms
+    with _refresh_lock:
+        with _lock:
+            full = (
+                _reload_all
+                or _loaded_at is None
+                or _loaded_for != date.today()
+                or time.monotonic() - _loaded_at > settings.ROOM_STATUS_BOARD_RECONCILE_SECONDS
+            )
+            if full:
+                stale = set()
+            else:
+                # Take the set before reading: rooms marked during the read stay stale
+                stale, _stale_rooms = _stale_rooms, set()
+        if full:
+            load(db)
+        elif stale:
+            try:
+                refreshed = _load(db, _loaded_for, stale)
+            except Exception:
+                invalidate(stale)
+                raise
+            with _lock:
+                rooms = dict(_rooms)
+                for room_id in stale:
+                    if room_id in refreshed:
+                        rooms[room_id] = refreshed[room_id]
+                    else:
+                        rooms.pop(room_id, None)  # Deleted
+                _rooms = rooms
+        with _lock:
+            return list(_rooms.values())
+
+
+# -----------------------------
+# Session hooks
+# -----------------------------
+def _pending(session: Session) -> set:
+    return session.info.setdefault(_PENDING_KEY, set())
+
+
+def _touched_room_ids(obj) -> Iterable:
+    """Room ids an object affects, including a room_id it was moved away from."""
+    state = inspect(obj)
+    key = "id" if isinstance(obj, models.Room) else "room_id"
+    if key not in state.dict:
+        # Expired and not reloaded; find out without emitting SQL mid-flush
+        return [_RELOAD_ALL]
+    history = state.attrs[key].history  # Never loads
+    return [room_id for room_id in (state.dict[key], *history.deleted) if room_id is not None]
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_flushed_rooms(session, flush_context):
+    pending = _pending(session)
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, (models.Room, models.Booking, models.HousekeepingTask)):
+            pending.update(_touched_room_ids(obj))
+        elif isinstance(obj, models.RoomType) or (isinstance(obj, models.Guest) and obj not in session.new):
+            # Names shown on many rooms
+            pending.add(_RELOAD_ALL)
+
+
+_BOARD_TABLES = {"rooms", "room_types", "bookings", "housekeeping_tasks", "guests"}
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _collect_bulk_statements(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        table = getattr(orm_execute_state.statement, "table", None)
+        if table is not None and table.name in _BOARD_TABLES:
+            _pending(orm_execute_state.session).add(_RELOAD_ALL)
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_committed_rooms(session):
+    pending = session.info.pop(_PENDING_KEY, None)
+    if not pending:
+        return
+    if _RELOAD_ALL in pending:
+        invalidate()
+    else:
+        invalidate(pending)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_rolled_back_rooms(session):
+    session.info.pop(_PENDING_KEY, None)
+
+
+@event.listens_for(models.Base.metadata, "after_create")
+@event.listens_for(models.Base.metadata, "after_drop")
+def _reload_after_schema_change(target, connection, **kw):
+    invalidate()
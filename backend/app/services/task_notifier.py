@@ -0,0 +1,66 @@
+"""
+In-process wake-ups for housekeeping long-polls.
+
+HousekeepingService calls ``notify()`` after committing writes that can make
+work available (new, updated, assigned or generated tasks). Long-poll
+requests wait on it with ``wait()`` instead of re-querying on a timer.
+
+Notifications are per process: a task created by another worker wakes
+nobody here, so waiters also time out and re-check the database (the
+long-poll's own timeout bounds the delay).
+"""
+import asyncio
+import threading
+from typing import Set, Tuple
+
+_lock = threading.Lock()
+_version = 0
+_waiters: Set[Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = set()
+
+
+def version() -> int:
+    """Current notification counter; pass it to ``wait`` to avoid missed wake-ups."""
+    return _version
+
+
+def notify() -> None:
+    """Wake every waiter. Safe to call from any thread."""
+    global _version
+    with _lock:
+        _version += 1
+        waiters = list(_waiters)
+        _waiters.clear()
+    for loop, future in waiters:
+        try:
+            loop.call_soon_threadsafe(_wake, future)
+        except RuntimeError:
+            pass  # Loop already closed
+
+
+def _wake(future: asyncio.Future) -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+async def wait(since_version: int, timeout: float) -> bool:
+    """
+    Wait until something is notified after ``since_version``.
+
+    Returns True when woken (or if a notification already happened since
+    ``since_version``), False on timeout.
+    """
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+    waiter = (loop, future)
+    with _lock:
+        if _version != since_version:
+            return True
+        _waiters.add(waiter)
+    try:
+        await asyncio.wait_for(future, timeout)
+        return True
+    except asyncio.TimeoutError:
+        return False
+    finally:
+        with _lock:
+            _waiters.discard(waiter)
@@ -8,10 +8,11 @@ from ..core import security
 
 class UserService:
     @staticmethod
-    def create_user(db: Session, user_in: UserCreate) -> models.User:
+    def create_user(db: Session, user_in: UserCreate, password_hash: Optional[str] = None) -> models.User:
+        """Create a user; routes pass ``password_hash`` computed on the hashing pool."""
         user = models.User(
             username=user_in.username,
-            password_hash=security.get_password_hash(user_in.password),
+            password_hash=password_hash or security.get_password_hash(user_in.password),
             permission_level=user_in.permission_level or "REGULAR",
         )
         db.add(user)
@@ -29,7 +30,7 @@ class UserService:
 
     @staticmethod
     def update_user(
-        db: Session, user_id: int, user_in: UserUpdate
+        db: Session, user_id: int, user_in: UserUpdate, password_hash: Optional[str] = None
     ) -> Optional[models.User]:
         user = UserService.get_user(db, user_id)
         if not user:
@@ -37,7 +38,7 @@ class UserService:
 
         for field, value in user_in.model_dump(exclude_unset=True).items():
             if field == "password":
-                setattr(user, "password_hash", security.get_password_hash(value))
+                setattr(user, "password_hash", password_hash or security.get_password_hash(value))
             else:
                 setattr(user, field, value)
 
@@ -45,6 +46,14 @@ class UserService:
         db.refresh(user)
         return user
 
+    @staticmethod
+    def set_password_hash(db: Session, user: models.User, password_hash: str) -> models.User:
+        """Store a freshly computed hash (used to upgrade the bcrypt work factor on login)."""
+        user.password_hash = password_hash
+        db.commit()
+        db.refresh(user)
+        return user
+
     @staticmethod
     def deactivate_user(db: Session, user_id: int) -> Optional[models.User]:
         user = UserService.get_user(db, user_id)
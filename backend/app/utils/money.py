@@ -0,0 +1,181 @@
+"""
+Integer money arithmetic for pricing, billing and report hot paths.
+
+Amounts are carried as integer cents (``int``) inside loops and converted
+to ``Decimal`` only where they leave the service layer. Rounding helpers
+reproduce ``Decimal.quantize`` exactly: ``ROUND_HALF_EVEN`` (the Decimal
+default, used by reports) and ``ROUND_HALF_UP`` (what a NUMERIC(10, 2)
+column does to a stored value).
+
+Rule stacking in ``calculate_price`` is not rounded to cents at all, so it
+uses ``ExactAmount``: an integer scaled by a power of ten, which keeps every
+intermediate value exact (see ``apply_adjustments``).
+"""
+from decimal import Decimal, ROUND_HALF_EVEN, ROUND_HALF_UP
+from typing import List, Sequence, Tuple, Union
+
+Cents = int
+
+CENT = Decimal("0.01")
+
+Number = Union[Decimal, int, float, str]
+
+
+def to_cents(amount: Number, rounding: str = ROUND_HALF_EVEN) -> Cents:
+    """Convert an amount to integer cents, rounding like ``quantize(Decimal("0.01"))``."""
+    if isinstance(amount, int):
+        return amount * 100
+    if isinstance(amount, float):
+        # Exact binary value of the float, as Decimal(float) would see it
+        numerator, denominator = amount.as_integer_ratio()
+        return div_round(numerator * 100, denominator, rounding)
+    return int(Decimal(amount).quantize(CENT, rounding=rounding).scaleb(2))
+
+
+def from_cents(cents: Cents) -> Decimal:
+    """Convert integer cents to a two-decimal ``Decimal`` (same form as ``quantize``)."""
+    return Decimal(cents).scaleb(-2)
+
+
+def div_round(numerator: int, denominator: int, rounding: str = ROUND_HALF_EVEN) -> int:
+    """Integer division rounded to the nearest integer; ``denominator`` must be positive."""
+    quotient, remainder = divmod(numerator, denominator)
+    twice = 2 * remainder
+    if twice > denominator:
+        return quotient + 1
+    if twice < denominator:
+        return quotient
+    # Exact tie between quotient and quotient + 1
+    if rounding == ROUND_HALF_EVEN:
+        return quotient + (quotient & 1)
+    if rounding == ROUND_HALF_UP:
+        return quotient + 1 if numerator >= 0 else quotient
+    raise ValueError(f"Unsupported rounding mode: {rounding}")
+
+
+def percentage_hundredths(part: int, whole: int) -> int:
+    """``part / whole * 100`` in hundredths of a percent, rounded half-even (e.g. 3/7 -> 4286)."""
+    return div_round(part * 10000, whole)
+
+
+def percent_of(cents: Cents, percent: Number, rounding: str = ROUND_HALF_UP) -> Cents:
+    """``cents * percent / 100`` rounded to whole cents."""
+    num, den = Decimal(percent).as_integer_ratio()
+    return div_round(cents * num, den * 100, rounding)
+
+
+class _Powers(dict):
+    """10 ** n, computed once per exponent."""
+
+    def __missing__(self, n: int) -> int:
+        value = self[n] = 10 ** n
+        return value
+
+
+_POW10 = _Powers()
+
+
+def _decimal_parts(value: Decimal):
+    """(units, scale) with value == units / 10 ** scale and scale >= 0."""
+    text = str(value)
+    if "E" not in text:
+        # Plain notation, e.g. "-149.90": the digits after the point are the scale
+        point = text.find(".")
+        if point < 0:
+            return int(text), 0
+        return int(text[:point] + text[point + 1:]), len(text) - point - 1
+    sign, digits, exponent = value.as_tuple()
+    units = int("".join(map(str, digits)) or "0")
+    if sign:
+        units = -units
+    if exponent > 0:
+        return units * _POW10[exponent], 0
+    return units, -exponent
+
+
+class ExactAmount:
+    """
+    An exact decimal amount stored as ``units / 10 ** scale``.
+
+    Values are never rounded: percentage adjustments multiply the units and
+    grow the scale. Scales follow Decimal's exponent rules, so
+    ``to_decimal()`` gives the same value *and* representation as the
+    equivalent ``Decimal`` arithmetic (as long as that fits in Decimal's
+    default 28-digit precision).
+    """
+
+    __slots__ = ("units", "scale")
+
+    def __init__(self, units: int, scale: int):
+        self.units = units
+        self.scale = scale
+
+    @classmethod
+    def from_decimal(cls, value: Number) -> "ExactAmount":
+        return cls(*_decimal_parts(Decimal(value)))
+
+    def _aligned(self, other: "ExactAmount"):
+        if self.scale >= other.scale:
+            return self.units, other.units * _POW10[self.scale - other.scale], self.scale
+        return self.units * _POW10[other.scale - self.scale], other.units, other.scale
+
+    def __sub__(self, other: "ExactAmount") -> "ExactAmount":
+        a, b, scale = self._aligned(other)
+        return ExactAmount(a - b, scale)
+
+    def __mul__(self, factor: int) -> "ExactAmount":
+        return ExactAmount(self.units * factor, self.scale)
+
+    def __float__(self) -> float:
+        # int / int is correctly rounded, like float(Decimal)
+        return self.units / _POW10[self.scale]
+
+    def to_decimal(self) -> Decimal:
+        return Decimal(self.units).scaleb(-self.scale)
+
+
+class Adjustment:
+    """A pricing adjustment (percentage or fixed amount) prepared for ``apply_adjustments``."""
+
+    __slots__ = ("is_percentage", "units", "scale", "value")
+
+    def __init__(self, adjustment_type: str, value: Decimal):
+        self.value = float(value)  # For display in quote breakdowns
+        self.is_percentage = adjustment_type == "percentage"
+        if self.is_percentage:
+            # price * (value / 100): Decimal keeps the quotient's exponent at
+            # -2 or the digits it needs, i.e. the normalized scale + 2.
+            units, scale = _decimal_parts(Decimal(value).normalize())
+            self.units = 100 * _POW10[scale] + units  # 1 + value / 100, scaled
+            self.scale = scale + 2
+        else:
+            self.units, self.scale = _decimal_parts(Decimal(value))
+
+
+def apply_adjustments(amount: ExactAmount, adjustments: Sequence[Adjustment]) -> Tuple[ExactAmount, List[Tuple[float, float]]]:
+    """
+    Stack adjustments in order, clamping at zero after each one.
+
+    Returns the final amount and the (before, after) price of every step as
+    floats, matching ``price += price * (pct / 100)`` / ``price += fixed``
+    followed by ``max(Decimal("0.00"), price)``.
+    """
+    units, scale = amount.units, amount.scale
+    after = units / _POW10[scale]
+    steps = []
+    for adjustment in adjustments:
+        before = after
+        if adjustment.is_percentage:
+            units *= adjustment.units
+            scale += adjustment.scale
+        elif adjustment.scale <= scale:
+            units += adjustment.units * _POW10[scale - adjustment.scale]
+        else:
+            units = units * _POW10[adjustment.scale - scale] + adjustment.units
+            scale = adjustment.scale
+        if units <= 0:
+            # max(Decimal("0.00"), price) returns the 0.00 literal
+            units, scale = 0, 2
+        after = units / _POW10[scale]
+        steps.append((before, after))
+    return ExactAmount(units, scale), steps
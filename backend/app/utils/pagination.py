@@ -1,7 +1,10 @@
 """Pagination utilities for API endpoints"""
 from typing import TypeVar, Generic, List, Optional
 from pydantic import BaseModel
-from sqlalchemy.orm import Query
+from sqlalchemy import Select, func, select
+from sqlalchemy.orm import Query, Session
+
+from .projection import Projection
 
 T = TypeVar('T')
 
@@ -76,6 +79,37 @@ def paginate(query: Query, page: int = 1, page_size: int = 50) -> dict:
     }
 
 
+def paginate_projection(db: Session, stmt: Select, projection: Projection, page: int = 1, page_size: int = 50) -> dict:
+    """
+    Paginate a column-projected select (see ``utils.projection``)
+    
+    Same bounds and result shape as ``paginate``, but items are response
+    dicts built straight from result rows rather than ORM entities.
+    """
+    if page < 1:
+        page = 1
+    if page_size < 1:
+        page_size = 10
+    if page_size > 100:
+        page_size = 100
+    
+    total = db.scalar(select(func.count()).select_from(stmt.order_by(None).subquery()))
+    total_pages = (total + page_size - 1) // page_size if total > 0 else 1
+    if page > total_pages:
+        page = total_pages
+    
+    offset = (page - 1) * page_size
+    rows = db.execute(stmt.offset(offset).limit(page_size))
+    
+    return {
+        "items": [projection.serialize(row) for row in rows],
+        "total": total,
+        "page": page,
+        "page_size": page_size,
+        "total_pages": total_pages
+    }
+
+
 def apply_sorting(query: Query, model, sort_by: Optional[str] = None, sort_order: str = "asc") -> Query:
     """
     Apply sorting to a SQLAlchemy query
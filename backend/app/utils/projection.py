@@ -0,0 +1,93 @@
+"""
+Column-projected reads for list endpoints.
+
+A ``Projection`` selects only the columns a response schema needs and turns
+each result row straight into the dict that schema would serialize to. Rows
+come back as plain tuples, so no ORM entities are built (no identity map or
+attribute instrumentation) and Pydantic does not validate the page a second
+time from attributes. The per-field conversion plan is worked out once, when
+the projection is defined.
+
+The dicts hold JSON-ready values except for dates, datetimes and Decimals,
+which ``FastJSONResponse`` writes exactly as Pydantic does.
+"""
+from decimal import Decimal
+from typing import Callable, Dict, Optional, Sequence, Tuple, Union, get_args, get_origin
+
+from pydantic import BaseModel
+from sqlalchemy import Enum as SQLEnum
+from sqlalchemy.orm import InstrumentedAttribute
+
+
+def _enum_value(value):
+    return value.value if value is not None and not isinstance(value, str) else value
+
+
+def _to_float(value):
+    return float(value) if isinstance(value, Decimal) else value
+
+
+def _is_float(annotation) -> bool:
+    if get_origin(annotation) is Union:
+        return float in get_args(annotation)
+    return annotation is float
+
+
+class Projection:
+    """
+    Columns for ``schema`` read from ``model`` plus a row -> dict serializer.
+
+    - ``nested`` maps a schema field to the model its sub-schema is read from
+      (that model must be joined into the statement)
+    - ``computed`` maps a schema field to ``(source columns, function)`` for
+      values that are not columns (e.g. hybrid properties)
+    """
+
+    def __init__(
+        self,
+        schema: type[BaseModel],
+        model,
+        nested: Optional[Dict[str, object]] = None,
+        computed: Optional[Dict[str, Tuple[Sequence[InstrumentedAttribute], Callable]]] = None,
+    ):
+        nested = nested or {}
+        computed = computed or {}
+        self.columns = []
+        self._plan = []  # (key, kind, payload)
+
+        for name, field in schema.model_fields.items():
+            if name in computed:
+                sources, function = computed[name]
+                start = len(self.columns)
+                self.columns.extend(sources)
+                self._plan.append((name, "computed", (start, len(sources), function)))
+            elif name in nested:
+                sub = Projection(field.annotation, nested[name])
+                start = len(self.columns)
+                self.columns.extend(sub.columns)
+                self._plan.append((name, "nested", (start, sub)))
+            else:
+                column = getattr(model, name)
+                if isinstance(column.type, SQLEnum):
+                    convert = _enum_value
+                elif _is_float(field.annotation):
+                    convert = _to_float  # Numeric columns come back as Decimal
+                else:
+                    convert = None
+                self._plan.append((name, "column", (len(self.columns), convert)))
+                self.columns.append(column)
+
+    def serialize(self, row, offset: int = 0) -> dict:
+        item = {}
+        for key, kind, payload in self._plan:
+            if kind == "column":
+                index, convert = payload
+                value = row[offset + index]
+                item[key] = convert(value) if convert is not None else value
+            elif kind == "nested":
+                start, sub = payload
+                item[key] = sub.serialize(row, offset + start)
+            else:
+                start, count, function = payload
+                item[key] = function(*row[offset + start:offset + start + count])
+        return item
@@ -0,0 +1,180 @@
+"""
+JSON rendering time and bytes on the wire for the largest responses.
+
+Builds a temporary SQLite database (rooms, guests, a year of bookings with
+payments), fetches the biggest endpoints once through the ASGI app, then
+times rendering each payload with the stdlib ``JSONResponse`` against the
+orjson-backed ``FastJSONResponse``, and reports response size uncompressed,
+gzipped and (if the optional ``brotli`` package is installed) brotli'd at the
+middleware's default levels.
+
+Usage:
+    python -m benchmarks.bench_json --rooms 200 --days 365
+"""
+import argparse
+import gzip
+import json
+import os
+import random
+import tempfile
+import time
+import timeit
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+from fastapi.responses import JSONResponse
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from backend.app.main import app
+from backend.app.core.compression import BROTLI_AVAILABLE
+from backend.app.core.config import settings
+from backend.app.core.responses import FastJSONResponse
+from backend.app.core.security import create_access_token, get_password_hash
+from backend.app.db import models
+from backend.app.db.session import get_db
+
+if BROTLI_AVAILABLE:
+    import brotli
+
+
+def _setup_database(path: str, rooms: int, days: int):
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    models.Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine, autoflush=False, autocommit=False, expire_on_commit=False)
+    rng = random.Random(7)
+
+    db = Session()
+    admin = models.User(
+        username="bench-admin",
+        password_hash=get_password_hash("bench-password"),
+        permission_level=models.PermissionLevel.ADMIN,
+    )
+    room_types = [
+        models.RoomType(name=name, base_price=Decimal(price), capacity=capacity)
+        for name, price, capacity in (("Single", "80.00", 1), ("Double", "120.00", 2), ("Suite", "240.00", 4))
+    ]
+    db.add(admin)
+    db.add_all(room_types)
+    db.flush()
+    db.execute(insert(models.Room), [
+        {
+            "number": f"{100 * (i // 20 + 1) + i % 20:d}",
+            "room_type_id": room_types[i % 3].id,
+            "floor": i // 20 + 1,
+            "price_per_night": room_types[i % 3].base_price,
+        }
+        for i in range(rooms)
+    ])
+    db.execute(insert(models.Guest), [
+        {"name": f"Guest{i}", "surname": f"Bench{i}", "email": f"guest{i}@example.com", "phone": f"+1555{i:07d}"}
+        for i in range(rooms * 2)
+    ])
+    db.flush()
+
+    start = date.today() - timedelta(days=days)
+    bookings = []
+    for room_id in range(1, rooms + 1):
+        day = start
+        while day < start + timedelta(days=days):
+            nights = rng.randint(1, 5)
+            bookings.append({
+                "booking_number": f"BK-{room_id:04d}{len(bookings):07d}",
+                "guest_id": rng.randint(1, rooms * 2),
+                "room_id": room_id,
+                "created_by": admin.id,
+                "check_in": day,
+                "check_out": day + timedelta(days=nights),
+                "number_of_guests": 1,
+                "price_per_night": Decimal("120.00"),
+                "total_price": Decimal("120.00") * nights,
+                "status": models.BookingStatus.CHECKED_OUT.value,
+            })
+            day += timedelta(days=nights + rng.randint(0, 3))
+    db.execute(insert(models.Booking), bookings)
+    db.execute(insert(models.Payment), [
+        {
+            "booking_id": booking_id,
+            "amount": booking["total_price"],
+            "currency": "USD",
+            "method": "card",
+            "status": models.Payment.PaymentStatus.PAID.value,
+            "processed_at": datetime.combine(booking["check_out"], datetime.min.time()),
+        }
+        for booking_id, booking in enumerate(bookings, start=1)
+    ])
+    db.commit()
+    db.close()
+    return engine, Session, len(bookings)
+
+
+def _time_render(response_class, content, repeat: int) -> float:
+    """Best-of-``repeat`` milliseconds to render ``content`` once."""
+    number = 5
+    return min(timeit.repeat(lambda: response_class(content), number=number, repeat=repeat)) / number * 1000
+
+
+def _run(client: TestClient, days: int, repeat: int):
+    headers = {
+        "Authorization": f"Bearer {create_access_token(subject='bench-admin')}",
+        "Accept-Encoding": "identity",
+    }
+    end = date.today()
+    start = (end - timedelta(days=days - 1)).isoformat()
+    endpoints = {
+        "bookings page (100)": "/bookings/?page_size=100",
+        f"occupancy report ({days}d)": f"/reports/occupancy?start_date={start}&end_date={end}",
+        f"revenue report ({days}d)": f"/reports/revenue?start_date={start}&end_date={end}",
+        "room status grid": "/reports/housekeeping/room-status-grid",
+    }
+
+    print(f"{'endpoint':<26} {'stdlib ms':>9} {'orjson ms':>9} {'speedup':>7} {'raw KB':>8} {'gzip KB':>8} {'br KB':>8}")
+    for label, url in endpoints.items():
+        response = client.get(url, headers=headers)
+        response.raise_for_status()
+        content = json.loads(response.content)  # What the response class receives
+
+        stdlib_ms = _time_render(JSONResponse, content, repeat)
+        orjson_ms = _time_render(FastJSONResponse, content, repeat)
+        body = FastJSONResponse(content).body
+        gzip_kb = len(gzip.compress(body, settings.COMPRESSION_GZIP_LEVEL)) / 1024
+        br_kb = (
+            f"{len(brotli.compress(body, quality=settings.COMPRESSION_BROTLI_QUALITY)) / 1024:8.1f}"
+            if BROTLI_AVAILABLE else f"{'n/a':>8}"
+        )
+        print(
+            f"{label:<26} {stdlib_ms:9.3f} {orjson_ms:9.3f} {stdlib_ms / orjson_ms:6.1f}x "
+            f"{len(body) / 1024:8.1f} {gzip_kb:8.1f} {br_kb}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rooms", type=int, default=200)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        started = time.perf_counter()
+        engine, Session, bookings = _setup_database(os.path.join(tmp, "bench.db"), args.rooms, args.days)
+        print(f"setup: {args.rooms} rooms, {bookings} bookings in {time.perf_counter() - started:.1f}s")
+
+        def override_get_db():
+            db = Session()
+            try:
+                yield db
+            finally:
+                db.close()
+
+        app.dependency_overrides[get_db] = override_get_db
+        try:
+            _run(TestClient(app), args.days, args.repeat)
+        finally:
+            app.dependency_overrides.clear()
+            engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Column-projected list pages vs. loading ORM entities.
+
+Builds a temporary SQLite database (rooms, guests, a year of bookings with
+payments) and times one page of each list endpoint's read path: the current
+column projection (rows -> response dicts -> orjson) against the ORM path it
+replaced (reproduced below as the legacy baseline: entities with the guest
+joinedloaded, then ``PaginatedResponse`` validation and JSON-mode dump, as
+FastAPI did for the ``response_model``). Each call uses a fresh session so
+identity-map bookkeeping is counted the way a request pays for it.
+
+Usage:
+    python -m benchmarks.bench_list_queries --rooms 200 --days 365 --page-size 100
+"""
+import argparse
+import os
+import tempfile
+import time
+import timeit
+
+from sqlalchemy.orm import joinedload
+
+from backend.app.core.responses import FastJSONResponse
+from backend.app.db import models
+from backend.app.schemas.booking import BookingResponse
+from backend.app.schemas.guest import GuestResponse
+from backend.app.schemas.payment import PaymentResponse
+from backend.app.schemas.room import RoomResponse
+from backend.app.services.booking_service import BookingService
+from backend.app.services.guest_service import GuestService
+from backend.app.services.payment_service import PaymentService
+from backend.app.services.room_service import RoomService
+from backend.app.utils.pagination import PaginatedResponse, apply_sorting, paginate
+
+from .bench_json import _setup_database
+
+
+def _legacy_page(db, model, schema, page_size, sort_by=None, sort_order="asc", options=()):
+    query = apply_sorting(db.query(model).options(*options), model, sort_by, sort_order)
+    page = paginate(query, 1, page_size)
+    content = PaginatedResponse[schema].model_validate(page).model_dump(mode="json")
+    return FastJSONResponse(content)
+
+
+def _cases(admin, page_size):
+    return {
+        "bookings": (
+            lambda db: _legacy_page(db, models.Booking, BookingResponse, page_size, "created_at", "desc",
+                                    (joinedload(models.Booking.guest),)),
+            lambda db: FastJSONResponse(BookingService.list_bookings(db, admin, 1, page_size)),
+        ),
+        "rooms": (
+            lambda db: _legacy_page(db, models.Room, RoomResponse, page_size),
+            lambda db: FastJSONResponse(RoomService.list_rooms(db, 1, page_size)),
+        ),
+        "guests": (
+            lambda db: _legacy_page(db, models.Guest, GuestResponse, page_size),
+            lambda db: FastJSONResponse(GuestService.list_guests(db, 1, page_size)),
+        ),
+        "payments": (
+            lambda db: _legacy_page(db, models.Payment, PaymentResponse, page_size, "created_at", "desc"),
+            lambda db: FastJSONResponse(PaymentService.list_payments(db, admin, 1, page_size)),
+        ),
+    }
+
+
+def _time(Session, fn, repeat: int) -> float:
+    """Best-of-``repeat`` milliseconds for one page on a fresh session."""
+    def run():
+        db = Session()
+        try:
+            fn(db)
+        finally:
+            db.close()
+
+    number = 5
+    return min(timeit.repeat(run, number=number, repeat=repeat)) / number * 1000
+
+
+def _run(Session, page_size: int, repeat: int):
+    db = Session()
+    admin = db.query(models.User).filter(models.User.username == "bench-admin").one()
+    db.close()
+
+    print(f"{'endpoint':<10} {'orm ms':>8} {'projected ms':>12} {'speedup':>7}")
+    for label, (legacy, projected) in _cases(admin, page_size).items():
+        db = Session()
+        assert legacy(db).body == projected(db).body, f"{label}: projected page differs from ORM page"
+        db.close()
+
+        legacy_ms = _time(Session, legacy, repeat)
+        projected_ms = _time(Session, projected, repeat)
+        print(f"{label:<10} {legacy_ms:8.3f} {projected_ms:12.3f} {legacy_ms / projected_ms:6.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rooms", type=int, default=200)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        started = time.perf_counter()
+        engine, Session, bookings = _setup_database(os.path.join(tmp, "bench.db"), args.rooms, args.days)
+        print(f"setup: {args.rooms} rooms, {bookings} bookings in {time.perf_counter() - started:.1f}s")
+        try:
+            _run(Session, args.page_size, args.repeat)
+        finally:
+            engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
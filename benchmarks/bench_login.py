@@ -0,0 +1,155 @@
+"""
+Login throughput vs. concurrent booking latency.
+
+Runs the ASGI app in-process against a temporary SQLite database. While a
+burst of concurrent logins is in flight, a second client keeps reading the
+bookings list; the report shows login throughput next to booking latency
+percentiles, with an idle baseline for comparison.
+
+Usage:
+    python -m benchmarks.bench_login --logins 200 --concurrency 50
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+
+import httpx
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from backend.app.main import app
+from backend.app.db import models
+from backend.app.db.session import get_db
+from backend.app.core.security import get_password_hash, create_access_token
+
+
+def _setup_database(path: str, bookings: int):
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    models.Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine, autoflush=False, autocommit=False, expire_on_commit=False)
+
+    db = Session()
+    admin = models.User(
+        username="bench-admin",
+        password_hash=get_password_hash("bench-password"),
+        permission_level=models.PermissionLevel.ADMIN,
+    )
+    room_type = models.RoomType(name="Bench", base_price=Decimal("100.00"), capacity=2)
+    db.add_all([admin, room_type])
+    db.flush()
+    room = models.Room(number="B-1", room_type_id=room_type.id, floor=1, price_per_night=Decimal("100.00"))
+    guest = models.Guest(name="Bench", surname="Guest", email="bench@example.com")
+    db.add_all([room, guest])
+    db.flush()
+    start = date.today()
+    for i in range(bookings):
+        db.add(models.Booking(
+            booking_number=f"BK-BENCH{i:05d}",
+            guest_id=guest.id,
+            room_id=room.id,
+            created_by=admin.id,
+            check_in=start + timedelta(days=i * 2),
+            check_out=start + timedelta(days=i * 2 + 1),
+            price_per_night=Decimal("100.00"),
+            total_price=Decimal("100.00"),
+            status=models.BookingStatus.CONFIRMED.value,
+        ))
+    db.commit()
+    db.close()
+    return engine, Session
+
+
+def _percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def _read_bookings(client, headers, stop: asyncio.Event, latencies: list):
+    while not stop.is_set():
+        started = time.perf_counter()
+        response = await client.get("/bookings/?page_size=50", headers=headers)
+        response.raise_for_status()
+        latencies.append((time.perf_counter() - started) * 1000)
+
+
+async def _login_burst(client, total: int, concurrency: int):
+    semaphore = asyncio.Semaphore(concurrency)
+    status_counts = {}
+
+    async def one_login():
+        async with semaphore:
+            response = await client.post(
+                "/auth/token", data={"username": "bench-admin", "password": "bench-password"}
+            )
+            status_counts[response.status_code] = status_counts.get(response.status_code, 0) + 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one_login() for _ in range(total)))
+    return time.perf_counter() - started, status_counts
+
+
+async def _run(logins: int, concurrency: int, baseline_seconds: float):
+    headers = {"Authorization": f"Bearer {create_access_token(subject='bench-admin')}"}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        # Idle baseline
+        baseline = []
+        stop = asyncio.Event()
+        reader = asyncio.create_task(_read_bookings(client, headers, stop, baseline))
+        await asyncio.sleep(baseline_seconds)
+        stop.set()
+        await reader
+
+        # Under login load
+        loaded = []
+        stop = asyncio.Event()
+        reader = asyncio.create_task(_read_bookings(client, headers, stop, loaded))
+        elapsed, status_counts = await _login_burst(client, logins, concurrency)
+        stop.set()
+        await reader
+
+    print(f"logins: {logins} in {elapsed:.2f}s ({logins / elapsed:.1f}/s), status codes: {status_counts}")
+    for label, values in (("idle", baseline), ("during logins", loaded)):
+        print(
+            f"booking list latency ({label}): n={len(values)} "
+            f"p50={_percentile(values, 50):.1f}ms p95={_percentile(values, 95):.1f}ms "
+            f"mean={statistics.fmean(values) if values else 0:.1f}ms"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--bookings", type=int, default=200)
+    parser.add_argument("--baseline-seconds", type=float, default=2.0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine, Session = _setup_database(os.path.join(tmp, "bench.db"), args.bookings)
+
+        def override_get_db():
+            db = Session()
+            try:
+                yield db
+            finally:
+                db.close()
+
+        app.dependency_overrides[get_db] = override_get_db
+        try:
+            asyncio.run(_run(args.logins, args.concurrency, args.baseline_seconds))
+        finally:
+            app.dependency_overrides.clear()
+            engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+"""
+Integer-cents vs. Decimal arithmetic in pricing and report hot paths.
+
+Times calculate_price (whole quote, and the rule-stacking arithmetic alone)
+and the per-day aggregation of revenue_report in their current integer form
+against the Decimal code they replaced (reproduced below as the legacy
+baseline). No database is involved, so the numbers isolate the arithmetic.
+
+Usage:
+    python -m benchmarks.bench_money --quotes 20000 --days 3650
+"""
+import argparse
+import random
+import timeit
+from datetime import date, timedelta
+from decimal import Decimal
+
+from backend.app.db import models
+from backend.app.schemas.pricing_rule import PriceCalculationResponse
+from backend.app.services.pricing_engine import CompiledRuleSet
+from backend.app.services.pricing_rule_service import PricingRuleService
+from backend.app.services.report_service import _daily_revenue_cents, _daterange
+from backend.app.utils.money import ExactAmount, apply_adjustments, div_round, from_cents, to_cents
+
+
+def _rule_set() -> CompiledRuleSet:
+    room_type = models.RoomType(id=1, name="Bench", base_price=Decimal("149.90"), capacity=2)
+    rules = [
+        models.PricingRule(id=1, name="Season", rule_type="seasonal", priority=9,
+                           adjustment_type="percentage", adjustment_value=Decimal("18.50")),
+        models.PricingRule(id=2, name="Weekend", rule_type="weekend", priority=7,
+                           adjustment_type="fixed_amount", adjustment_value=Decimal("25.00")),
+        models.PricingRule(id=3, name="Early Bird", rule_type="early_bird", priority=5,
+                           adjustment_type="percentage", adjustment_value=Decimal("-12.25")),
+        models.PricingRule(id=4, name="Loyalty", rule_type="loyalty", priority=1,
+                           adjustment_type="percentage", adjustment_value=Decimal("-5.00")),
+    ]
+    return CompiledRuleSet(rules, [room_type], version=())
+
+
+def _legacy_quote(rule_set: CompiledRuleSet, base_price: Decimal, check_in: date, check_out: date):
+    """calculate_price's former Decimal rule loop, totals and response."""
+    total_nights = (check_out - check_in).days
+    adjusted_price = base_price
+    applied = []
+    for rule in rule_set.applicable_rules(1, check_in, total_nights, 0):
+        old_price = adjusted_price
+        if rule.adjustment_type == "percentage":
+            adjusted_price += adjusted_price * (rule.adjustment_value / 100)
+        else:
+            adjusted_price += rule.adjustment_value
+        adjusted_price = max(Decimal("0.00"), adjusted_price)
+        applied.append({
+            "rule_id": rule.id,
+            "rule_name": rule.name,
+            "rule_type": rule.rule_type,
+            "adjustment_type": rule.adjustment_type,
+            "adjustment_value": float(rule.adjustment_value),
+            "price_before": float(old_price),
+            "price_after": float(adjusted_price),
+        })
+    total_price = adjusted_price * total_nights
+    savings = base_price * total_nights - total_price
+    return PriceCalculationResponse(
+        base_price=base_price,
+        total_nights=total_nights,
+        applied_rules=applied,
+        adjusted_price_per_night=adjusted_price,
+        total_price=total_price,
+        savings=savings,
+    )
+
+
+def _legacy_stack(base_price: Decimal, rules):
+    adjusted_price = base_price
+    steps = []
+    for rule in rules:
+        old_price = adjusted_price
+        if rule.adjustment_type == "percentage":
+            adjusted_price += adjusted_price * (rule.adjustment_value / 100)
+        else:
+            adjusted_price += rule.adjustment_value
+        adjusted_price = max(Decimal("0.00"), adjusted_price)
+        steps.append((float(old_price), float(adjusted_price)))
+    return adjusted_price
+
+
+def _legacy_revenue(rows: dict, start_date: date, end_date: date):
+    """revenue_report's former Decimal per-day aggregation."""
+    daily = []
+    total = Decimal('0')
+    for d in _daterange(start_date, end_date):
+        rev = rows.get(d) or Decimal('0')
+        rev = Decimal(rev).quantize(Decimal('0.01'))
+        daily.append({'date': d, 'revenue': rev})
+        total += rev
+    avg_daily = (total / Decimal(len(daily))).quantize(Decimal('0.01'))
+    max_daily = max(d['revenue'] for d in daily)
+    min_daily = min(d['revenue'] for d in daily)
+    return total.quantize(Decimal('0.01')), avg_daily, max_daily, min_daily
+
+
+def _cents_revenue(rows: dict, start_date: date, end_date: date):
+    """revenue_report's current integer aggregation (rows converted as fetched)."""
+    cents_rows = {d: to_cents(v) for d, v in rows.items()}
+    daily_cents = _daily_revenue_cents(cents_rows, start_date, end_date)
+    daily = [{'date': d, 'revenue': from_cents(c)} for d, c in daily_cents]
+    total = sum(c for _, c in daily_cents)
+    avg_daily = from_cents(div_round(total, len(daily)))
+    max_daily = from_cents(max(c for _, c in daily_cents))
+    min_daily = from_cents(min(c for _, c in daily_cents))
+    return from_cents(total), avg_daily, max_daily, min_daily
+
+
+def _report(label: str, legacy: float, current: float, operations: int):
+    print(
+        f"{label}: decimal {legacy / operations * 1e6:.2f}us/op, "
+        f"integer {current / operations * 1e6:.2f}us/op, speedup x{legacy / current:.2f}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--quotes", type=int, default=20000)
+    parser.add_argument("--days", type=int, default=3650)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    rng = random.Random(42)
+
+    # calculate_price rule stacking
+    rule_set = _rule_set()
+    base_price = rule_set.base_prices[1]
+    stays = []
+    for _ in range(args.quotes):
+        check_in = date.today() + timedelta(days=rng.randint(0, 365))
+        stays.append((check_in, check_in + timedelta(days=rng.randint(1, 14))))
+
+    # Same results before timing anything
+    for check_in, check_out in stays[:200]:
+        quote = PricingRuleService._quote(rule_set, base_price, 1, check_in, check_out, 0)
+        legacy = _legacy_quote(rule_set, base_price, check_in, check_out)
+        assert quote.model_dump() == legacy.model_dump()
+
+    legacy = min(timeit.repeat(
+        lambda: [_legacy_quote(rule_set, base_price, ci, co) for ci, co in stays], number=1, repeat=args.repeat
+    ))
+    current = min(timeit.repeat(
+        lambda: [PricingRuleService._quote(rule_set, base_price, 1, ci, co, 0) for ci, co in stays],
+        number=1, repeat=args.repeat,
+    ))
+    _report("calculate_price (incl. rule lookup and response model)", legacy, current, args.quotes)
+
+    # The rule-stacking arithmetic alone
+    stacks = [rule_set.applicable_rules(1, ci, (co - ci).days, 0) for ci, co in stays]
+    adjustments = [[rule.adjustment for rule in rules] for rules in stacks]
+    base = ExactAmount.from_decimal(base_price)
+    legacy = min(timeit.repeat(lambda: [_legacy_stack(base_price, rules) for rules in stacks], number=1, repeat=args.repeat))
+    current = min(timeit.repeat(
+        lambda: [apply_adjustments(base, steps)[0].to_decimal() for steps in adjustments], number=1, repeat=args.repeat
+    ))
+    _report("calculate_price rule stacking only", legacy, current, args.quotes)
+
+    # revenue_report per-day aggregation; SQLite returns SUM() of NUMERIC as float
+    start_date = date.today() - timedelta(days=args.days - 1)
+    end_date = date.today()
+    rows = {d: rng.randint(0, 5_000_000) / 100 for d in _daterange(start_date, end_date) if rng.random() < 0.9}
+    assert _legacy_revenue(rows, start_date, end_date) == _cents_revenue(rows, start_date, end_date)
+
+    legacy = min(timeit.repeat(lambda: _legacy_revenue(rows, start_date, end_date), number=1, repeat=args.repeat))
+    current = min(timeit.repeat(lambda: _cents_revenue(rows, start_date, end_date), number=1, repeat=args.repeat))
+    _report(f"revenue_report aggregation ({args.days} days)", legacy, current, args.days)
+
+
+if __name__ == "__main__":
+    main()
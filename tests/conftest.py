@@ -1,15 +1,24 @@
 import pytest
+from contextlib import contextmanager
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 from fastapi.testclient import TestClient
 
+import os
 import sys
+import tempfile
 sys.path.append(".")
 
+# Keep rendered invoice PDFs out of the working tree
+os.environ.setdefault("INVOICE_PDF_CACHE_DIR", tempfile.mkdtemp(prefix="hms-invoice-pdfs-"))
+# Tests use their own engine; the board loads on first use
+os.environ.setdefault("ROOM_STATUS_BOARD_PRELOAD", "false")
+
 from backend.app.main import app
 from backend.app.db.session import get_db
 from backend.app.db import models
+from backend.app.db.query_stats import capture_queries
 from backend.app.core.security import create_access_token
 
 # Use an in-memory SQLite database for tests
@@ -162,3 +171,20 @@ def guest(db):
     db.commit()
     db.refresh(guest)
     return guest
+
+
+@pytest.fixture(scope="function")
+def assert_max_queries():
+    """
+    Fail if the block runs more SQL statements than allowed:
+
+        with assert_max_queries(3):
+            client.get("/rooms/", headers=admin_headers)
+    """
+    @contextmanager
+    def check(limit: int):
+        with capture_queries() as stats:
+            yield stats
+        assert stats.count <= limit, f"expected at most {limit} queries, got {stats.report()}"
+
+    return check
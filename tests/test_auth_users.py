@@ -120,3 +120,56 @@ def test_deactivate_user_admin(client, admin_token):
     )
     assert response.status_code == 200
     assert not response.json()["is_active"]
+
+
+def test_login_rehashes_password_with_new_work_factor(client, db):
+    from backend.app.core import security
+    from backend.app.db import models
+
+    user = models.User(
+        username="legacyuser",
+        password_hash=security.get_password_hash("legacypass", rounds=4),
+    )
+    db.add(user)
+    db.commit()
+    assert security.password_needs_rehash(user.password_hash)
+
+    response = client.post(
+        "/auth/token", data={"username": "legacyuser", "password": "legacypass"}
+    )
+    assert response.status_code == 200
+
+    db.refresh(user)
+    assert not security.password_needs_rehash(user.password_hash)
+    assert security.verify_password("legacypass", user.password_hash)
+
+
+def test_login_returns_503_when_hash_pool_saturated(client, monkeypatch):
+    import threading
+    from backend.app.core import security
+
+    client.post("/auth/register", json={"username": "busyuser", "password": "busypass"})
+    monkeypatch.setattr(security, "_hash_slots", threading.Semaphore(0))
+
+    response = client.post(
+        "/auth/token", data={"username": "busyuser", "password": "busypass"}
+    )
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+
+
+def test_password_hashing_routes_use_hash_pool(client, admin_headers, monkeypatch):
+    import threading
+    from backend.app.core import security
+
+    response = client.post("/users/", headers=admin_headers, json={"username": "pooluser", "password": "poolpass"})
+    assert response.status_code == 200
+    user_id = response.json()["id"]
+    assert client.post("/auth/token", data={"username": "pooluser", "password": "poolpass"}).status_code == 200
+
+    monkeypatch.setattr(security, "_hash_slots", threading.Semaphore(0))
+    assert client.post("/auth/register", json={"username": "busyreg", "password": "busypass"}).status_code == 503
+    assert client.post("/users/", headers=admin_headers, json={"username": "busynew", "password": "busypass"}).status_code == 503
+    assert client.patch(f"/users/{user_id}", headers=admin_headers, json={"password": "newpass1"}).status_code == 503
+    # Updates without a password don't hash
+    assert client.patch(f"/users/{user_id}", headers=admin_headers, json={"is_active": False}).status_code == 200
@@ -202,3 +202,114 @@ def test_cancel_booking(client, admin_headers, room, guest):
     response = client.post(f"/bookings/{booking_id}/cancel", headers=admin_headers)
     assert response.status_code == 200
     assert response.json()["status"] == "cancelled"
+
+
+def test_create_booking_with_price_quote(client, admin_headers, room_type, room, guest):
+    client.post(
+        "/pricing-rules/",
+        json={
+            "name": "Promo",
+            "rule_type": "custom",
+            "adjustment_type": "percentage",
+            "adjustment_value": -20,
+        },
+        headers=admin_headers,
+    )
+    check_in = date.today() + timedelta(days=5)
+    check_out = check_in + timedelta(days=2)
+    quote = client.post(
+        "/pricing-rules/calculate-price",
+        json={
+            "room_type_id": room_type["id"],
+            "check_in": check_in.isoformat(),
+            "check_out": check_out.isoformat(),
+        },
+        headers=admin_headers,
+    ).json()
+    assert quote["quote_id"]
+
+    booking = {
+        "guest_id": guest["id"],
+        "room_id": room["id"],
+        "check_in": check_in.isoformat(),
+        "check_out": check_out.isoformat(),
+        "quote_id": quote["quote_id"],
+    }
+
+    # Dates must match the quoted stay
+    mismatched = dict(booking, check_out=(check_out + timedelta(days=1)).isoformat())
+    response = client.post("/bookings/", json=mismatched, headers=admin_headers)
+    assert response.status_code == 400
+
+    forged = dict(booking, quote_id=quote["quote_id"][:-1] + "x")
+    response = client.post("/bookings/", json=forged, headers=admin_headers)
+    assert response.status_code == 400
+
+    response = client.post("/bookings/", json=booking, headers=admin_headers)
+    assert response.status_code == 201
+    content = response.json()
+    # Quoted room type rate (100 - 20%), not the room's 150 list price
+    assert float(content["price_per_night"]) == 80.0
+    assert float(content["total_price"]) == 160.0
+
+    # Quotes are single-use
+    client.post(f"/bookings/{content['id']}/cancel", headers=admin_headers)
+    response = client.post("/bookings/", json=booking, headers=admin_headers)
+    assert response.status_code == 400
+    assert "already been used" in response.json()["detail"]
+
+
+def test_price_quote_bound_to_guest_and_tier(client, admin_headers, guest):
+    budget = client.post(
+        "/room-types/", json={"name": "Budget", "base_price": 10.05, "capacity": 1}, headers=admin_headers,
+    ).json()
+    room = client.post(
+        "/rooms/",
+        json={"number": "301", "room_type_id": budget["id"], "price_per_night": 12.0, "square_meters": 12, "floor": 3},
+        headers=admin_headers,
+    ).json()
+    client.post(
+        "/pricing-rules/",
+        json={
+            "name": "Gold", "rule_type": "loyalty", "adjustment_type": "percentage",
+            "adjustment_value": -50, "min_loyalty_tier": 2,
+        },
+        headers=admin_headers,
+    )
+    other = client.post(
+        "/guests/", json={"name": "Other", "surname": "Guest", "email": "other.guest@example.com"}, headers=admin_headers,
+    ).json()
+    check_in = date.today() + timedelta(days=5)
+    stay = {"room_type_id": budget["id"], "check_in": check_in.isoformat(), "check_out": (check_in + timedelta(days=2)).isoformat()}
+
+    def quote(**fields):
+        response = client.post("/pricing-rules/calculate-price", json=dict(stay, **fields), headers=admin_headers)
+        assert response.status_code == 200, response.text
+        return response.json()
+
+    def book(quote_id):
+        booking = {
+            "guest_id": guest["id"], "room_id": room["id"],
+            "check_in": stay["check_in"], "check_out": stay["check_out"], "quote_id": quote_id,
+        }
+        return client.post("/bookings/", json=booking, headers=admin_headers)
+
+    # A gold-tier price cannot be booked for a regular guest
+    gold = quote(guest_loyalty_tier=2)
+    response = book(gold["quote_id"])
+    assert response.status_code == 400
+    assert "loyalty tier" in response.json()["detail"]
+
+    # Nor can a quote issued to another guest
+    response = book(quote(guest_id=other["id"])["quote_id"])
+    assert response.status_code == 400
+
+    # Quoting for the guest uses their own tier
+    client.put(f"/guests/{guest['id']}", json={"vip_tier": 2}, headers=admin_headers)
+    for_guest = quote(guest_id=guest["id"])
+    assert float(for_guest["adjusted_price_per_night"]) == 5.025
+    response = book(for_guest["quote_id"])
+    assert response.status_code == 201, response.text
+    # 5.025 rounds half-up to 5.03, as a NUMERIC(10, 2) column would store it
+    assert float(response.json()["price_per_night"]) == 5.03
+    assert float(response.json()["total_price"]) == 10.06
@@ -0,0 +1,227 @@
+"""Tests for the live change event stream"""
+import asyncio
+import json
+import time
+from datetime import date, timedelta
+
+import pytest
+from fastapi import status
+from fastapi.testclient import TestClient
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from backend.app.db import models
+from backend.app.services import event_stream
+
+
+@pytest.fixture
+def bus():
+    """Fresh in-process bus and buffer per test"""
+    bus = event_stream.InProcessBus()
+    event_stream.set_bus(bus)
+    yield bus
+    event_stream.set_bus(None)
+
+
+def _parse(chunk: str) -> dict:
+    fields = dict(line.split(": ", 1) for line in chunk.strip().splitlines() if not line.startswith(":"))
+    if "data" in fields:
+        fields["data"] = json.loads(fields["data"])
+    return fields
+
+
+def test_commit_publishes_deltas(client: TestClient, db: Session, bus, admin_headers, room, guest):
+    """Test booking and room changes are published once committed"""
+    since = time.time_ns()
+    tomorrow = date.today() + timedelta(days=1)
+
+    response = client.post(
+        "/bookings/",
+        headers=admin_headers,
+        json={
+            "guest_id": guest.id,
+            "room_id": room.id,
+            "check_in": tomorrow.isoformat(),
+            "check_out": (tomorrow + timedelta(days=1)).isoformat(),
+            "num_guests": 1
+        }
+    )
+    booking_id = response.json()["id"]
+    client.put(f"/rooms/{room.id}", headers=admin_headers, json={"maintenance_status": "maintenance"})
+
+    events = event_stream.replay(since)
+    booking_event = next(e for e in events if e["type"] == "booking")
+    assert booking_event["event_id"] > since
+    assert booking_event["booking_id"] == booking_id
+    assert booking_event["op"] == "created"
+    assert booking_event["room_id"] == room.id
+    assert booking_event["check_in"] == tomorrow.isoformat()
+    assert booking_event["status"] == models.BookingStatus.PENDING.value
+    room_event = next(e for e in events if e["type"] == "room")
+    assert room_event["room_id"] == room.id
+    assert room_event["maintenance_status"] == "maintenance"
+    assert [e["event_id"] for e in events] == sorted(e["event_id"] for e in events)
+
+
+def test_rollback_publishes_nothing(db: Session, bus, room):
+    """Test rolled back changes are not published"""
+    since = time.time_ns()
+    room.maintenance_status = models.RoomMaintenanceStatus.MAINTENANCE
+    db.flush()
+    db.rollback()
+
+    assert event_stream.replay(since) == []
+
+
+def test_bulk_update_publishes_refresh(db: Session, bus, room):
+    """Test bulk statements publish one refresh event for the entity"""
+    since = time.time_ns()
+    db.execute(update(models.HousekeepingTask).values(notes="Bulk edit"))
+    db.execute(update(models.HousekeepingTask).values(notes="Bulk edit again"))
+    db.commit()
+
+    refreshes = [e for e in event_stream.replay(since) if e.get("op") == "refresh"]
+    assert [e["type"] for e in refreshes] == ["task"]
+
+
+def test_ring_buffer_resume_and_gap():
+    """Test resume returns only newer events and detects evicted ones"""
+    buffer = event_stream.EventBuffer(3)
+    for event_id in range(1, 6):
+        buffer.append({"event_id": event_id, "type": "room"})
+
+    assert [e["event_id"] for e in buffer.since(3)] == [4, 5]
+    assert buffer.since(5) == []
+    assert buffer.since(1) is None  # Event 2 was evicted
+
+
+def test_ring_buffer_resume_with_out_of_order_arrival():
+    """Test resume keeps events from other workers that arrive out of id order"""
+    buffer = event_stream.EventBuffer(10)
+    for event_id in (10, 30, 20, 40):
+        buffer.append({"event_id": event_id, "type": "room"})
+
+    # Event 20 arrived after 30, so a client that saw 30 here has not seen it
+    assert [e["event_id"] for e in buffer.since(30)] == [20, 40]
+    # A client that saw 20 may not have 30 if its worker received them in another order
+    assert [e["event_id"] for e in buffer.since(20)] == [30, 40]
+    assert [e["event_id"] for e in buffer.since(25)] == [30, 40]
+
+
+def test_event_filter():
+    """Test per-client type and room filters"""
+    event_filter = event_stream.EventFilter(["task"], [7])
+
+    assert event_filter.matches({"type": "task", "task_id": 1, "room_id": 7})
+    assert not event_filter.matches({"type": "task", "task_id": 1, "room_id": 8})
+    assert not event_filter.matches({"type": "booking", "booking_id": 1, "room_id": 7})
+    assert event_filter.matches({"type": "task", "op": "refresh"})
+    assert event_stream.EventFilter(None, [7]).matches({"type": "room", "room_id": 7})
+
+
+def test_stream_replays_then_follows_live_events(bus):
+    """Test a resumed stream replays missed events, skips filtered ones and then goes live"""
+    async def scenario():
+        since = time.time_ns()
+        event_stream.publish([
+            {"type": "task", "op": "updated", "task_id": 10, "room_id": 1},
+            {"type": "task", "op": "updated", "task_id": 11, "room_id": 2},
+        ])
+        stream = event_stream.stream(event_stream.EventFilter(["task"], [1]), since)
+        chunks = [await stream.__anext__(), await stream.__anext__()]
+
+        event_stream.publish([{"type": "task", "op": "created", "task_id": 12, "room_id": 1}])
+        chunks.append(await stream.__anext__())
+
+        event_stream.shutdown()
+        with pytest.raises(StopAsyncIteration):
+            await stream.__anext__()
+        return chunks
+
+    chunks = asyncio.run(scenario())
+
+    assert chunks[0].startswith("retry:")
+    replayed, live = _parse(chunks[1]), _parse(chunks[2])
+    assert replayed["event"] == "task"
+    assert replayed["data"]["task_id"] == 10
+    assert live["data"]["op"] == "created"
+    assert int(live["id"]) > int(replayed["id"])
+
+
+def test_stream_keeps_live_events_with_older_ids(bus):
+    """Test live events from another worker are not dropped for having a smaller id than a replayed one"""
+    def deliver(event_id, task_id):
+        event_stream._deliver(json.dumps({"type": "task", "op": "updated", "task_id": task_id, "event_id": event_id}).encode())
+
+    async def scenario():
+        since = time.time_ns()
+        event_stream.publish([{"type": "task", "op": "updated", "task_id": 10}])
+        stream = event_stream.stream(event_stream.EventFilter(), since)
+        chunks = [await stream.__anext__(), await stream.__anext__()]
+        replayed_id = int(_parse(chunks[1])["id"])
+
+        deliver(replayed_id, 10)  # Replayed already: skipped
+        deliver(replayed_id - 1000, 11)  # Another worker's clock is slightly behind
+        chunks.append(await stream.__anext__())
+        await stream.aclose()
+        return chunks
+
+    chunks = asyncio.run(scenario())
+
+    assert _parse(chunks[2])["data"]["task_id"] == 11
+
+
+def test_stream_resets_when_resume_point_is_too_old(bus):
+    """Test resuming from before the buffered history asks the client to reset"""
+    async def scenario():
+        stream = event_stream.stream(event_stream.EventFilter(), last_event_id=1)
+        chunks = [await stream.__anext__(), await stream.__anext__()]
+        await stream.aclose()
+        return chunks
+
+    chunks = asyncio.run(scenario())
+
+    assert _parse(chunks[1])["event"] == "reset"
+
+
+def test_local_socket_bus_fans_out(tmp_path):
+    """Test every socket bus in the directory receives each publish"""
+    received = {"a": [], "b": []}
+    buses = {name: event_stream.LocalSocketBus(str(tmp_path)) for name in received}
+    for name, bus in buses.items():
+        bus.start(received[name].append)
+    try:
+        # A socket file left behind by a dead worker is cleaned up
+        (tmp_path / "dead.sock").touch()
+        buses["a"].publish(b'{"type":"room"}')
+
+        deadline = time.monotonic() + 5
+        while time.monotonic() < deadline and not all(received.values()):
+            time.sleep(0.01)
+    finally:
+        for bus in buses.values():
+            bus.close()
+
+    assert received == {"a": [b'{"type":"room"}'], "b": [b'{"type":"room"}']}
+    assert not (tmp_path / "dead.sock").exists()
+
+
+def test_incomplete_bus_fails_on_creation():
+    """Test a bus backend missing publish() is rejected when created, not on first publish"""
+    class StartOnlyBus(event_stream.EventBus):
+        def start(self, deliver):
+            pass
+
+    with pytest.raises(TypeError):
+        StartOnlyBus()
+
+
+def test_stream_endpoint_validation(client: TestClient, admin_headers):
+    """Test the stream endpoint requires auth and known filters"""
+    assert client.get("/events/stream").status_code == status.HTTP_401_UNAUTHORIZED
+
+    response = client.get("/events/stream?types=room,invoice", headers=admin_headers)
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    response = client.get("/events/stream?rooms=1,x", headers=admin_headers)
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
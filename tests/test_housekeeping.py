@@ -7,6 +7,7 @@ from datetime import date, time, datetime, timedelta
 from fastapi import status
 
 from backend.app.db.models import TaskStatus, TaskType, TaskPriority
+from backend.app.services import task_notifier
 
 
 @pytest.fixture
@@ -256,6 +257,33 @@ def test_update_housekeeping_task(client, db, admin_headers, room):
     assert data["notes"] == "Urgent cleaning required"
 
 
+def test_update_task_validates_scheduled_time(client, db, admin_user, admin_headers, room):
+    """A malformed scheduled_time is rejected with 422; legacy values sort at end of day"""
+    from backend.app.db.models import HousekeepingTask
+
+    today = date.today()
+    task_id = client.post(
+        "/housekeeping/tasks/",
+        headers=admin_headers,
+        json={"room_id": room.id, "task_type": "cleaning", "scheduled_date": today.isoformat()},
+    ).json()["id"]
+
+    response = client.patch(f"/housekeeping/tasks/{task_id}", headers=admin_headers, json={"scheduled_time": "2pm"})
+    assert response.status_code == 422
+
+    response = client.patch(f"/housekeeping/tasks/{task_id}", headers=admin_headers, json={"scheduled_time": "14:30"})
+    assert response.status_code == status.HTTP_200_OK
+    db.expire_all()
+    assert db.get(HousekeepingTask, task_id).scheduled_at == datetime.combine(today, time(14, 30))
+
+    # Rows written before validation existed must not break the queue columns
+    legacy = HousekeepingTask(room_id=room.id, task_type="cleaning", scheduled_date=today, scheduled_time="2pm",
+                              created_by=admin_user.id)
+    db.add(legacy)
+    db.commit()
+    assert legacy.scheduled_at == datetime.combine(today, time(23, 59, 59))
+
+
 def test_update_task_as_staff_fails(client, db, admin_headers, staff_user, room):
     """Test that staff cannot update tasks"""
     tomorrow = (date.today() + timedelta(days=1)).isoformat()
@@ -635,3 +663,187 @@ def test_task_workflow_full_cycle(client, db, admin_headers, staff_user, room):
     assert final_task["assigned_to"] == staff_id
     assert final_task["completion_notes"] == "Room cleaned to VIP standards"
     assert final_task["verification_notes"] == "Inspected - excellent work"
+
+
+def test_task_queue_columns_order_and_overdue(client, db, admin_headers, room):
+    """priority_rank / scheduled_at are kept in sync and drive ordering and the overdue filter"""
+    from backend.app.db.models import HousekeepingTask
+
+    yesterday = (date.today() - timedelta(days=1)).isoformat()
+    tomorrow = (date.today() + timedelta(days=1)).isoformat()
+
+    def create(priority, scheduled_date, scheduled_time=None):
+        payload = {"room_id": room.id, "task_type": "cleaning", "priority": priority, "scheduled_date": scheduled_date}
+        if scheduled_time:
+            payload["scheduled_time"] = scheduled_time
+        response = client.post("/housekeeping/tasks/", headers=admin_headers, json=payload)
+        assert response.status_code == status.HTTP_201_CREATED
+        return response.json()["id"]
+
+    late_low = create("low", yesterday, "09:00")
+    future_urgent = create("urgent", tomorrow, "14:00")
+    future_urgent_early = create("urgent", tomorrow, "08:30")
+    past_normal_untimed = create("normal", yesterday)
+
+    task = db.query(HousekeepingTask).filter(HousekeepingTask.id == past_normal_untimed).one()
+    assert task.priority_rank == 3
+    assert task.scheduled_at == datetime.combine(date.today() - timedelta(days=1), time(23, 59, 59))
+
+    ids = [t["id"] for t in client.get("/housekeeping/tasks/", headers=admin_headers).json()]
+    assert ids == [future_urgent_early, future_urgent, past_normal_untimed, late_low]
+
+    overdue = {t["id"] for t in client.get("/housekeeping/tasks/?is_overdue=true", headers=admin_headers).json()}
+    assert overdue == {late_low, past_normal_untimed}
+
+    # Updates re-derive the columns
+    response = client.patch(
+        f"/housekeeping/tasks/{late_low}", headers=admin_headers,
+        json={"priority": "urgent", "scheduled_date": tomorrow},
+    )
+    assert response.status_code == status.HTTP_200_OK
+    db.expire_all()
+    task = db.query(HousekeepingTask).filter(HousekeepingTask.id == late_low).one()
+    assert task.priority_rank == 1
+    assert task.scheduled_at == datetime.combine(date.today() + timedelta(days=1), time(9, 0))
+    not_overdue = {t["id"] for t in client.get("/housekeeping/tasks/?is_overdue=false", headers=admin_headers).json()}
+    assert not_overdue == {late_low, future_urgent, future_urgent_early}
+
+
+def test_batch_sync_applies_queue_with_per_item_results(client, db, admin_headers, room, staff_user):
+    """A device's offline queue is applied in one call and can be replayed safely"""
+    from backend.app.db.models import HousekeepingTask
+
+    today = date.today()
+    staff_id = staff_user["user"].id
+    tasks = []
+    for assigned in (staff_id, staff_id, None):
+        task = HousekeepingTask(room_id=room.id, task_type="cleaning", status="pending", scheduled_date=today,
+                                assigned_to=assigned, created_by=staff_id)
+        db.add(task)
+        tasks.append(task)
+    db.commit()
+    mine, mine_too, unassigned = (t.id for t in tasks)
+    seen = task_notifier.version()
+
+    started = datetime.now() - timedelta(minutes=40)
+    finished = datetime.now() - timedelta(minutes=5)
+    operations = [
+        # Deliberately out of order: applied by occurred_at
+        {"op_id": "op-2", "task_id": mine, "action": "complete", "occurred_at": finished.isoformat(),
+         "completion_notes": "Done offline", "actual_duration_minutes": 35},
+        {"op_id": "op-1", "task_id": mine, "action": "start", "occurred_at": started.isoformat()},
+        {"op_id": "op-3", "task_id": mine_too, "action": "start", "occurred_at": started.isoformat()},
+        {"op_id": "op-4", "task_id": unassigned, "action": "start", "occurred_at": started.isoformat()},
+        {"op_id": "op-5", "task_id": 99999, "action": "complete", "occurred_at": finished.isoformat()},
+    ]
+    response = client.post("/housekeeping/tasks/sync", headers=staff_user["headers"], json={"operations": operations})
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert [r["op_id"] for r in data["results"]] == ["op-2", "op-1", "op-3", "op-4", "op-5"]
+    assert [r["result"] for r in data["results"]] == ["applied", "applied", "applied", "rejected", "rejected"]
+    assert (data["applied"], data["duplicates"], data["rejected"]) == (3, 0, 2)
+    assert task_notifier.version() > seen  # Long-polls re-check the queue
+
+    db.expire_all()
+    task = db.query(HousekeepingTask).filter(HousekeepingTask.id == mine).one()
+    assert task.status == "completed"
+    assert task.started_at.replace(tzinfo=None) == started
+    assert task.completed_at.replace(tzinfo=None) == finished
+    assert task.completion_notes == "Done offline"
+    assert db.query(HousekeepingTask).filter(HousekeepingTask.id == mine_too).one().status == "in_progress"
+
+    # Replaying the same batch (response lost on a flaky connection) changes nothing
+    seen = task_notifier.version()
+    replay = client.post("/housekeeping/tasks/sync", headers=staff_user["headers"], json={"operations": operations}).json()
+    assert [r["result"] for r in replay["results"]] == ["duplicate", "duplicate", "duplicate", "rejected", "rejected"]
+    assert task_notifier.version() == seen
+    db.expire_all()
+    assert db.query(HousekeepingTask).filter(HousekeepingTask.id == mine).one().completed_at.replace(tzinfo=None) == finished
+
+
+def test_next_task_returns_own_then_claims_unassigned(client, db, admin_headers, room, staff_user):
+    """next-task serves the caller's own work first, then claims unassigned tasks once"""
+    from backend.app.db.models import HousekeepingTask, User, PermissionLevel
+    from backend.app.services.housekeeping_service import HousekeepingService
+
+    today = date.today()
+    staff_id = staff_user["user"].id
+    own = HousekeepingTask(room_id=room.id, task_type="inspection", priority="low", status="pending",
+                           scheduled_date=today, assigned_to=staff_id, created_by=staff_id)
+    urgent = HousekeepingTask(room_id=room.id, task_type="cleaning", priority="urgent", status="pending",
+                              scheduled_date=today, created_by=staff_id)
+    future = HousekeepingTask(room_id=room.id, task_type="cleaning", priority="urgent", status="pending",
+                              scheduled_date=today + timedelta(days=2), created_by=staff_id)
+    db.add_all([own, urgent, future])
+    db.commit()
+
+    response = client.get("/housekeeping/tasks/next?wait=0", headers=staff_user["headers"])
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["id"] == own.id
+
+    client.post(f"/housekeeping/tasks/{own.id}/start", headers=staff_user["headers"])
+    response = client.get("/housekeeping/tasks/next?wait=0", headers=staff_user["headers"])
+    assert response.json()["id"] == urgent.id
+    assert response.json()["assigned_to"] == staff_id
+
+    # Another housekeeper cannot claim the same task; future work is not offered
+    other = User(username="staff_other", password_hash="x", permission_level=PermissionLevel.REGULAR.value)
+    db.add(other)
+    db.commit()
+    assert HousekeepingService(db).next_task(other.id) is None
+    response = client.get("/housekeeping/tasks/next?wait=0", headers=staff_user["headers"])
+    assert response.json()["id"] == urgent.id
+
+
+def test_next_task_long_poll_wakes_on_new_task(client, db, admin_user, room, staff_user):
+    """A waiting long-poll returns as soon as a task is created"""
+    import threading
+    import time as time_module
+    from backend.app.schemas.housekeeping import HousekeepingTaskCreate
+    from backend.app.services.housekeeping_service import HousekeepingService
+
+    response = client.get("/housekeeping/tasks/next?wait=0", headers=staff_user["headers"])
+    assert response.status_code == status.HTTP_204_NO_CONTENT
+
+    def create_later():
+        time_module.sleep(0.3)
+        HousekeepingService(db).create_task(
+            HousekeepingTaskCreate(room_id=room.id, task_type="cleaning", scheduled_date=date.today()),
+            created_by_id=admin_user.id,
+        )
+
+    creator = threading.Thread(target=create_later)
+    started = time_module.monotonic()
+    creator.start()
+    response = client.get("/housekeeping/tasks/next?wait=10", headers=staff_user["headers"])
+    creator.join()
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["assigned_to"] == staff_user["user"].id
+    assert time_module.monotonic() - started < 5
+
+
+def test_next_task_long_poll_releases_connection_while_waiting(client, db, admin_user, room, staff_user):
+    """A parked long-poll holds no open transaction, so its pooled connection is free"""
+    import threading
+    import time as time_module
+    from backend.app.schemas.housekeeping import HousekeepingTaskCreate
+    from backend.app.services.housekeeping_service import HousekeepingService
+
+    in_transaction = []
+
+    def create_when_parked():
+        deadline = time_module.monotonic() + 5
+        while not task_notifier._waiters and time_module.monotonic() < deadline:
+            time_module.sleep(0.01)
+        in_transaction.append(db.in_transaction())
+        HousekeepingService(db).create_task(
+            HousekeepingTaskCreate(room_id=room.id, task_type="cleaning", scheduled_date=date.today()),
+            created_by_id=admin_user.id,
+        )
+
+    creator = threading.Thread(target=create_when_parked)
+    creator.start()
+    response = client.get("/housekeeping/tasks/next?wait=10", headers=staff_user["headers"])
+    creator.join()
+    assert response.status_code == status.HTTP_200_OK
+    assert in_transaction == [False]
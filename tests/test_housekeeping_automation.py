@@ -263,3 +263,142 @@ def test_high_priority_for_next_day_checkin(client: TestClient, db: Session, adm
     checkout_task = next((t for t in tasks if t["is_checkout_cleaning"]), None)
     assert checkout_task is not None
     assert checkout_task["priority"] == "high"
+
+
+def test_generate_daily_tasks_builds_schedule(client: TestClient, db: Session, admin_headers, room_type, guest):
+    """Daily generation creates checkout, stayover and turndown tasks with arrival-based priorities"""
+    from backend.app.db import models
+
+    today = date.today()
+    rooms = []
+    for number in ("501", "502", "503", "504"):
+        r = models.Room(number=number, room_type_id=room_type.id, price_per_night=100, floor=5)
+        db.add(r)
+        rooms.append(r)
+    db.commit()
+
+    def add_booking(number, r, check_in, check_out, booking_status):
+        b = models.Booking(
+            booking_number=number, guest_id=guest.id, room_id=r.id, check_in=check_in, check_out=check_out,
+            number_of_guests=1, price_per_night=100, total_price=100, status=booking_status.value,
+        )
+        db.add(b)
+        return b
+
+    # 501: departs today, next guest arrives today -> urgent
+    add_booking("GEN-1", rooms[0], today - timedelta(days=2), today, BookingStatus.CHECKED_IN)
+    add_booking("GEN-2", rooms[0], today, today + timedelta(days=2), BookingStatus.CONFIRMED)
+    # 502: departed today, next guest tomorrow -> high
+    add_booking("GEN-3", rooms[1], today - timedelta(days=1), today, BookingStatus.CHECKED_OUT)
+    add_booking("GEN-4", rooms[1], today + timedelta(days=1), today + timedelta(days=3), BookingStatus.PENDING)
+    # 503: stayover
+    stay = add_booking("GEN-5", rooms[2], today - timedelta(days=1), today + timedelta(days=2), BookingStatus.CHECKED_IN)
+    # 504: departs today, nothing next -> normal
+    add_booking("GEN-6", rooms[3], today - timedelta(days=3), today, BookingStatus.CHECKED_IN)
+    db.commit()
+
+    response = client.post("/housekeeping/tasks/generate", headers=admin_headers)
+    assert response.status_code == status.HTTP_200_OK
+    result = response.json()
+    assert result["scheduled_date"] == today.isoformat()
+    assert result["checkout_cleanings"] == 3
+    assert result["stayover_cleanings"] == 1
+    assert result["turndowns"] == 1
+    assert result["tasks_created"] == 5
+
+    tasks = client.get(f"/housekeeping/tasks/?scheduled_date={today.isoformat()}", headers=admin_headers).json()
+    checkout = {t["room_id"]: t for t in tasks if t["is_checkout_cleaning"]}
+    assert checkout[rooms[0].id]["priority"] == "urgent"
+    assert checkout[rooms[1].id]["priority"] == "high"
+    assert checkout[rooms[3].id]["priority"] == "normal"
+    stay_tasks = sorted(t["task_type"] for t in tasks if t["booking_id"] == stay.id)
+    assert stay_tasks == ["cleaning", "turndown"]
+
+    # Re-running adds nothing
+    again = client.post("/housekeeping/tasks/generate", headers=admin_headers).json()
+    assert again["tasks_created"] == 0
+    assert again["skipped_existing"] == 5
+
+    # Checking out a pre-scheduled departure does not duplicate its cleaning task
+    departing = db.query(models.Booking).filter(models.Booking.booking_number == "GEN-6").one()
+    assert client.post(f"/bookings/{departing.id}/check-out", headers=admin_headers).status_code == status.HTTP_200_OK
+    assert db.query(models.HousekeepingTask).filter(
+        models.HousekeepingTask.booking_id == departing.id,
+        models.HousekeepingTask.is_checkout_cleaning.is_(True),
+    ).count() == 1
+
+
+def test_generate_daily_tasks_requires_manager(client: TestClient, regular_headers):
+    response = client.post("/housekeeping/tasks/generate", headers=regular_headers)
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+def test_plan_assignments_balances_minutes_and_clusters_floors():
+    """Greedy planner keeps workloads even and each person on few floors"""
+    from backend.app.services.housekeeping_service import HousekeepingService
+
+    tasks = []
+    task_id = 0
+    for floor in range(1, 9):
+        for _ in range(10):
+            task_id += 1
+            tasks.append((task_id, floor, 30, "normal"))
+    plan = HousekeepingService.plan_assignments(tasks, [101, 102, 103, 104])
+
+    assert len(plan) == len(tasks)
+    minutes = {staff: 0 for staff in (101, 102, 103, 104)}
+    floors = {staff: set() for staff in minutes}
+    for task_id, floor, duration, _ in tasks:
+        minutes[plan[task_id]] += duration
+        floors[plan[task_id]].add(floor)
+    assert max(minutes.values()) - min(minutes.values()) <= 30
+    assert all(len(f) <= 3 for f in floors.values())
+
+    assert HousekeepingService.plan_assignments([], [1]) == {}
+
+
+def test_auto_assign_tasks_bulk_assigns_unassigned(client: TestClient, db: Session, admin_headers, regular_user, room_type):
+    from backend.app.db import models
+
+    helper = models.User(username="housekeeper2", password_hash="x", permission_level=models.PermissionLevel.REGULAR)
+    db.add(helper)
+    rooms = [models.Room(number=f"6{i:02d}", room_type_id=room_type.id, price_per_night=100, floor=1 + i // 4)
+             for i in range(8)]
+    db.add_all(rooms)
+    db.commit()
+
+    today = date.today()
+    for r in rooms:
+        db.add(models.HousekeepingTask(room_id=r.id, task_type="cleaning", priority="normal", status="pending",
+                                       scheduled_date=today, estimated_duration_minutes=30, created_by=regular_user.id))
+    # Already assigned and other-day tasks are left alone
+    db.add(models.HousekeepingTask(room_id=rooms[0].id, task_type="inspection", status="pending", scheduled_date=today,
+                                   assigned_to=helper.id, estimated_duration_minutes=30, created_by=regular_user.id))
+    db.add(models.HousekeepingTask(room_id=rooms[0].id, task_type="cleaning", status="pending",
+                                   scheduled_date=today + timedelta(days=1), created_by=regular_user.id))
+    db.commit()
+
+    response = client.post("/housekeeping/tasks/auto-assign", headers=admin_headers, json={})
+    assert response.status_code == status.HTTP_200_OK
+    result = response.json()
+    assert result["tasks_assigned"] == 8
+    workload = {s["user_id"]: s for s in result["staff"]}
+    assert workload[regular_user.id]["total_minutes"] == 120
+    assert workload[helper.id]["total_minutes"] == 120
+    assert len(workload[regular_user.id]["floors"]) == 1
+    assert len(workload[helper.id]["floors"]) == 1
+
+    db.expire_all()
+    assert db.query(models.HousekeepingTask).filter(
+        models.HousekeepingTask.scheduled_date == today,
+        models.HousekeepingTask.assigned_to.is_(None),
+    ).count() == 0
+    assert db.query(models.HousekeepingTask).filter(
+        models.HousekeepingTask.scheduled_date == today + timedelta(days=1),
+    ).one().assigned_to is None
+
+    # Nothing left to assign; unknown staff is rejected
+    assert client.post("/housekeeping/tasks/auto-assign", headers=admin_headers, json={}).json()["tasks_assigned"] == 0
+    assert client.post(
+        "/housekeeping/tasks/auto-assign", headers=admin_headers, json={"staff_ids": [9999]}
+    ).status_code == status.HTTP_404_NOT_FOUND
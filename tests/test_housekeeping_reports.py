@@ -328,3 +328,92 @@ def test_housekeeping_dashboard_permissions(client: TestClient, db: Session):
         headers=staff_headers
     )
     assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+def _grid_room(client: TestClient, headers, room_id):
+    response = client.get("/reports/housekeeping/room-status-grid", headers=headers)
+    assert response.status_code == status.HTTP_200_OK
+    return next(r for r in response.json()["rooms"] if r["room_id"] == room_id)
+
+
+def test_room_status_grid_tracks_check_in_and_tasks(client: TestClient, db: Session, admin_user, admin_headers, room, guest):
+    """Test the grid follows check-in, task progress and room edits"""
+    today = date.today().isoformat()
+    tomorrow = (date.today() + timedelta(days=1)).isoformat()
+    
+    assert _grid_room(client, admin_headers, room.id)["current_guest"] is None
+    
+    booking_id = client.post(
+        "/bookings/",
+        headers=admin_headers,
+        json={"guest_id": guest.id, "room_id": room.id, "check_in": today, "check_out": tomorrow, "num_guests": 1}
+    ).json()["id"]
+    client.post(f"/bookings/{booking_id}/confirm", headers=admin_headers)
+    assert _grid_room(client, admin_headers, room.id)["next_booking_checkin"] == today
+    
+    client.post(f"/bookings/{booking_id}/check-in", headers=admin_headers)
+    info = _grid_room(client, admin_headers, room.id)
+    assert info["current_guest"] == f"{guest.name} {guest.surname}"
+    assert info["next_booking_checkin"] is None
+    
+    task_id = client.post(
+        "/housekeeping/tasks/",
+        headers=admin_headers,
+        json={"room_id": room.id, "task_type": "cleaning", "scheduled_date": today, "assigned_to": admin_user.id}
+    ).json()["id"]
+    info = _grid_room(client, admin_headers, room.id)
+    assert info["has_pending_tasks"] is True
+    assert info["has_in_progress_tasks"] is False
+    
+    client.post(f"/housekeeping/tasks/{task_id}/start", headers=admin_headers)
+    info = _grid_room(client, admin_headers, room.id)
+    assert info["has_pending_tasks"] is False
+    assert info["has_in_progress_tasks"] is True
+    
+    client.post(f"/housekeeping/tasks/{task_id}/complete", headers=admin_headers, json={})
+    assert _grid_room(client, admin_headers, room.id)["has_in_progress_tasks"] is False
+    
+    client.put(f"/rooms/{room.id}", headers=admin_headers, json={"maintenance_status": "out_of_service"})
+    assert _grid_room(client, admin_headers, room.id)["maintenance_status"] == "out_of_service"
+
+
+def test_room_status_grid_served_from_memory(client: TestClient, db: Session, admin_headers, room):
+    """Test repeated grid reads do not query board tables"""
+    from sqlalchemy import event
+    
+    _grid_room(client, admin_headers, room.id)  # Loads the board
+    
+    statements = []
+    
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    
+    engine = db.get_bind()
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        _grid_room(client, admin_headers, room.id)
+        _grid_room(client, admin_headers, room.id)
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+    
+    # Only authentication touches the database
+    assert not [s for s in statements if "housekeeping_tasks" in s or "bookings" in s or "rooms" in s]
+
+
+def test_room_status_board_keeps_rooms_marked_during_refresh(client: TestClient, db: Session, admin_headers, room, monkeypatch):
+    """Test a room invalidated while its refresh is reading stays stale for the next read"""
+    from backend.app.services import room_status_board
+
+    _grid_room(client, admin_headers, room.id)  # Loads the board
+    room_status_board.invalidate([room.id])
+
+    load = room_status_board._load
+
+    def load_and_race(db, today, room_ids=None):
+        records = load(db, today, room_ids)
+        room_status_board.invalidate([room.id])  # A write commits while we read
+        return records
+
+    monkeypatch.setattr(room_status_board, "_load", load_and_race)
+    room_status_board.snapshot(db)
+    assert room.id in room_status_board._stale_rooms
@@ -0,0 +1,148 @@
+"""Tests for ETag / Last-Modified conditional GETs"""
+from datetime import date, datetime, timedelta, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+
+from fastapi import status
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from backend.app.core.config import settings
+from backend.app.dependencies import http_cache
+from backend.app.services.room_service import RoomService
+
+
+def test_reference_data_etag_and_cache_control(client: TestClient, admin_headers, room_type, monkeypatch):
+    """Test room types carry validators, revalidate to 304 and change after a write"""
+    monkeypatch.setattr(http_cache, "LAST_MODIFIED_SETTLE", timedelta(0))
+    response = client.get("/room-types/", headers=admin_headers)
+    assert response.status_code == status.HTTP_200_OK
+    etag = response.headers["ETag"]
+    assert etag.startswith('W/"')
+    assert response.headers["Cache-Control"] == "private, max-age=300"
+    assert "Last-Modified" in response.headers
+
+    response = client.get("/room-types/", headers={**admin_headers, "If-None-Match": etag})
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert response.content == b""
+    assert response.headers["ETag"] == etag
+
+    client.post("/room-types/", headers=admin_headers, json={"name": "Single Room", "base_price": 80.0, "capacity": 1})
+
+    response = client.get("/room-types/", headers={**admin_headers, "If-None-Match": etag})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["ETag"] != etag
+    assert len(response.json()) == 2
+
+
+def test_not_modified_skips_route_query(client: TestClient, admin_headers, room, monkeypatch):
+    """Test a matching If-None-Match returns 304 without running the list query"""
+    etag = client.get("/rooms/", headers=admin_headers).headers["ETag"]
+    assert client.get("/rooms/", headers=admin_headers).headers["Cache-Control"] == "private, no-cache"
+
+    def fail(*args, **kwargs):
+        raise AssertionError("list query ran")
+
+    monkeypatch.setattr(RoomService, "list_rooms", fail)
+    response = client.get("/rooms/", headers={**admin_headers, "If-None-Match": f'"other", {etag}'})
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+
+def test_etag_covers_query_and_user(client: TestClient, admin_headers, manager_headers, room):
+    """Test different filters or users never share an ETag"""
+    etag = client.get("/rooms/?page_size=10", headers=admin_headers).headers["ETag"]
+
+    assert client.get("/rooms/?page_size=20", headers=admin_headers).headers["ETag"] != etag
+    response = client.get("/rooms/?page_size=10", headers={**manager_headers, "If-None-Match": etag})
+    assert response.status_code == status.HTTP_200_OK
+
+
+def test_if_modified_since(client: TestClient, admin_headers, guest, monkeypatch):
+    """Test If-Modified-Since is honoured when no ETag is sent"""
+    monkeypatch.setattr(http_cache, "LAST_MODIFIED_SETTLE", timedelta(0))
+    response = client.get(f"/guests/{guest.id}", headers=admin_headers)
+    last_modified = response.headers["Last-Modified"]
+
+    response = client.get(f"/guests/{guest.id}", headers={**admin_headers, "If-Modified-Since": last_modified})
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    earlier = format_datetime(parsedate_to_datetime(last_modified) - timedelta(days=1), usegmt=True)
+    response = client.get(f"/guests/{guest.id}", headers={**admin_headers, "If-Modified-Since": earlier})
+    assert response.status_code == status.HTTP_200_OK
+
+
+def test_same_second_updates_change_etag(client: TestClient, admin_headers, room):
+    """Test two in-place updates within one second still produce different ETags"""
+    client.put(f"/rooms/{room.id}", headers=admin_headers, json={"floor": 2})
+    etag = client.get("/rooms/", headers=admin_headers).headers["ETag"]
+    client.put(f"/rooms/{room.id}", headers=admin_headers, json={"floor": 3})
+
+    response = client.get("/rooms/", headers={**admin_headers, "If-None-Match": etag})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["items"][0]["floor"] == 3
+
+
+def test_last_modified_withheld_until_its_second_is_over(client: TestClient, admin_headers, guest, monkeypatch):
+    """Test a just-changed resource sends no Last-Modified and never answers If-Modified-Since with 304"""
+    response = client.get(f"/guests/{guest.id}", headers=admin_headers)
+    assert "Last-Modified" not in response.headers
+    assert "ETag" in response.headers
+
+    now = format_datetime(datetime.now(timezone.utc), usegmt=True)
+    response = client.get(f"/guests/{guest.id}", headers={**admin_headers, "If-Modified-Since": now})
+    assert response.status_code == status.HTTP_200_OK
+
+    monkeypatch.setattr(http_cache, "LAST_MODIFIED_SETTLE", timedelta(0))
+    assert "Last-Modified" in client.get(f"/guests/{guest.id}", headers=admin_headers).headers
+
+
+def test_not_modified_respects_roles(client: TestClient, manager_headers, regular_headers):
+    """Test a user without access gets 403, not 304, for a known ETag"""
+    today = date.today().isoformat()
+    url = f"/reports/occupancy?start_date={today}&end_date={today}"
+    etag = client.get(url, headers=manager_headers).headers["ETag"]
+
+    response = client.get(url, headers={**regular_headers, "If-None-Match": etag})
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+def test_validator_picks_up_writes_outside_this_process(client: TestClient, db: Session, admin_headers, guest, monkeypatch):
+    """Test writes the change counters cannot see are found once the validator expires"""
+    etag = client.get("/guests/", headers=admin_headers).headers["ETag"]
+
+    # Another worker's write: no local commit hook fires
+    with db.get_bind().begin() as connection:
+        connection.execute(text("UPDATE guests SET updated_at = '2099-01-01 00:00:00'"))
+
+    response = client.get("/guests/", headers={**admin_headers, "If-None-Match": etag})
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    monkeypatch.setattr(settings, "HTTP_CACHE_VALIDATOR_TTL", 0)
+    response = client.get("/guests/", headers={**admin_headers, "If-None-Match": etag})
+    assert response.status_code == status.HTTP_200_OK
+
+
+def test_payment_status_change_invalidates_etag(client: TestClient, db: Session, admin_headers, room, guest):
+    """Test an in-place payment update (no new rows) still changes the validator"""
+    from decimal import Decimal
+    from backend.app.db import models
+
+    today = date.today()
+    booking = models.Booking(
+        booking_number="BK-ETAG1", guest_id=guest.id, room_id=room.id,
+        check_in=today - timedelta(days=1), check_out=today,
+        price_per_night=Decimal("50.00"), total_price=Decimal("50.00"), final_bill=Decimal("50.00"),
+        status=models.BookingStatus.CHECKED_OUT.value,
+    )
+    db.add(booking)
+    db.flush()
+    payment = models.Payment(booking_id=booking.id, amount=Decimal("50.00"), method="card")
+    db.add(payment)
+    db.commit()
+    etag = client.get("/payments/", headers=admin_headers).headers["ETag"]
+
+    assert client.post(f"/payments/{payment.id}/process", headers=admin_headers).status_code == status.HTTP_200_OK
+
+    response = client.get("/payments/", headers={**admin_headers, "If-None-Match": etag})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["items"][0]["status"] == "PAID"
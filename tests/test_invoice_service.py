@@ -1,3 +1,4 @@
+import os
 from datetime import date, timedelta, datetime, timezone
 from decimal import Decimal
 import pytest
@@ -84,3 +85,75 @@ def test_generate_invoice_rejected_without_final_bill(db):
     from fastapi import HTTPException
     with pytest.raises(HTTPException):
         InvoiceService.generate_invoice(db, booking.id)
+
+
+def test_invoice_pdf_is_cached_until_invoice_changes(db, monkeypatch):
+    from backend.app.services import invoice_pdf_cache, invoice_service
+
+    rt, room, guest = create_room_and_guest(db)
+    booking = create_checked_out_booking(db, guest, room, nights=2)
+    invoice = InvoiceService.generate_invoice(db, booking.id)
+    invoice_pdf_cache.clear()
+
+    renders = []
+    real_render = invoice_service.render_pdf
+
+    def counting_render(data):
+        renders.append(data["invoice_number"])
+        return real_render(data)
+
+    monkeypatch.setattr(invoice_service, "render_pdf", counting_render)
+
+    first = InvoiceService.generate_invoice_pdf(db, invoice.id)
+    second = InvoiceService.generate_invoice_pdf(db, invoice.id)
+    assert first.startswith(b"%PDF")
+    assert first == second
+    assert len(renders) == 1
+
+    # New content, new key
+    guest.email = "changed.guest@example.com"
+    db.commit()
+    InvoiceService.generate_invoice_pdf(db, invoice.id)
+    assert len(renders) == 2
+
+
+def test_invoice_pdf_cache_evicts_least_recently_used(monkeypatch):
+    from backend.app.core.config import settings
+    from backend.app.services import invoice_pdf_cache
+
+    invoice_pdf_cache.clear()
+    monkeypatch.setattr(settings, "INVOICE_PDF_CACHE_MAX_BYTES", 2500)
+    keys = [invoice_pdf_cache.cache_key({"n": str(i)}) for i in range(3)]
+    invoice_pdf_cache.put(keys[0], b"a" * 1000)
+    invoice_pdf_cache.put(keys[1], b"b" * 1000)
+    # Make the first entry the oldest, then touch it so the second one is
+    os.utime(invoice_pdf_cache._path(keys[0]), (1, 1))
+    os.utime(invoice_pdf_cache._path(keys[1]), (2, 2))
+    assert invoice_pdf_cache.get(keys[0]) == b"a" * 1000
+
+    invoice_pdf_cache.put(keys[2], b"c" * 1000)
+    assert invoice_pdf_cache.get(keys[1]) is None
+    assert invoice_pdf_cache.get(keys[0]) == b"a" * 1000
+    assert invoice_pdf_cache.get(keys[2]) == b"c" * 1000
+    invoice_pdf_cache.clear()
+
+
+def test_render_pool_matches_inline_rendering(monkeypatch):
+    from backend.app.core.config import settings
+    from backend.app.services import invoice_renderer
+
+    data = {
+        "invoice_number": "INV-TEST-0001", "issued_at": "2026-01-02 10:00", "booking_id": "1",
+        "booking_number": "BK-1", "guest_name": "Inv Guest", "guest_email": "inv@example.com",
+        "room_number": "402", "nights": "2", "rate": "120.00", "subtotal": "240.00",
+        "tax": "24.00", "total": "264.00",
+    }
+    inline = invoice_renderer.render_invoice_pdf(data)
+    monkeypatch.setattr(settings, "INVOICE_RENDER_WORKERS", 2)
+    try:
+        pooled = list(invoice_renderer.render_many([(i, dict(data)) for i in range(3)]))
+        assert invoice_renderer.render_pdf(data) == inline
+    finally:
+        invoice_renderer.shutdown_render_pool()
+    assert [key for key, _ in pooled] == [0, 1, 2]
+    assert all(pdf == inline for _, pdf in pooled)
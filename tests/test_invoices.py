@@ -94,3 +94,46 @@ def test_generate_invoice_rejected_without_final_bill(client, admin_headers, db)
 
     inv = client.post(f"/invoices/{booking_id}", headers=admin_headers)
     assert inv.status_code == 400
+
+
+def test_export_invoices_streams_zip(client, admin_headers, regular_headers, db):
+    import io
+    import zipfile
+
+    rt = make_room_type(client, admin_headers)
+    room = make_room(client, admin_headers, rt["id"])
+    guest = make_guest(client, admin_headers, email="invexport.guest@example.com")
+    booking = make_booking(client, admin_headers, guest["id"], room["id"])
+    booking_obj = db.query(models.Booking).filter(models.Booking.id == booking["id"]).first()
+    booking_obj.final_bill = booking_obj.price_per_night
+    db.commit()
+
+    numbers = [client.post(f"/invoices/{booking['id']}", headers=admin_headers).json()["invoice_number"] for _ in range(2)]
+
+    today = date.today()
+    resp = client.get(
+        f"/invoices/export?start_date={(today - timedelta(days=1)).isoformat()}&end_date={today.isoformat()}",
+        headers=admin_headers,
+    )
+    assert resp.status_code == 200
+    assert resp.headers["content-type"] == "application/zip"
+    archive = zipfile.ZipFile(io.BytesIO(resp.content))
+    assert sorted(archive.namelist()) == sorted(f"{n}.pdf" for n in numbers)
+    assert all(archive.read(name).startswith(b"%PDF") for name in archive.namelist())
+
+    # Each invoice is served by the download endpoint from the same cache
+    pdf = client.get(f"/invoices/{db.query(models.Invoice.id).first()[0]}/pdf", headers=admin_headers)
+    assert pdf.status_code == 200
+    assert pdf.content.startswith(b"%PDF")
+
+    # Empty range: a valid, empty archive
+    past = today - timedelta(days=30)
+    resp = client.get(f"/invoices/export?start_date={past.isoformat()}&end_date={past.isoformat()}", headers=admin_headers)
+    assert zipfile.ZipFile(io.BytesIO(resp.content)).namelist() == []
+
+    assert client.get(
+        f"/invoices/export?start_date={today.isoformat()}&end_date={past.isoformat()}", headers=admin_headers
+    ).status_code == 400
+    assert client.get(
+        f"/invoices/export?start_date={past.isoformat()}&end_date={today.isoformat()}", headers=regular_headers
+    ).status_code == 403
@@ -0,0 +1,108 @@
+"""Tests for the column-projected list endpoints"""
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+import pytest
+from fastapi import status
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session, joinedload
+
+from backend.app.db import models
+from backend.app.schemas.booking import BookingResponse
+from backend.app.schemas.guest import GuestResponse
+from backend.app.schemas.payment import PaymentResponse
+from backend.app.schemas.room import RoomResponse
+from backend.app.utils.pagination import PaginatedResponse
+
+
+@pytest.fixture
+def bookings(db: Session, room, guest, admin_user):
+    """Bookings with payments, mixing statuses, notes and Decimal prices"""
+    created = []
+    for i in range(5):
+        check_in = date.today() + timedelta(days=3 * i)
+        booking = models.Booking(
+            booking_number=f"BK-PROJ-{i:03d}",
+            guest_id=guest.id,
+            room_id=room.id,
+            created_by=admin_user.id,
+            check_in=check_in,
+            check_out=check_in + timedelta(days=i + 1),
+            number_of_guests=1,
+            price_per_night=Decimal("99.95"),
+            total_price=Decimal("99.95") * (i + 1),
+            status=models.BookingStatus.CHECKED_OUT if i % 2 else models.BookingStatus.CONFIRMED,
+            special_requests="Late arrival" if i == 2 else None,
+        )
+        db.add(booking)
+        db.flush()
+        db.add(models.Payment(
+            booking_id=booking.id,
+            amount=booking.total_price,
+            currency="USD",
+            method="card",
+            status=models.Payment.PaymentStatus.PAID,
+            processed_at=datetime(2026, 1, 2, 3, 4, 5),
+        ))
+        created.append(booking)
+    db.commit()
+    return created
+
+
+def _orm_page(schema, items, total):
+    """The page as the previous ORM + response_model path rendered it"""
+    page = PaginatedResponse[schema].model_validate(
+        {"items": items, "total": total, "page": 1, "page_size": 100, "total_pages": 1}
+    )
+    return page.model_dump(mode="json")
+
+
+def test_bookings_match_orm_rendering(client: TestClient, db: Session, admin_headers, bookings):
+    """Test the projected bookings page is identical to serializing the ORM entities"""
+    response = client.get("/bookings/?page_size=100&sort_by=id&sort_order=asc", headers=admin_headers)
+    assert response.status_code == status.HTTP_200_OK
+
+    entities = db.query(models.Booking).options(joinedload(models.Booking.guest)).order_by(models.Booking.id).all()
+    assert response.json() == _orm_page(BookingResponse, entities, len(entities))
+    assert response.json()["items"][0]["guest"] == {"id": bookings[0].guest_id, "name": "John", "surname": "Doe"}
+    assert response.json()["items"][4]["number_of_nights"] == 5
+
+
+def test_rooms_guests_payments_match_orm_rendering(client: TestClient, db: Session, admin_headers, bookings):
+    """Test the other projected list pages are identical to serializing the ORM entities"""
+    for url, model, schema in (
+        ("/rooms/", models.Room, RoomResponse),
+        ("/guests/", models.Guest, GuestResponse),
+        ("/payments/", models.Payment, PaymentResponse),
+    ):
+        response = client.get(f"{url}?page_size=100&sort_by=id&sort_order=asc", headers=admin_headers)
+        assert response.status_code == status.HTTP_200_OK
+        entities = db.query(model).order_by(model.id).all()
+        assert response.json() == _orm_page(schema, entities, len(entities)), url
+
+
+def test_projected_list_filters_and_pagination(client: TestClient, admin_headers, bookings):
+    """Test filters, search on the joined guest and page bounds still apply"""
+    body = client.get("/bookings/?status=checked_out", headers=admin_headers).json()
+    assert body["total"] == 2
+    assert {item["status"] for item in body["items"]} == {"checked_out"}
+
+    assert client.get("/bookings/?search=doe", headers=admin_headers).json()["total"] == 5
+    assert client.get("/bookings/?search=PROJ-003", headers=admin_headers).json()["total"] == 1
+
+    body = client.get("/bookings/?page=9&page_size=2", headers=admin_headers).json()
+    assert (body["page"], body["total_pages"], len(body["items"])) == (3, 3, 1)
+
+
+def test_projected_list_scoped_for_regular_user(client: TestClient, regular_headers, bookings):
+    """Test REGULAR users still only see their own bookings and payments"""
+    assert client.get("/bookings/", headers=regular_headers).json()["total"] == 0
+    assert client.get("/payments/", headers=regular_headers).json()["total"] == 0
+
+
+def test_projected_list_keeps_cache_validators(client: TestClient, admin_headers, room):
+    """Test headers set by dependencies survive the route returning its own response"""
+    response = client.get("/rooms/", headers=admin_headers)
+    assert response.headers["ETag"].startswith('W/"')
+    assert response.headers["Cache-Control"] == "private, no-cache"
+    assert int(response.headers["Content-Length"]) == len(response.content)
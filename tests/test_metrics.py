@@ -0,0 +1,126 @@
+"""Tests for the Prometheus /metrics endpoint"""
+import json
+import os
+import re
+
+from fastapi import status
+from fastapi.testclient import TestClient
+
+from backend.app.core import metrics
+from backend.app.core.config import settings
+
+
+def _sample(text: str, name: str, **labels) -> float:
+    """Value of one sample in the exposition text (0 if absent)."""
+    for line in text.splitlines():
+        if line.startswith("#") or not line.startswith(name):
+            continue
+        series, value = line.rsplit(" ", 1)
+        if series.split("{", 1)[0] != name:
+            continue
+        found = dict(re.findall(r'(\w+)="((?:[^"\\]|\\.)*)"', series))
+        if found == {k: str(v) for k, v in labels.items()}:
+            return float(value)
+    return 0.0
+
+
+def test_route_latency_and_status_counts(client: TestClient, admin_headers, room):
+    """Test requests are counted per route template and status, with a latency histogram"""
+    before = client.get("/metrics").text
+    client.get(f"/rooms/{room.id}", headers=admin_headers)
+    client.get("/rooms/99999", headers=admin_headers)
+    client.get("/no-such-page")
+    text = client.get("/metrics").text
+
+    assert text.startswith("# HELP ")
+    route = {"method": "GET", "route": "/rooms/{room_id}"}
+    for code in ("200", "404"):
+        assert _sample(text, "hms_http_requests_total", **route, status=code) == \
+            _sample(before, "hms_http_requests_total", **route, status=code) + 1
+    assert _sample(text, "hms_http_requests_total", method="GET", route="unmatched", status="404") >= 1
+
+    count = _sample(text, "hms_http_request_duration_seconds_count", **route)
+    assert count - _sample(before, "hms_http_request_duration_seconds_count", **route) == 2
+    assert _sample(text, "hms_http_request_duration_seconds_bucket", **route, le="+Inf") == count
+    assert "# TYPE hms_http_requests_in_progress gauge" in text
+    assert _sample(text, "hms_threadpool_threads", state="max") > 0
+
+
+def test_cache_hits_and_misses(client: TestClient, admin_headers, room):
+    """Test cache lookups are counted by cache and result"""
+    before = client.get("/metrics").text
+    client.get("/rooms/", headers=admin_headers)
+    client.get("/rooms/", headers=admin_headers)
+    text = client.get("/metrics").text
+
+    hits = _sample(text, "hms_cache_requests_total", cache="http_validator", result="hit") - \
+        _sample(before, "hms_cache_requests_total", cache="http_validator", result="hit")
+    misses = _sample(text, "hms_cache_requests_total", cache="http_validator", result="miss") - \
+        _sample(before, "hms_cache_requests_total", cache="http_validator", result="miss")
+    assert (hits, misses) == (1, 1)
+
+
+def test_metrics_token(client: TestClient, monkeypatch):
+    """Test /metrics requires the bearer token when one is configured"""
+    monkeypatch.setattr(settings, "METRICS_TOKEN", "scrape-secret")
+    assert client.get("/metrics").status_code == status.HTTP_401_UNAUTHORIZED
+    assert client.get("/metrics", headers={"Authorization": "Bearer wrong"}).status_code == status.HTTP_401_UNAUTHORIZED
+    assert client.get("/metrics", headers={"Authorization": "Bearer scrape-secret"}).status_code == status.HTTP_200_OK
+
+
+def _worker_file(directory, pid, requests, in_progress):
+    data = {
+        "hms_http_requests_total": {
+            "type": "counter", "help": "HTTP requests by route and status code",
+            "labelnames": ["method", "route", "status"],
+            "values": [[["GET", "/merged-test", "200"], requests]],
+        },
+        "hms_http_requests_in_progress": {
+            "type": "gauge", "help": "HTTP requests being served", "labelnames": ["method"],
+            "values": [[["PATCH"], in_progress]],
+        },
+    }
+    with open(os.path.join(directory, f"metrics-{pid}.json"), "w") as f:
+        json.dump({"pid": pid, "written_at": 0, "metrics": data}, f)
+
+
+def test_workers_are_aggregated(client: TestClient, monkeypatch, tmp_path):
+    """Test counters are summed over every worker file and gauges over live workers only"""
+    monkeypatch.setattr(settings, "METRICS_DIR", str(tmp_path))
+    dead_pid = 2 ** 22 + 12345  # Above the default pid_max
+    _worker_file(tmp_path, os.getppid(), requests=3, in_progress=2)
+    _worker_file(tmp_path, dead_pid, requests=4, in_progress=5)
+    (tmp_path / "metrics-broken.json").write_text("{")
+
+    text = client.get("/metrics").text
+    assert _sample(text, "hms_http_requests_total", method="GET", route="/merged-test", status="200") == 7
+    assert _sample(text, "hms_http_requests_in_progress", method="PATCH") == 2
+
+
+def test_worker_file_round_trip(tmp_path):
+    """Test a worker's published snapshot merges back to its own values"""
+    metrics.write_worker_file(str(tmp_path))
+    path = tmp_path / f"metrics-{os.getpid()}.json"
+    published = json.loads(path.read_text())["metrics"]
+    assert set(published) == {metric.name for metric in metrics._registry}
+
+    merged = metrics.merge({}, published)
+    merged = metrics.merge(merged, published, include_gauges=False)
+    requests = merged["hms_http_requests_total"]["values"]
+    original = {tuple(labels): value for labels, value in published["hms_http_requests_total"]["values"]}
+    assert all(value == 2 * original[tuple(labels)] for labels, value in requests)
+
+
+def test_render_histogram_is_cumulative():
+    """Test histogram buckets are rendered cumulatively with +Inf, _sum and _count"""
+    text = metrics.render({
+        "demo_seconds": {
+            "type": "histogram", "help": "Demo", "labelnames": ["route"], "buckets": [0.1, 1.0],
+            "values": [[["/a"], [2, 1, 1, 3.5, 4]]],
+        },
+    }).decode()
+    assert 'demo_seconds_bucket{route="/a",le="0.1"} 2' in text
+    assert 'demo_seconds_bucket{route="/a",le="1"} 3' in text
+    assert 'demo_seconds_bucket{route="/a",le="+Inf"} 4' in text
+    assert 'demo_seconds_sum{route="/a"} 3.5' in text
+    assert 'demo_seconds_count{route="/a"} 4' in text
@@ -0,0 +1,113 @@
+"""
+Property-based equivalence tests for integer money arithmetic.
+
+Each helper is checked against the Decimal expression it replaced in the
+pricing, billing and report code.
+"""
+from decimal import Decimal, Inexact, ROUND_HALF_EVEN, ROUND_HALF_UP, localcontext
+
+from hypothesis import assume, given, strategies as st
+
+from backend.app.utils.money import (
+    Adjustment,
+    ExactAmount,
+    apply_adjustments,
+    div_round,
+    from_cents,
+    percent_of,
+    percentage_hundredths,
+    to_cents,
+)
+
+amounts = st.decimals(min_value=Decimal("-99999999.99"), max_value=Decimal("99999999.99"), places=2)
+fine_amounts = st.decimals(min_value=Decimal("-100000"), max_value=Decimal("100000"), places=6)
+percentages = st.decimals(min_value=Decimal("-100"), max_value=Decimal("100"), places=2)
+
+
+@given(fine_amounts, st.sampled_from([ROUND_HALF_EVEN, ROUND_HALF_UP]))
+def test_to_cents_matches_quantize(value, rounding):
+    expected = value.quantize(Decimal("0.01"), rounding=rounding)
+    cents = to_cents(value, rounding)
+    assert from_cents(cents) == expected
+    assert from_cents(cents).as_tuple().exponent == expected.as_tuple().exponent
+
+
+@given(st.floats(min_value=-1e9, max_value=1e9, allow_nan=False))
+def test_to_cents_of_float_matches_decimal_of_float(value):
+    # SQLite hands back SUM() of NUMERIC columns as float
+    assert from_cents(to_cents(value)) == Decimal(value).quantize(Decimal("0.01"))
+
+
+@given(st.integers(-10**12, 10**12), st.integers(1, 10**6), st.sampled_from([ROUND_HALF_EVEN, ROUND_HALF_UP]))
+def test_div_round_matches_decimal(numerator, denominator, rounding):
+    exact = Decimal(numerator) / Decimal(denominator)
+    assert div_round(numerator, denominator, rounding) == exact.quantize(Decimal("1"), rounding=rounding)
+
+
+@given(st.integers(0, 10**6), st.integers(1, 10**6))
+def test_percentage_hundredths_matches_report_rates(part, whole):
+    expected = (Decimal(part) / Decimal(whole) * Decimal('100')).quantize(Decimal('0.01'))
+    assert from_cents(percentage_hundredths(part, whole)) == expected
+
+
+@given(st.lists(st.decimals(min_value=0, max_value=Decimal("999999.99"), places=2), max_size=400))
+def test_average_daily_revenue_matches_decimal(daily):
+    if not daily:
+        return
+    expected = (sum(daily, Decimal('0')) / Decimal(len(daily))).quantize(Decimal('0.01'))
+    total = sum(to_cents(d) for d in daily)
+    assert from_cents(div_round(total, len(daily))) == expected
+
+
+@given(st.decimals(min_value=0, max_value=Decimal("99999999.99"), places=2), st.decimals(min_value=0, max_value=100, places=2))
+def test_refund_amount_matches_numeric_column_rounding(amount, percentage):
+    unrounded = Decimal(amount) * (percentage / Decimal("100"))
+    expected = unrounded.quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+    assert from_cents(percent_of(to_cents(amount), percentage)) == expected
+
+
+def _decimal_stack(base_price, rules):
+    """The original Decimal rule application loop of calculate_price."""
+    adjusted_price = base_price
+    steps = []
+    for adjustment_type, value in rules:
+        old_price = adjusted_price
+        if adjustment_type == "percentage":
+            adjusted_price += adjusted_price * (value / 100)
+        else:
+            adjusted_price += value
+        adjusted_price = max(Decimal("0.00"), adjusted_price)
+        steps.append((float(old_price), float(adjusted_price)))
+    return adjusted_price, steps
+
+
+rule_lists = st.lists(
+    st.one_of(
+        st.tuples(st.just("percentage"), percentages),
+        st.tuples(st.just("fixed_amount"), st.decimals(min_value=-1000, max_value=1000, places=2)),
+    ),
+    max_size=5,
+)
+
+
+@given(st.decimals(min_value=0, max_value=Decimal("99999.99"), places=2), rule_lists, st.integers(1, 365))
+def test_exact_amount_rule_stacking_matches_decimal(base_price, rules, nights):
+    # Decimal rounds past 28 significant digits while ExactAmount stays exact,
+    # so compare only stacks that Decimal computes without rounding
+    with localcontext() as ctx:
+        ctx.traps[Inexact] = True
+        try:
+            expected, expected_steps = _decimal_stack(base_price, rules)
+            expected_total = expected * nights
+            expected_savings = base_price * nights - expected_total
+        except Inexact:
+            assume(False)
+
+    base = ExactAmount.from_decimal(base_price)
+    adjusted, steps = apply_adjustments(base, [Adjustment(kind, value) for kind, value in rules])
+
+    # Same value and the same Decimal representation (exponent) as before
+    assert str(adjusted.to_decimal()) == str(expected)
+    assert steps == expected_steps
+    assert str((adjusted * nights).to_decimal()) == str(expected_total)
+    assert str((base * nights - adjusted * nights).to_decimal()) == str(expected_savings)
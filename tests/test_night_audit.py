@@ -0,0 +1,91 @@
+"""Tests for the night-audit batch job."""
+
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+from backend.app.db import models
+from backend.app.services.night_audit_service import NightAuditService
+
+
+def _booking(db, room, guest, number, check_in, status, nights=2, final_bill=None):
+    booking = models.Booking(
+        booking_number=number,
+        guest_id=guest.id,
+        room_id=room.id,
+        check_in=check_in,
+        check_out=check_in + timedelta(days=nights),
+        number_of_guests=1,
+        price_per_night=Decimal("100"),
+        total_price=Decimal("100") * nights,
+        status=status.value,
+        final_bill=final_bill,
+    )
+    db.add(booking)
+    db.commit()
+    return booking
+
+
+def test_night_audit_marks_no_shows_and_invoices_checkouts(client, manager_headers, db, room, guest):
+    today = date.today()
+    overdue = _booking(db, room, guest, "NA-OVERDUE", today - timedelta(days=1), models.BookingStatus.CONFIRMED)
+    due_today = _booking(db, room, guest, "NA-TODAY", today, models.BookingStatus.CONFIRMED, nights=1)
+    future = _booking(db, room, guest, "NA-FUTURE", today + timedelta(days=3), models.BookingStatus.CONFIRMED)
+    pending = _booking(db, room, guest, "NA-PENDING", today - timedelta(days=1), models.BookingStatus.PENDING)
+    checked_out = _booking(db, room, guest, "NA-OUT", today - timedelta(days=3), models.BookingStatus.CHECKED_OUT,
+                           final_bill=Decimal("250.50"))
+    invoiced = _booking(db, room, guest, "NA-INVOICED", today - timedelta(days=5), models.BookingStatus.CHECKED_OUT,
+                        final_bill=Decimal("100"))
+    no_bill = _booking(db, room, guest, "NA-NOBILL", today - timedelta(days=5), models.BookingStatus.CHECKED_OUT)
+    db.add(models.Invoice(booking_id=invoiced.id, invoice_number="INV-EXISTING", subtotal=100, tax=10, total=110))
+    db.commit()
+    ids = {b.booking_number: b.id for b in (overdue, due_today, future, pending, checked_out, invoiced, no_bill)}
+
+    resp = client.post("/night-audit/", headers=manager_headers)
+    assert resp.status_code == 200
+    summary = resp.json()
+    assert summary["business_date"] == today.isoformat()
+    assert summary["no_shows"] == 2
+    assert summary["no_show_charges"] == 2
+    assert Decimal(str(summary["no_show_charge_total"])) == Decimal("300.00")
+    assert summary["invoices_created"] == 1
+    assert Decimal(str(summary["invoice_total"])) == Decimal("275.55")
+
+    def status(number):
+        booking = db.query(models.Booking).filter(models.Booking.id == ids[number]).first()
+        return booking.status.value if hasattr(booking.status, "value") else booking.status
+
+    db.expire_all()
+    assert status("NA-OVERDUE") == models.BookingStatus.NO_SHOW.value
+    assert status("NA-TODAY") == models.BookingStatus.NO_SHOW.value
+    assert status("NA-FUTURE") == models.BookingStatus.CONFIRMED.value
+    assert status("NA-PENDING") == models.BookingStatus.PENDING.value
+
+    charge = db.query(models.Payment).filter(models.Payment.booking_id == ids["NA-OVERDUE"]).one()
+    assert charge.amount == Decimal("200.00")
+    assert charge.method == "no_show_charge"
+    assert "No-show charge" in charge.reference
+
+    invoice = db.query(models.Invoice).filter(models.Invoice.booking_id == ids["NA-OUT"]).one()
+    assert invoice.invoice_number.startswith("INV-")
+    assert (invoice.subtotal, invoice.tax, invoice.total) == (Decimal("250.50"), Decimal("25.05"), Decimal("275.55"))
+    assert db.query(models.Invoice).filter(models.Invoice.booking_id == ids["NA-NOBILL"]).count() == 0
+
+    log = db.query(models.AuditLog).filter(models.AuditLog.action == "NIGHT_AUDIT").one()
+    assert "2 no-shows" in log.description
+
+
+def test_night_audit_is_idempotent(db, room, guest):
+    _booking(db, room, guest, "NA-1", date.today() - timedelta(days=1), models.BookingStatus.CONFIRMED)
+    _booking(db, room, guest, "NA-2", date.today() - timedelta(days=2), models.BookingStatus.CHECKED_OUT,
+             final_bill=Decimal("100"))
+
+    first = NightAuditService.run(db)
+    second = NightAuditService.run(db)
+    assert (first["no_shows"], first["invoices_created"]) == (1, 1)
+    assert (second["no_shows"], second["invoices_created"]) == (0, 0)
+    assert db.query(models.Payment).count() == 1
+    assert db.query(models.Invoice).count() == 1
+
+
+def test_night_audit_requires_manager(client, regular_headers):
+    assert client.post("/night-audit/", headers=regular_headers).status_code == 403
@@ -3,7 +3,7 @@ Tests for Pricing Rules functionality
 """
 import pytest
 from datetime import date, timedelta
-from decimal import Decimal
+from decimal import ROUND_HALF_UP, Decimal
 
 from backend.app.schemas.pricing_rule import PricingRuleCreate, PriceCalculationRequest
 from backend.app.services.pricing_rule_service import PricingRuleService
@@ -457,3 +457,432 @@ def test_pricing_rule_requires_manager_permission(client, regular_headers):
     )
     
     assert response.status_code == 403  # Forbidden for regular users
+
+
+def test_compiled_rule_set_reloads_after_rule_update(db, room_type):
+    """Test that the compiled rule set is reused until a rule changes"""
+    from backend.app.schemas.pricing_rule import PricingRuleUpdate
+    from backend.app.services import pricing_engine
+
+    rule = PricingRule(
+        name="Flat 10%",
+        rule_type="custom",
+        priority=1,
+        adjustment_type="percentage",
+        adjustment_value=10,
+        is_active=True
+    )
+    db.add(rule)
+    db.commit()
+
+    check_in = date.today() + timedelta(days=5)
+    calc_request = PriceCalculationRequest(
+        room_type_id=room_type.id,
+        check_in=check_in,
+        check_out=check_in + timedelta(days=1),
+    )
+    result = PricingRuleService.calculate_price(db, calc_request)
+    assert result.adjusted_price_per_night == Decimal("110.00")
+
+    rule_set = pricing_engine.get_rule_set(db)
+    assert pricing_engine.get_rule_set(db) is rule_set  # No reload without changes
+
+    PricingRuleService.update_rule(db, rule.id, PricingRuleUpdate(adjustment_value=Decimal("20")))
+    assert pricing_engine.get_rule_set(db) is not rule_set
+
+    result = PricingRuleService.calculate_price(db, calc_request)
+    assert result.adjusted_price_per_night == Decimal("120.00")
+
+
+def test_compiled_rule_set_buckets_by_room_type_and_dates(db, room_type):
+    """Test candidate lookup by room type and date segment"""
+    from backend.app.services import pricing_engine
+
+    other_type = RoomType(name="Single", base_price=Decimal("50.00"), capacity=1)
+    db.add(other_type)
+    db.commit()
+
+    summer = PricingRule(
+        name="Summer", rule_type="seasonal", priority=5,
+        adjustment_type="percentage", adjustment_value=10,
+        start_date=date(2030, 6, 1), end_date=date(2030, 8, 31), is_active=True,
+    )
+    suite_only = PricingRule(
+        name="Suite fee", rule_type="custom", priority=9,
+        adjustment_type="fixed_amount", adjustment_value=15,
+        room_type_id=room_type.id, is_active=True,
+    )
+    db.add_all([summer, suite_only])
+    db.commit()
+
+    rule_set = pricing_engine.get_rule_set(db)
+
+    july = [r.name for r in rule_set.candidate_rules(room_type.id, date(2030, 7, 1))]
+    assert july == ["Suite fee", "Summer"]  # Priority order
+    assert [r.name for r in rule_set.candidate_rules(room_type.id, date(2030, 9, 1))] == ["Suite fee"]
+    assert [r.name for r in rule_set.candidate_rules(other_type.id, date(2030, 8, 31))] == ["Summer"]
+    assert rule_set.candidate_rules(other_type.id, date(2030, 5, 31)) == []
+
+
+def test_weekday_masks():
+    """Test applicable_days parsing and stay weekday coverage"""
+    from backend.app.services.pricing_engine import parse_weekday_mask, stay_weekday_mask
+
+    assert parse_weekday_mask("[5, 6]") == 0b1100000
+    assert parse_weekday_mask("[]") == 0
+    assert parse_weekday_mask("not json") is None
+    assert parse_weekday_mask(None) is None
+
+    saturday = date(2030, 1, 5)
+    assert saturday.weekday() == 5
+    assert stay_weekday_mask(saturday, 1) == 0b0100000
+    assert stay_weekday_mask(saturday, 3) == 0b1100001  # Sat, Sun, Mon
+    assert stay_weekday_mask(saturday, 10) == 0b1111111
+
+
+def test_calculate_prices_batch(client, regular_headers, db, room_type):
+    """Test batch quotes keep request order and report per-item errors"""
+    rule = PricingRule(
+        name="Long Stay 10%",
+        rule_type="long_stay",
+        priority=8,
+        adjustment_type="percentage",
+        adjustment_value=-10,
+        min_nights=7,
+        is_active=True
+    )
+    db.add(rule)
+    db.commit()
+
+    check_in = date.today() + timedelta(days=14)
+    response = client.post(
+        "/pricing-rules/calculate-price/batch",
+        headers=regular_headers,
+        json={
+            "quotes": [
+                {"room_type_id": room_type.id, "check_in": str(check_in), "check_out": str(check_in + timedelta(days=7))},
+                {"room_type_id": 9999, "check_in": str(check_in), "check_out": str(check_in + timedelta(days=2))},
+                {"room_type_id": room_type.id, "check_in": str(check_in), "check_out": str(check_in + timedelta(days=2))},
+                {"room_type_id": room_type.id, "check_in": str(check_in), "check_out": str(check_in)},
+            ]
+        }
+    )
+
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert len(results) == 4
+
+    assert Decimal(results[0]["quote"]["adjusted_price_per_night"]) == Decimal("90.00")
+    assert Decimal(results[0]["quote"]["total_price"]) == Decimal("630.00")
+    assert results[1]["quote"] is None
+    assert "not found" in results[1]["error"]
+    assert Decimal(results[2]["quote"]["total_price"]) == Decimal("200.00")
+    assert results[2]["error"] is None
+    assert results[3]["error"] == "Check-out must be after check-in"
+
+
+def test_rate_calendar_matches_single_night_quotes(client, regular_headers, db, room_type):
+    """Test the vectorized calendar agrees with calculate_price night by night"""
+    start = date.today() + timedelta(days=1)
+    db.add_all([
+        PricingRule(
+            name="Weekend", rule_type="weekend", priority=10,
+            adjustment_type="percentage", adjustment_value=20,
+            applicable_days="[5, 6]", is_active=True,
+        ),
+        PricingRule(
+            name="Season", rule_type="seasonal", priority=5,
+            adjustment_type="fixed_amount", adjustment_value=-15,
+            start_date=start + timedelta(days=3), end_date=start + timedelta(days=9),
+            room_type_id=room_type.id, is_active=True,
+        ),
+        PricingRule(
+            name="Early Bird", rule_type="early_bird", priority=3,
+            adjustment_type="percentage", adjustment_value=-10,
+            min_advance_days=12, is_active=True,
+        ),
+        PricingRule(
+            name="Gold", rule_type="loyalty", priority=1,
+            adjustment_type="percentage", adjustment_value=-5,
+            min_loyalty_tier=2, is_active=True,
+        ),
+        PricingRule(
+            name="Week+", rule_type="long_stay", priority=1,
+            adjustment_type="percentage", adjustment_value=-50,
+            min_nights=7, is_active=True,
+        ),
+    ])
+    db.commit()
+
+    response = client.get(
+        "/pricing-rules/rate-calendar",
+        headers=regular_headers,
+        params={"start_date": str(start), "days": 21, "guest_loyalty_tier": 2},
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["days"] == 21
+    calendar = next(rt for rt in data["room_types"] if rt["room_type_id"] == room_type.id)
+    assert len(calendar["rates"]) == 21
+
+    for offset, rate in enumerate(calendar["rates"]):
+        night = start + timedelta(days=offset)
+        quote = PricingRuleService.calculate_price(
+            db,
+            PriceCalculationRequest(
+                room_type_id=room_type.id,
+                check_in=night,
+                check_out=night + timedelta(days=1),
+                guest_loyalty_tier=2,
+            ),
+        )
+        assert rate == float(quote.adjusted_price_per_night.quantize(Decimal("0.01"), rounding=ROUND_HALF_UP))
+
+
+def test_rate_calendar_rounds_half_cents_up(client, regular_headers, db):
+    """Test a nightly rate ending in exactly half a cent rounds up, as stored on a booking"""
+    budget = RoomType(name="Budget", base_price=Decimal("10.05"), capacity=1)
+    db.add_all([
+        budget,
+        PricingRule(
+            name="Half Off", rule_type="custom", priority=1,
+            adjustment_type="percentage", adjustment_value=-50, is_active=True,
+        ),
+    ])
+    db.commit()
+
+    response = client.get(
+        "/pricing-rules/rate-calendar", headers=regular_headers, params={"room_type_id": budget.id, "days": 3},
+    )
+    assert response.status_code == 200
+    # 5.025 in float64 is just below the half cent, so float rounding would give 5.02
+    assert response.json()["room_types"][0]["rates"] == [5.03] * 3
+
+
+def test_rate_calendar_cache_invalidated_by_rule_change(client, regular_headers, db, room_type):
+    """Test the cached calendar is rebuilt after a rule is created"""
+    params = {"room_type_id": room_type.id, "days": 7}
+    first = client.get("/pricing-rules/rate-calendar", headers=regular_headers, params=params)
+    assert first.status_code == 200
+    assert first.json()["room_types"][0]["rates"] == [100.0] * 7
+
+    db.add(PricingRule(
+        name="Flat +10", rule_type="custom", priority=1,
+        adjustment_type="fixed_amount", adjustment_value=10, is_active=True,
+    ))
+    db.commit()
+
+    second = client.get("/pricing-rules/rate-calendar", headers=regular_headers, params=params)
+    assert second.json()["room_types"][0]["rates"] == [110.0] * 7
+
+    too_long = client.get("/pricing-rules/rate-calendar", headers=regular_headers, params={"days": 10000})
+    assert too_long.status_code == 400
+    missing = client.get("/pricing-rules/rate-calendar", headers=regular_headers, params={"room_type_id": 9999})
+    assert missing.status_code == 404
+
+
+def test_los_matrix_matches_calculate_price(client, regular_headers, db, room_type):
+    """Test every arrival x length-of-stay cell equals a direct quote"""
+    start = date.today() + timedelta(days=2)
+    db.add_all([
+        PricingRule(
+            name="Weekend", rule_type="weekend", priority=10,
+            adjustment_type="percentage", adjustment_value=15,
+            applicable_days="[5]", is_active=True,
+        ),
+        PricingRule(
+            name="Long Stay", rule_type="long_stay", priority=5,
+            adjustment_type="percentage", adjustment_value=-20,
+            min_nights=5, is_active=True,
+        ),
+        PricingRule(
+            name="Last Minute", rule_type="last_minute", priority=2,
+            adjustment_type="fixed_amount", adjustment_value=-30,
+            max_advance_days=6, room_type_id=room_type.id, is_active=True,
+        ),
+    ])
+    db.commit()
+
+    response = client.get(
+        "/pricing-rules/los-matrix",
+        headers=regular_headers,
+        params={"start_date": str(start), "days": 10, "max_nights": 8, "room_type_id": room_type.id},
+    )
+    assert response.status_code == 200, response.text
+    totals = response.json()["room_types"][0]["totals"]
+    assert len(totals) == 10
+    assert all(len(row) == 8 for row in totals)
+
+    for offset, row in enumerate(totals):
+        check_in = start + timedelta(days=offset)
+        for nights, total in enumerate(row, start=1):
+            quote = PricingRuleService.calculate_price(
+                db,
+                PriceCalculationRequest(
+                    room_type_id=room_type.id,
+                    check_in=check_in,
+                    check_out=check_in + timedelta(days=nights),
+                ),
+            )
+            assert total == float(quote.total_price.quantize(Decimal("0.01"), rounding=ROUND_HALF_UP))
+
+
+def test_los_matrix_rounds_exact_totals(client, regular_headers, db):
+    """Test totals are rounded from the exact stay price, not from a float product"""
+    standard = RoomType(name="Standard", base_price=Decimal("87.65"), capacity=2)
+    db.add_all([
+        standard,
+        PricingRule(
+            name="Promo", rule_type="custom", priority=1,
+            adjustment_type="percentage", adjustment_value=-15, is_active=True,
+        ),
+    ])
+    db.commit()
+
+    response = client.get(
+        "/pricing-rules/los-matrix",
+        headers=regular_headers,
+        params={"days": 1, "max_nights": 3, "room_type_id": standard.id},
+    )
+    assert response.status_code == 200, response.text
+    # 74.5025 per night: exactly 149.005 for two nights, which float64 rounds down
+    assert response.json()["room_types"][0]["totals"] == [[74.50, 149.01, 223.51]]
+
+
+def test_simulate_draft_rules_over_history(client, admin_headers, db, room, guest):
+    """Test what-if replay of unsaved rules against past bookings"""
+    from datetime import datetime
+    from backend.app.db.models import Booking, BookingStatus
+
+    guest.vip_tier = 2
+
+    def booking(number, check_in, nights, booked_days_before, status=BookingStatus.CHECKED_OUT):
+        return Booking(
+            booking_number=number, guest_id=guest.id, room_id=room.id,
+            check_in=check_in, check_out=check_in + timedelta(days=nights),
+            price_per_night=Decimal("100.00"), total_price=Decimal(100 * nights),
+            status=status.value,
+            created_at=datetime.combine(check_in - timedelta(days=booked_days_before), datetime.min.time()),
+        )
+
+    db.add_all([
+        booking("BK-SIM1", date(2025, 3, 3), 2, 40),   # Monday, early booking
+        booking("BK-SIM2", date(2025, 3, 7), 7, 2),    # Friday, week-long
+        booking("BK-SIM3", date(2025, 3, 10), 1, 5, BookingStatus.CANCELLED),
+        booking("BK-SIM4", date(2025, 5, 1), 3, 1),    # Outside the range
+    ])
+    db.commit()
+    rules_before = db.query(PricingRule).count()
+
+    response = client.post(
+        "/pricing-rules/simulate",
+        headers=admin_headers,
+        json={
+            "start_date": "2025-03-01",
+            "end_date": "2025-03-31",
+            "rules": [
+                {"name": "Early Bird", "rule_type": "early_bird", "priority": 5,
+                 "adjustment_type": "percentage", "adjustment_value": -10, "min_advance_days": 30},
+                {"name": "Long Stay", "rule_type": "long_stay", "priority": 3,
+                 "adjustment_type": "fixed_amount", "adjustment_value": -20, "min_nights": 7},
+                {"name": "Gold", "rule_type": "loyalty", "priority": 1,
+                 "adjustment_type": "percentage", "adjustment_value": -50, "min_loyalty_tier": 3},
+            ],
+        },
+    )
+    assert response.status_code == 200
+    data = response.json()
+
+    assert data["bookings"] == 2
+    assert data["nights"] == 9
+    assert data["actual_revenue"] == 900.0
+    assert data["base_revenue"] == 900.0
+    # 2 nights at 90 + 7 nights at 80
+    assert data["simulated_revenue"] == 740.0
+    assert data["uplift"] == -160.0
+
+    early, long_stay, gold = data["rules"]
+    assert (early["index"], early["bookings_affected"], early["nights_affected"], early["uplift"]) == (1, 1, 2, -20.0)
+    assert (long_stay["bookings_affected"], long_stay["uplift"]) == (1, -140.0)
+    assert (gold["bookings_affected"], gold["uplift"]) == (0, 0.0)
+
+    # Draft rules are never persisted
+    assert db.query(PricingRule).count() == rules_before
+
+
+def test_simulate_requires_manager(client, regular_headers):
+    """Test simulation is restricted to managers and admins"""
+    response = client.post(
+        "/pricing-rules/simulate",
+        headers=regular_headers,
+        json={"start_date": "2025-01-01", "end_date": "2025-01-31", "rules": [
+            {"name": "X", "rule_type": "custom", "adjustment_type": "fixed_amount", "adjustment_value": 5},
+        ]},
+    )
+    assert response.status_code == 403
+
+
+def test_interval_tree_matches_pairwise_overlaps():
+    """Test interval tree overlap queries against a brute-force scan"""
+    import random
+    from backend.app.services.pricing_analysis import IntervalTree
+
+    rng = random.Random(7)
+    intervals = []
+    for i in range(200):
+        start = rng.randint(0, 1000)
+        intervals.append((start, start + rng.randint(0, 60), i))
+    tree = IntervalTree(intervals)
+
+    for _ in range(100):
+        lo = rng.randint(-10, 1010)
+        hi = lo + rng.randint(0, 40)
+        found = sorted(i[2] for i in tree.overlapping(lo, hi))
+        expected = sorted(i[2] for i in intervals if i[0] <= hi and i[1] >= lo)
+        assert found == expected
+
+
+def test_pricing_rule_analysis(client, admin_headers, regular_headers, db, room_type):
+    """Test overlaps, shadowed rules and stacked segments are reported"""
+    summer = PricingRule(
+        name="Summer", rule_type="seasonal", priority=10,
+        adjustment_type="percentage", adjustment_value=20,
+        start_date=date(2030, 6, 1), end_date=date(2030, 8, 31), is_active=True,
+    )
+    july = PricingRule(
+        name="July", rule_type="seasonal", priority=5,
+        adjustment_type="percentage", adjustment_value=10,
+        start_date=date(2030, 7, 1), end_date=date(2030, 7, 31), is_active=True,
+    )
+    autumn = PricingRule(
+        name="Autumn", rule_type="seasonal", priority=5,
+        adjustment_type="fixed_amount", adjustment_value=-10,
+        start_date=date(2030, 9, 1), end_date=date(2030, 10, 31), is_active=True,
+    )
+    db.add_all([summer, july, autumn])
+    db.commit()
+
+    assert client.get("/pricing-rules/analysis", headers=regular_headers).status_code == 403
+
+    response = client.get("/pricing-rules/analysis", headers=admin_headers)
+    assert response.status_code == 200
+    data = response.json()
+    assert data["active_rules"] == 3
+    analysis = next(rt for rt in data["room_types"] if rt["room_type_id"] == room_type.id)
+
+    assert analysis["overlaps"] == [{
+        "rule_id": summer.id, "other_rule_id": july.id,
+        "overlap_start": "2030-07-01", "overlap_end": "2030-07-31",
+    }]
+    assert analysis["shadowed"] == [{"rule_id": july.id, "shadowed_by": summer.id}]
+
+    segments = [
+        (s["start_date"], s["end_date"], s["rule_ids"], Decimal(s["effective_price"]))
+        for s in analysis["segments"]
+    ]
+    assert segments == [
+        ("2030-06-01", "2030-06-30", [summer.id], Decimal("120.00")),
+        ("2030-07-01", "2030-07-31", [summer.id, july.id], Decimal("132.00")),
+        ("2030-08-01", "2030-08-31", [summer.id], Decimal("120.00")),
+        ("2030-09-01", "2030-10-31", [autumn.id], Decimal("90.00")),
+    ]
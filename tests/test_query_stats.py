@@ -0,0 +1,110 @@
+"""Tests for per-request query counting, Server-Timing and N+1 detection"""
+import logging
+from datetime import date, datetime
+
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from backend.app.core.server_timing import ServerTimingMiddleware
+from backend.app.db import models
+from backend.app.db.query_stats import capture_queries, statement_shape
+from backend.app.db.session import get_db
+
+
+def test_statement_shape_normalises_literals():
+    """Test statements differing only in values or IN-list length share a shape"""
+    assert statement_shape("SELECT * FROM rooms WHERE id = 1") == statement_shape("SELECT *\n  FROM rooms WHERE id = 42")
+    assert statement_shape("SELECT * FROM guests WHERE name = 'O''Brien'") == "SELECT * FROM guests WHERE name = ?"
+    assert statement_shape("SELECT * FROM t WHERE id IN (?, ?, ?)") == statement_shape("SELECT * FROM t WHERE id IN (?)")
+    assert statement_shape("SELECT * FROM t WHERE id = %(id_1)s") == "SELECT * FROM t WHERE id = ?"
+
+
+def test_server_timing_header(client: TestClient, admin_headers, room):
+    """Test responses report the request's query count and DB time"""
+    response = client.get("/rooms/", headers=admin_headers)
+    db_timing, app_timing = response.headers["Server-Timing"].split(", ")
+    assert db_timing.startswith("db;dur=")
+    assert db_timing.endswith('desc="4 queries"')  # user, validator, count, page
+    assert app_timing.startswith("app;dur=")
+
+
+def test_repeated_statement_is_logged(db: Session, caplog):
+    """Test a statement repeated past the threshold in one request logs a warning"""
+    app = FastAPI()
+    app.add_middleware(ServerTimingMiddleware, repeated_query_warning=3)
+
+    @app.get("/loop")
+    def loop(count: int, session: Session = Depends(get_db)):
+        for i in range(count):
+            session.execute(text("SELECT :value"), {"value": i})
+        return {}
+
+    app.dependency_overrides[get_db] = lambda: db
+    with TestClient(app) as test_client, caplog.at_level(logging.WARNING):
+        assert 'desc="3 queries"' in test_client.get("/loop?count=3").headers["Server-Timing"]
+        assert not caplog.records
+
+        test_client.get("/loop?count=4")
+    assert "GET /loop ran the same statement 4 times: SELECT ?" in caplog.text
+
+
+def test_capture_queries_counts_and_reports(db: Session, room):
+    """Test capture_queries sees statements from the calling thread"""
+    with capture_queries() as stats:
+        db.query(models.Room).all()
+        db.query(models.Room).filter(models.Room.id == room.id).first()
+    assert stats.count == 2
+    assert stats.duration > 0
+    assert stats.report().startswith("2 queries in ")
+
+
+def test_assert_max_queries_fails_over_budget(client: TestClient, admin_headers, assert_max_queries):
+    """Test the fixture raises with the captured statements when over budget"""
+    with pytest.raises(AssertionError, match="expected at most 1 queries"):
+        with assert_max_queries(1):
+            client.get("/rooms/", headers=admin_headers)
+
+
+@pytest.mark.parametrize("url, limit", [
+    ("/rooms/", 4),
+    ("/guests/", 4),
+    ("/bookings/", 4),
+    ("/payments/", 4),
+    ("/reports/housekeeping/dashboard", 9),
+    ("/reports/housekeeping/room-status-grid", 6),
+])
+def test_endpoint_query_budget(client: TestClient, admin_headers, room, guest, assert_max_queries, url, limit):
+    """Test list and dashboard endpoints stay within their query budget"""
+    with assert_max_queries(limit):
+        assert client.get(url, headers=admin_headers).status_code == 200
+
+
+def test_staff_performance_queries_do_not_grow_with_staff(
+    client: TestClient, db: Session, admin_user, admin_headers, room, assert_max_queries
+):
+    """Test staff performance runs a fixed number of queries however many staff worked"""
+    now = datetime.now()
+    for i in range(8):
+        staff = models.User(username=f"cleaner{i}", password_hash="x", permission_level=models.PermissionLevel.REGULAR)
+        db.add(staff)
+        db.flush()
+        db.add(models.HousekeepingTask(
+            room_id=room.id, created_by=admin_user.id, assigned_to=staff.id, verified_by=admin_user.id,
+            task_type=models.TaskType.CLEANING.value, status=models.TaskStatus.VERIFIED.value,
+            scheduled_date=date.today(), scheduled_at=now, completed_at=now, verified_at=now,
+            actual_duration_minutes=30 + i,
+        ))
+    db.commit()
+
+    today = date.today()
+    with assert_max_queries(5):
+        response = client.get(
+            f"/reports/housekeeping/staff-performance?start_date={today}&end_date={today}", headers=admin_headers
+        )
+    data = response.json()
+    assert len(data["staff_metrics"]) == 9
+    assert data["total_tasks_completed"] == 8
+    assert data["total_tasks_verified"] == 8
@@ -0,0 +1,88 @@
+"""Tests for the orjson response class and response compression"""
+import json
+from datetime import date, datetime, timezone
+from decimal import Decimal
+
+import pytest
+from fastapi import FastAPI, status
+from fastapi.responses import JSONResponse, Response
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from backend.app.core.compression import CompressionMiddleware, accepted_encodings
+from backend.app.core.responses import FastJSONResponse
+from backend.app.db import models
+
+
+@pytest.fixture
+def many_room_types(db: Session):
+    db.add_all([
+        models.RoomType(name=f"Room type {i}", base_price=Decimal("100.00"), capacity=2, description="x" * 50)
+        for i in range(40)
+    ])
+    db.commit()
+
+
+def test_fast_json_response_matches_stdlib():
+    """Test orjson output decodes to what JSONResponse produced, with Decimal as string"""
+    content = {"date": "2026-01-01", "daily": [{"day": i, "rate": 0.5 + i, "label": "é"} for i in range(5)], "none": None}
+    assert json.loads(FastJSONResponse(content).body) == json.loads(JSONResponse(content).body)
+
+    body = json.loads(FastJSONResponse({
+        "total": Decimal("10.50"),
+        "day": date(2026, 1, 2),
+        "at": datetime(2026, 1, 2, 3, 4, 5, tzinfo=timezone.utc),
+        1: "int key",
+    }).body)
+    assert body == {"total": "10.50", "day": "2026-01-02", "at": "2026-01-02T03:04:05Z", "1": "int key"}
+
+
+def test_large_response_is_gzipped(client: TestClient, admin_headers, many_room_types):
+    """Test large JSON responses are compressed for clients accepting gzip"""
+    response = client.get("/room-types/", headers={**admin_headers, "Accept-Encoding": "gzip"})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["Vary"]
+    assert len(response.json()) == 40  # httpx decodes transparently
+
+    response = client.get("/room-types/", headers={**admin_headers, "Accept-Encoding": "identity"})
+    assert "Content-Encoding" not in response.headers
+    assert len(response.json()) == 40
+
+
+def test_small_response_is_not_compressed(client: TestClient):
+    """Test responses under the size threshold are sent as is"""
+    response = client.get("/health", headers={"Accept-Encoding": "gzip"})
+    assert "Content-Encoding" not in response.headers
+
+
+def test_brotli_preferred_when_available(client: TestClient, admin_headers, many_room_types):
+    """Test brotli is used when installed and accepted"""
+    pytest.importorskip("brotli")
+    response = client.get("/room-types/", headers={**admin_headers, "Accept-Encoding": "gzip, br"})
+    assert response.headers["Content-Encoding"] == "br"
+
+
+def test_already_compressed_content_is_skipped():
+    """Test PDFs and event streams pass through uncompressed"""
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=10)
+
+    @app.get("/pdf")
+    def pdf():
+        return Response(b"%PDF" + b"0" * 5000, media_type="application/pdf")
+
+    @app.get("/json")
+    def data():
+        return {"data": "0" * 5000}
+
+    with TestClient(app) as test_client:
+        assert "Content-Encoding" not in test_client.get("/pdf", headers={"Accept-Encoding": "gzip"}).headers
+        assert test_client.get("/json", headers={"Accept-Encoding": "gzip"}).headers["Content-Encoding"] == "gzip"
+
+
+def test_accepted_encodings():
+    """Test Accept-Encoding parsing honours q=0"""
+    assert accepted_encodings("gzip, deflate, br") == {"gzip", "deflate", "br"}
+    assert accepted_encodings("gzip;q=0, br;q=0.8") == {"br"}
+    assert accepted_encodings("") == set()
@@ -0,0 +1,104 @@
+"""Tests for the synthetic sample data generator"""
+from datetime import date
+
+import pytest
+from fastapi import status
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import Session
+
+from backend.app.core.security import create_access_token
+from backend.app.db import models
+from backend.app.sample_data import GeneratorConfig, generate
+from backend.app.services.invoice_service import InvoiceService
+
+END_DATE = date(2026, 3, 1)
+
+
+def _config(**overrides) -> GeneratorConfig:
+    # A batch size that doesn't divide anything evenly, so rows cross several flushes
+    values = dict(rooms=8, guests=40, years=0.5, future_days=30, end_date=END_DATE, seed=3, batch_size=97)
+    values.update(overrides)
+    return GeneratorConfig(**values)
+
+
+def test_generated_data_is_consistent(db: Session):
+    """Test row counts, non-overlapping stays and lifecycle-dependent payments, invoices and tasks"""
+    counts = generate(db.get_bind(), _config())
+
+    for table in models.Base.metadata.sorted_tables:
+        assert db.scalar(select(func.count()).select_from(table)) == counts.get(table.name, 0)
+    assert counts["rooms"] == 8 and counts["guests"] == 40
+    assert counts["bookings"] > 50 and counts["audit_logs"] > counts["bookings"]
+
+    occupying = [models.BookingStatus.CONFIRMED, models.BookingStatus.CHECKED_IN, models.BookingStatus.CHECKED_OUT]
+    stays = {}
+    for booking in db.scalars(select(models.Booking).order_by(models.Booking.check_in)):
+        if booking.status in occupying:
+            assert booking.check_in >= stays.get(booking.room_id, date.min)
+            stays[booking.room_id] = booking.check_out
+        if booking.status == models.BookingStatus.CHECKED_IN:
+            assert booking.check_in <= END_DATE < booking.check_out
+        elif booking.status in (models.BookingStatus.CHECKED_OUT, models.BookingStatus.NO_SHOW):
+            assert booking.check_out <= END_DATE
+        elif booking.status in (models.BookingStatus.CONFIRMED, models.BookingStatus.PENDING):
+            assert booking.check_in > END_DATE
+
+    for booking in db.scalars(select(models.Booking).where(models.Booking.status == models.BookingStatus.CHECKED_OUT)):
+        paid = sum(p.amount for p in booking.payments if p.status == models.Payment.PaymentStatus.PAID)
+        assert paid == booking.final_bill == booking.total_price
+        invoice = db.scalars(select(models.Invoice).where(models.Invoice.booking_id == booking.id)).one()
+        assert (invoice.subtotal, invoice.tax, invoice.total) == InvoiceService.invoice_amounts(booking.final_bill)
+
+    assert db.scalar(select(func.count()).select_from(models.Invoice)) == db.scalar(
+        select(func.count()).select_from(models.Booking).where(models.Booking.status == models.BookingStatus.CHECKED_OUT)
+    )
+    for task in db.scalars(select(models.HousekeepingTask)):
+        assert task.priority_rank == models.task_priority_rank(task.priority)
+        assert task.scheduled_at == models.task_scheduled_at(task.scheduled_date, task.scheduled_time)
+        if task.scheduled_date > END_DATE:
+            assert task.status == models.TaskStatus.PENDING.value
+
+
+def test_same_seed_same_data(tmp_path):
+    """Test a seed and end date always produce the same rows"""
+    def bookings(name, seed):
+        engine = create_engine(f"sqlite:///{tmp_path / name}.db")
+        models.Base.metadata.create_all(bind=engine)
+        generate(engine, _config(seed=seed))
+        with engine.connect() as connection:
+            rows = connection.execute(select(models.Booking.__table__).order_by(models.Booking.id)).all()
+        engine.dispose()
+        return rows
+
+    first = bookings("first", seed=3)
+    assert first == bookings("second", seed=3)
+    assert first != bookings("third", seed=4)
+
+
+def test_refuses_non_empty_database(db: Session, room):
+    """Test existing data is only replaced with reset"""
+    with pytest.raises(ValueError, match="not empty"):
+        generate(db.get_bind(), _config())
+    db.rollback()
+
+    counts = generate(db.get_bind(), _config(), reset=True)
+    assert db.scalar(select(func.count()).select_from(models.Room)) == counts["rooms"]
+
+
+def test_app_serves_generated_data(client: TestClient, db: Session):
+    """Test the API works on a generated dataset, including staff logins"""
+    config = _config(end_date=None, password="sample-pass-1")
+    counts = generate(db.get_bind(), config)
+    headers = {"Authorization": f"Bearer {create_access_token(subject=config.admin_username)}"}
+
+    response = client.get("/bookings/?page_size=5", headers=headers)
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["total"] == counts["bookings"]
+
+    today = date.today()
+    response = client.get(f"/reports/occupancy?start_date={today.replace(day=1)}&end_date={today}", headers=headers)
+    assert response.status_code == status.HTTP_200_OK
+
+    response = client.post("/auth/token", data={"username": "frontdesk1", "password": "sample-pass-1"})
+    assert response.status_code == status.HTTP_200_OK